@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark Comparison
+Compare two benchmarks.run_benchmarks result files and flag regressions
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.2
+
+Exits with status 1 if any timing or peak memory grew by more than the
+threshold. Timings below --min-seconds are ignored as noise.
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ("cold_seconds", "warm_seconds", "peak_memory_bytes")
+
+
+def compare(baseline: dict, candidate: dict, threshold: float, min_seconds: float) -> list:
+    """
+    Compare result sets.
+
+    Returns:
+        Rows of (benchmark, metric, baseline value, candidate value, ratio, regressed)
+    """
+    rows = []
+    for name, base_metrics in baseline["results"].items():
+        new_metrics = candidate["results"].get(name)
+        if new_metrics is None:
+            continue
+        for metric in METRICS:
+            base_value = base_metrics.get(metric)
+            new_value = new_metrics.get(metric)
+            if base_value is None or new_value is None:
+                continue
+            ratio = new_value / base_value if base_value else float("inf") if new_value else 1.0
+            noise = metric.endswith("_seconds") and max(base_value, new_value) < min_seconds
+            regressed = not noise and ratio > 1 + threshold
+            rows.append((name, metric, base_value, new_value, ratio, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results between commits")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative growth (0.2 = 20%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.001, help="Ignore timings below this")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.candidate, encoding="utf-8") as file:
+        candidate = json.load(file)
+
+    if baseline.get("params") != candidate.get("params"):
+        print("Warning: results were produced with different synthetic PDF parameters")
+
+    print(f"baseline {baseline.get('commit') or '?'} -> candidate {candidate.get('commit') or '?'}")
+    rows = compare(baseline, candidate, args.threshold, args.min_seconds)
+    for name, metric, base_value, new_value, ratio, regressed in rows:
+        marker = "REGRESSION" if regressed else ""
+        print(f"{name:32} {metric:18} {base_value:>14} {new_value:>14} {ratio:7.2f}x {marker}")
+
+    regressions = [row for row in rows if row[5]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Inspector Benchmark Suite
+Time every PDFActionInspector entry point cold and warm on a synthetic PDF
+
+Cold runs use a fresh cache manager, so they include parsing the document;
+warm runs reuse the cached reader and memoized results. Peak memory is
+measured with tracemalloc on a separate cold run so it does not skew timings.
+Results are written as JSON for comparison with benchmarks.compare.
+
+Usage:
+    python -m benchmarks.run_benchmarks --pages 500 --output bench.json
+    python -m benchmarks.compare baseline.json bench.json
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import PyPDF2
+
+from benchmarks.synthetic_pdfs import write_synthetic_pdf
+from src.config.settings import settings
+from src.core.cache_manager import CacheManager
+from src.core.inspector import PDFActionInspector
+
+
+# Benchmarked entry points: name -> call(inspector, file_path, output_dir)
+BENCHMARKS = {
+    "analyze_pdf_actions_security": lambda inspector, path, out: inspector.analyze_pdf_actions_security(path),
+    "extract_pdf_actions": lambda inspector, path, out: inspector.extract_pdf_actions(path),
+    "iter_pdf_actions": lambda inspector, path, out: sum(1 for _ in inspector.iter_pdf_actions(path)),
+    "get_pdf_actions_ndjson": lambda inspector, path, out: inspector.get_pdf_actions_ndjson(path),
+    "export_pdf_actions_ndjson": lambda inspector, path, out: inspector.export_pdf_actions_ndjson(path, "actions.jsonl"),
+    "get_document_overview": lambda inspector, path, out: inspector.get_document_overview(path),
+    "get_page_text_content": lambda inspector, path, out: inspector.get_page_text_content(path, 0),
+    "load_all_annotations": lambda inspector, path, out: inspector.load_all_annotations(path),
+    "get_trailer_object": lambda inspector, path, out: inspector.get_trailer_object(path),
+    "get_fields_by_name": lambda inspector, path, out: inspector.get_fields_by_name(path, "field_p0_w0"),
+    "get_fields_by_names": lambda inspector, path, out: inspector.get_fields_by_names(
+        path, ["field_p0_w0", "field_p1_w1", "missing"]
+    ),
+    "get_pdf_object_information": lambda inspector, path, out: inspector.get_pdf_object_information(path, 5),
+    "load_all_annotations_in_page": lambda inspector, path, out: inspector.load_all_annotations_in_page(path, 0),
+    "get_page_information_by_spans": lambda inspector, path, out: inspector.get_page_information_by_spans(path, "0-9"),
+    "get_page_information_by_spans_paginated": lambda inspector, path, out: inspector.get_page_information_by_spans_paginated(
+        path, "0-99", max_pages=20
+    ),
+    "get_page_index_by_pdfobjnum": lambda inspector, path, out: inspector.get_page_index_by_pdfobjnum(path, 3),
+}
+
+# Public inspector methods that are not analysis entry points
+NOT_BENCHMARKED = {"set_password", "clear_cache", "get_cache_status", "get_performance_metrics"}
+
+
+def _new_inspector() -> PDFActionInspector:
+    """Create an inspector with an empty, memory-only cache"""
+    manager = CacheManager()
+    manager.persistent_cache = None
+    return PDFActionInspector(manager)
+
+
+def _time_cold(call, file_path: str, output_dir: str, repeat: int) -> float:
+    """Best wall time over several runs, each with a fresh cache"""
+    best = float("inf")
+    for _ in range(repeat):
+        inspector = _new_inspector()
+        start = time.perf_counter()
+        call(inspector, file_path, output_dir)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _time_warm(call, file_path: str, output_dir: str, repeat: int) -> float:
+    """Best wall time over several runs against a warmed-up cache"""
+    inspector = _new_inspector()
+    call(inspector, file_path, output_dir)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call(inspector, file_path, output_dir)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(call, file_path: str, output_dir: str) -> int:
+    """Peak traced allocation in bytes of one cold run"""
+    inspector = _new_inspector()
+    tracemalloc.start()
+    try:
+        call(inspector, file_path, output_dir)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _git_commit() -> str:
+    """Current git commit of the project, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_benchmarks(params: dict, repeat: int = 3, only=None) -> dict:
+    """
+    Run the benchmark suite.
+
+    Args:
+        params: Keyword arguments for build_synthetic_pdf
+        repeat: Runs per measurement (best time is reported)
+        only: Optional list of benchmark names to run
+
+    Returns:
+        Machine-readable results
+    """
+    uncovered = sorted(
+        name for name, _ in inspect.getmembers(PDFActionInspector, inspect.isfunction)
+        if not name.startswith("_") and name not in BENCHMARKS and name not in NOT_BENCHMARKED
+    )
+    if uncovered:
+        print(f"Warning: inspector methods without a benchmark: {', '.join(uncovered)}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Exports may only be written under PDF_EXPORT_DIR
+        settings.export_dir = output_dir
+        file_path = write_synthetic_pdf(os.path.join(output_dir, "synthetic.pdf"), **params)
+
+        results = {}
+        for name, call in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            results[name] = {
+                "cold_seconds": round(_time_cold(call, file_path, output_dir, repeat), 6),
+                "warm_seconds": round(_time_warm(call, file_path, output_dir, repeat), 6),
+                "peak_memory_bytes": _peak_memory(call, file_path, output_dir),
+            }
+            print(f"{name}: {results[name]}", file=sys.stderr)
+
+        file_size = os.path.getsize(file_path)
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pypdf2": PyPDF2.__version__,
+        "params": params,
+        "repeat": repeat,
+        "file_size": file_size,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every PDFActionInspector entry point")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--annotations", type=int, default=4, help="Link annotations per page")
+    parser.add_argument("--widgets", type=int, default=2, help="Form field widgets per page")
+    parser.add_argument("--field-tree-depth", type=int, default=32, help="Depth of the nested /Kids field tree")
+    parser.add_argument("--next-chain", type=int, default=256, help="Length of the /OpenAction /Next chain")
+    parser.add_argument("--js-stream-bytes", type=int, default=1024 * 1024, help="Size of the JavaScript stream")
+    parser.add_argument("--text-lines", type=int, default=20, help="Lines of text per page")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="Only run these benchmarks")
+    parser.add_argument("--output", help="Write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    params = {
+        "pages": args.pages,
+        "annotations_per_page": args.annotations,
+        "widgets_per_page": args.widgets,
+        "field_tree_depth": args.field_tree_depth,
+        "next_chain_length": args.next_chain,
+        "js_stream_bytes": args.js_stream_bytes,
+        "text_lines_per_page": args.text_lines,
+    }
+    results = run_benchmarks(params, args.repeat, args.only)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
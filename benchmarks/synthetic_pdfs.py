@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Synthetic PDF Generator
+Build large, action-heavy PDF documents offline with PyPDF2's writer
+"""
+
+import re
+from io import BytesIO
+from typing import Dict, Optional
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    FloatObject,
+    NameObject,
+    NumberObject,
+    PdfObject,
+    TextStringObject,
+)
+
+
+def _javascript_action(code: str) -> DictionaryObject:
+    """Create a JavaScript action dictionary"""
+    return DictionaryObject({
+        NameObject("/S"): NameObject("/JavaScript"),
+        NameObject("/JS"): TextStringObject(code),
+    })
+
+
+def _uri_action(uri: str) -> DictionaryObject:
+    """Create a URI action dictionary"""
+    return DictionaryObject({
+        NameObject("/S"): NameObject("/URI"),
+        NameObject("/URI"): TextStringObject(uri),
+    })
+
+
+def _javascript_stream_action(writer: PdfWriter, size: int) -> DictionaryObject:
+    """Create a JavaScript action whose code is a Flate-compressed stream of about size bytes"""
+    line = "var payload = unescape('%u9090%u9090%u9090%u9090'); // filler\n"
+    code = (line * (size // len(line) + 1))[:size]
+    stream = DecodedStreamObject()
+    stream.set_data(code.encode("latin-1"))
+    return DictionaryObject({
+        NameObject("/S"): NameObject("/JavaScript"),
+        NameObject("/JS"): writer._add_object(stream.flate_encode()),
+    })
+
+
+def _next_chain(writer: PdfWriter, first: DictionaryObject, length: int) -> DictionaryObject:
+    """Append a /Next chain of length indirect JavaScript actions to first"""
+    current = first
+    for index in range(length):
+        action = _javascript_action(f"console.println('chain step {index}');")
+        current[NameObject("/Next")] = writer._add_object(action)
+        current = action
+    return first
+
+
+def _field_tree(writer: PdfWriter, page, depth: int) -> tuple:
+    """
+    Create a /Kids chain of depth non-terminal fields ending in a widget on page.
+
+    Returns:
+        (root field reference, leaf widget reference)
+    """
+    leaf = DictionaryObject({
+        NameObject("/Type"): NameObject("/Annot"),
+        NameObject("/Subtype"): NameObject("/Widget"),
+        NameObject("/FT"): NameObject("/Tx"),
+        NameObject("/T"): TextStringObject("leaf"),
+        NameObject("/Rect"): _rect(29),
+        NameObject("/P"): page.indirect_reference,
+        NameObject("/AA"): DictionaryObject({
+            NameObject("/C"): _javascript_action("event.value = this.getField('tree').value;"),
+        }),
+    })
+    leaf_ref = writer._add_object(leaf)
+
+    child_ref = leaf_ref
+    for level in reversed(range(depth)):
+        node = DictionaryObject({
+            NameObject("/T"): TextStringObject("tree" if level == 0 else f"level{level}"),
+            NameObject("/Kids"): ArrayObject([child_ref]),
+        })
+        node_ref = writer._add_object(node)
+        child_ref.get_object()[NameObject("/Parent")] = node_ref
+        child_ref = node_ref
+
+    return child_ref, leaf_ref
+
+
+def _name_tree(writer: PdfWriter, entries: list, leaf_size: int = 64) -> DictionaryObject:
+    """
+    Create a name tree from sorted (name, value) pairs.
+
+    Small trees are a single /Names node; larger ones get a root whose
+    /Kids are leaves of leaf_size entries, each with its /Limits.
+    """
+    def names(chunk):
+        return ArrayObject(item for name, value in chunk for item in (TextStringObject(name), value))
+
+    if len(entries) <= leaf_size:
+        return DictionaryObject({NameObject("/Names"): names(entries)})
+
+    kids = ArrayObject()
+    for start in range(0, len(entries), leaf_size):
+        chunk = entries[start:start + leaf_size]
+        kids.append(writer._add_object(DictionaryObject({
+            NameObject("/Limits"): ArrayObject([TextStringObject(chunk[0][0]), TextStringObject(chunk[-1][0])]),
+            NameObject("/Names"): names(chunk),
+        })))
+    return DictionaryObject({NameObject("/Kids"): kids})
+
+
+def _embedded_file(writer: PdfWriter, file_name: str, content: bytes) -> DictionaryObject:
+    """Create a file specification with an embedded file stream"""
+    stream = DecodedStreamObject()
+    stream.set_data(content)
+    stream.update({
+        NameObject("/Type"): NameObject("/EmbeddedFile"),
+        NameObject("/Subtype"): NameObject("/text#2Fplain"),
+        NameObject("/Params"): DictionaryObject({NameObject("/Size"): NumberObject(len(content))}),
+    })
+    return DictionaryObject({
+        NameObject("/Type"): NameObject("/Filespec"),
+        NameObject("/F"): TextStringObject(file_name),
+        NameObject("/UF"): TextStringObject(file_name),
+        NameObject("/EF"): DictionaryObject({NameObject("/F"): writer._add_object(stream)}),
+    })
+
+
+def _page_text(writer: PdfWriter, page, page_num: int, lines: int):
+    """Give page a Helvetica content stream of lines lines of text"""
+    operations = ["BT", "/F1 10 Tf", "12 TL", "50 760 Td"]
+    for line in range(lines):
+        operations.append(f"(Page {page_num} line {line} lorem ipsum dolor sit amet) Tj T*")
+    operations.append("ET")
+
+    content = DecodedStreamObject()
+    content.set_data("\n".join(operations).encode("latin-1"))
+    page[NameObject("/Contents")] = writer._add_object(content)
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/Font"): DictionaryObject({
+            NameObject("/F1"): DictionaryObject({
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }),
+        }),
+    })
+
+
+def _rect(index: int) -> ArrayObject:
+    """Create an annotation rectangle"""
+    y = float(700 - (index % 30) * 20)
+    return ArrayObject([FloatObject(50), FloatObject(y), FloatObject(250), FloatObject(y + 15)])
+
+
+def build_synthetic_pdf(
+    pages: int = 10,
+    annotations_per_page: int = 5,
+    widgets_per_page: int = 2,
+    with_document_actions: bool = True,
+    with_page_actions: bool = True,
+    field_tree_depth: int = 0,
+    next_chain_length: int = 0,
+    js_stream_bytes: int = 0,
+    named_scripts: int = 0,
+    embedded_files: int = 0,
+    text_lines_per_page: int = 0,
+) -> bytes:
+    """
+    Build a synthetic PDF document.
+
+    Args:
+        pages: Number of pages
+        annotations_per_page: Number of link annotations per page (URI and JavaScript actions)
+        widgets_per_page: Number of text field widgets per page (each with field-level /AA)
+        with_document_actions: Add catalog /OpenAction and /AA
+        with_page_actions: Add page-level /AA open/close actions
+        field_tree_depth: Add a top-level field whose /Kids nest this deep, ending in a widget on the first page
+        next_chain_length: Append a /Next chain of this many actions to the /OpenAction
+        js_stream_bytes: Add a will-save document action whose JavaScript is a stream of this size
+        named_scripts: Number of document level scripts in the /Names/JavaScript name tree
+        embedded_files: Number of attachments in the /Names/EmbeddedFiles name tree
+        text_lines_per_page: Lines of extractable text on every page
+
+    Returns:
+        The PDF document as bytes
+    """
+    writer = PdfWriter()
+    fields = ArrayObject()
+
+    for page_num in range(pages):
+        writer.add_blank_page(width=612, height=792)
+        page = writer.pages[page_num]
+        annots = ArrayObject()
+
+        if text_lines_per_page:
+            _page_text(writer, page, page_num, text_lines_per_page)
+
+        if with_page_actions:
+            page[NameObject("/AA")] = DictionaryObject({
+                NameObject("/O"): _javascript_action(f"console.println('open page {page_num}');"),
+                NameObject("/C"): _javascript_action(f"console.println('close page {page_num}');"),
+            })
+
+        for annot_num in range(annotations_per_page):
+            if annot_num % 2:
+                action = _javascript_action(f"app.alert('page {page_num} annot {annot_num}');")
+            else:
+                action = _uri_action(f"https://example.com/p{page_num}/a{annot_num}")
+            annot = DictionaryObject({
+                NameObject("/Type"): NameObject("/Annot"),
+                NameObject("/Subtype"): NameObject("/Link"),
+                NameObject("/Rect"): _rect(annot_num),
+                NameObject("/A"): action,
+            })
+            annots.append(writer._add_object(annot))
+
+        for widget_num in range(widgets_per_page):
+            name = f"field_p{page_num}_w{widget_num}"
+            widget = DictionaryObject({
+                NameObject("/Type"): NameObject("/Annot"),
+                NameObject("/Subtype"): NameObject("/Widget"),
+                NameObject("/FT"): NameObject("/Tx"),
+                NameObject("/T"): TextStringObject(name),
+                NameObject("/V"): TextStringObject(f"value {widget_num}"),
+                NameObject("/Rect"): _rect(annotations_per_page + widget_num),
+                NameObject("/P"): page.indirect_reference,
+                NameObject("/AA"): DictionaryObject({
+                    NameObject("/K"): _javascript_action(f"AFNumber_Keystroke(2, 0, 0, 0, '', true); // {name}"),
+                    NameObject("/V"): _javascript_action(f"event.rc = event.value.length < 64; // {name}"),
+                    NameObject("/Fo"): _javascript_action(f"this.getField('{name}').value = '';"),
+                }),
+            })
+            widget_ref = writer._add_object(widget)
+            annots.append(widget_ref)
+            fields.append(widget_ref)
+
+        if page_num == 0 and field_tree_depth:
+            tree_ref, leaf_ref = _field_tree(writer, page, field_tree_depth)
+            annots.append(leaf_ref)
+            fields.append(tree_ref)
+
+        if annots:
+            page[NameObject("/Annots")] = annots
+
+    root = writer._root_object
+    if fields:
+        root[NameObject("/AcroForm")] = writer._add_object(DictionaryObject({
+            NameObject("/Fields"): fields,
+            NameObject("/NeedAppearances"): NumberObject(1),
+        }))
+
+    if with_document_actions or next_chain_length:
+        open_action = _next_chain(writer, _javascript_action("app.alert('document opened');"), next_chain_length)
+        root[NameObject("/OpenAction")] = writer._add_object(open_action)
+
+    document_aa = DictionaryObject()
+    if with_document_actions:
+        document_aa[NameObject("/WC")] = _javascript_action("app.alert('will close');")
+        document_aa[NameObject("/DP")] = _uri_action("https://example.com/did-print")
+    if js_stream_bytes:
+        document_aa[NameObject("/WS")] = _javascript_stream_action(writer, js_stream_bytes)
+    if document_aa:
+        root[NameObject("/AA")] = document_aa
+
+    names = DictionaryObject()
+    if named_scripts:
+        names[NameObject("/JavaScript")] = writer._add_object(_name_tree(writer, [
+            (f"script_{index:06d}", writer._add_object(_javascript_action(f"console.println('named script {index}');")))
+            for index in range(named_scripts)
+        ]))
+    if embedded_files:
+        names[NameObject("/EmbeddedFiles")] = writer._add_object(_name_tree(writer, [
+            (f"file_{index:06d}", writer._add_object(
+                _embedded_file(writer, f"attachment_{index}.txt", f"attachment {index}\n".encode("latin-1"))
+            ))
+            for index in range(embedded_files)
+        ]))
+    if names:
+        root[NameObject("/Names")] = names
+
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def write_synthetic_pdf(file_path: str, **kwargs) -> str:
+    """Build a synthetic PDF document and write it to file_path"""
+    with open(file_path, "wb") as file:
+        file.write(build_synthetic_pdf(**kwargs))
+    return file_path
+
+
+def append_incremental_update(file_path: str, objects: Dict[int, PdfObject], output_path: Optional[str] = None) -> str:
+    """
+    Append an incremental update (new objects, xref table and trailer with /Prev) to a PDF.
+
+    Args:
+        file_path: PDF to update
+        objects: New content per object number; numbers past /Size add objects
+        output_path: Where to write the updated document (default: update file_path in place)
+
+    Returns:
+        The path of the updated document
+    """
+    with open(file_path, "rb") as file:
+        data = file.read()
+
+    reader = PdfReader(BytesIO(data))
+    root = reader.trailer.raw_get("/Root")
+    size = max(int(reader.trailer["/Size"]), max(objects) + 1)
+    previous_xref = int(re.findall(rb"startxref\s+(\d+)", data)[-1])
+
+    output = BytesIO()
+    output.write(data)
+    if not data.endswith(b"\n"):
+        output.write(b"\n")
+
+    offsets = {}
+    for objnum, obj in sorted(objects.items()):
+        offsets[objnum] = output.tell()
+        output.write(f"{objnum} 0 obj\n".encode("latin-1"))
+        obj.write_to_stream(output, None)
+        output.write(b"\nendobj\n")
+
+    xref_offset = output.tell()
+    output.write(b"xref\n")
+    for objnum, offset in offsets.items():
+        output.write(f"{objnum} 1\n{offset:010d} 00000 n \n".encode("latin-1"))
+    output.write((
+        f"trailer\n<< /Size {size} /Root {root.idnum} {root.generation} R /Prev {previous_xref} >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1"))
+
+    with open(output_path or file_path, "wb") as file:
+        file.write(output.getvalue())
+    return output_path or file_path
@@ -4,10 +4,10 @@ PDF Action Inspector MCP Server Main File
 """
 
 import asyncio
-import json
 import os
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 # Add project root directory to Python path
 project_root = Path(__file__).parent.parent
@@ -16,7 +16,10 @@ sys.path.insert(0, str(project_root))
 from fastmcp import FastMCP
 from src.core.inspector import PDFActionInspector
 from src.core.cache_manager import CacheManager
-from src.core.error_handler import ErrorHandler
+from src.core.error_handler import ErrorHandler, PDFErrorType
+from src.core.async_runner import tool_runner
+from src.core.metrics import metrics, KIND_TOOL
+from src.core.serializer import response_serializer
 from src.config.settings import Settings
 
 
@@ -30,9 +33,55 @@ error_handler = ErrorHandler()
 pdf_inspector = PDFActionInspector(cache_manager, error_handler)
 
 
+def _as_json(method, cacheable: bool = False):
+    """
+    Wrap an inspector method returning a dict so it returns a JSON string.
+    
+    Results of cacheable methods depend only on the document and the call
+    arguments, so their JSON text is kept on the document's cache entry and
+    served again without rerunning or re-encoding the method.
+    """
+    def call(file_path, *args):
+        if cacheable:
+            return response_serializer.cached_response(
+                cache_manager, method.__name__, file_path, args, lambda: method(file_path, *args)
+            )
+        return response_serializer.serialize(method(file_path, *args))
+    call.__name__ = method.__name__
+    return call
+
+
+async def _run_tool(tool_name: str, func, file_path: str, *args) -> str:
+    """
+    Run a blocking tool implementation off the event loop.
+    
+    Calls on the same document are serialized and identical concurrent
+    calls are coalesced into one execution.
+    """
+    with metrics.time(KIND_TOOL, tool_name) as timer:
+        try:
+            result = await tool_runner.run(
+                func, file_path, *args,
+                file_path=file_path,
+                coalesce_key=(tool_name, file_path) + args
+            )
+        except asyncio.TimeoutError:
+            timer.error = True
+            result = error_handler.create_error_response(
+                PDFErrorType.TIMEOUT,
+                f"{tool_name} did not finish within {tool_runner.timeout_seconds} seconds",
+                file_path
+            )
+        if metrics.enabled and isinstance(result, str):
+            timer.bytes = len(result.encode("utf-8"))
+    
+    metrics.maybe_dump()
+    return result
+
+
 # PDF analysis tools
 @mcp.tool()
-def analyze_pdf_actions_security(file_path: str) -> str:
+async def analyze_pdf_actions_security(file_path: str) -> str:
     """
     Generate PDF Actions security analysis prompt
     
@@ -56,11 +105,11 @@ def analyze_pdf_actions_security(file_path: str) -> str:
         - Contains complete analysis strategies and extracted Actions data
         - Requires AI to perform actual security analysis based on this prompt
     """
-    return pdf_inspector.analyze_pdf_actions_security(file_path)
+    return await _run_tool("analyze_pdf_actions_security", pdf_inspector.analyze_pdf_actions_security, file_path)
 
 
 @mcp.tool()
-def extract_pdf_actions(file_path: str) -> str:
+async def extract_pdf_actions(file_path: str) -> str:
     """
     Pure extraction of Actions data from PDF file
     
@@ -73,6 +122,8 @@ def extract_pdf_actions(file_path: str) -> str:
     Returns:
         JSON format Actions data containing:
             - document_level_actions: Document level Actions
+            - document_level_scripts: Scripts of the /Names/JavaScript name tree
+            - embedded_files: Attachments of the /Names/EmbeddedFiles name tree
             - pages_level_actions: Page level Actions
             - annotations_level_actions: Annotation level Actions
             - field_level_actions: Field level Actions
@@ -85,12 +136,56 @@ def extract_pdf_actions(file_path: str) -> str:
         - This method only extracts data, does not perform any analysis
         - Returns raw PDF Actions structure
     """
-    result = pdf_inspector.extract_pdf_actions(file_path)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool("extract_pdf_actions", _as_json(pdf_inspector.extract_pdf_actions, cacheable=True), file_path)
 
 
 @mcp.tool()
-def get_document_overview(file_path: str) -> str:
+async def extract_pdf_actions_ndjson(file_path: str, output_path: str = None, cursor: int = 0) -> str:
+    """
+    Stream Actions data from PDF file as compact JSON Lines
+    
+    Emit one record per action trigger instead of one nested document, so
+    documents with tens of thousands of annotations can be extracted without
+    holding the full result in memory. Records are returned one bounded page
+    at a time (PDF_NDJSON_MAX_RECORDS per call); follow next_cursor for more.
+    
+    Args:
+        file_path: Absolute or relative path to the PDF file
+        output_path: Optional file, relative to the server's PDF_EXPORT_DIR, to
+            write all JSON Lines to; paths outside that directory are rejected
+            and exports are refused when it is not configured
+        cursor: Record number to start from (from a previous next_cursor)
+        
+    Returns:
+        JSON Lines text, one record per line, each containing:
+            - level: document, page, annotation or field
+            - key: Entry key used by extract_pdf_actions
+            - objnum: PDF object number of the owning object
+            - page / annotation_index / field_index: Position, where applicable
+            - trigger: Trigger name (e.g. OpenAction, AnnotFocus, FieldKeystroke)
+            - action: Parsed action details
+        When more records follow, the last line is {"next_cursor": n}.
+        With output_path, a JSON summary with the record count and bytes written
+        
+    Example:
+        lines = extract_pdf_actions_ndjson("sample.pdf")
+        records = [json.loads(line) for line in lines.splitlines()]
+        if "next_cursor" in records[-1]:
+            more = extract_pdf_actions_ndjson("sample.pdf", cursor=records[-1]["next_cursor"])
+    """
+    if output_path:
+        return await _run_tool(
+            "extract_pdf_actions_ndjson", _as_json(pdf_inspector.export_pdf_actions_ndjson), file_path, output_path
+        )
+    
+    def get_pdf_actions_ndjson(path, start):
+        return pdf_inspector.get_pdf_actions_ndjson(path, cursor=start)
+    
+    return await _run_tool("extract_pdf_actions_ndjson", get_pdf_actions_ndjson, file_path, cursor)
+
+
+@mcp.tool()
+async def get_document_overview(file_path: str) -> str:
     """
     Get complete structural overview of PDF document
     
@@ -115,12 +210,11 @@ def get_document_overview(file_path: str) -> str:
         - Returns JSON format string, needs parsing after use
         - Contains security-related feature statistics of document
     """
-    result = pdf_inspector.get_document_overview(file_path)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool("get_document_overview", _as_json(pdf_inspector.get_document_overview, cacheable=True), file_path)
 
 
 @mcp.tool()
-def load_all_annotations(file_path: str) -> str:
+async def load_all_annotations(file_path: str) -> str:
     """
     Load all annotations in PDF file and analyze their Actions
     
@@ -150,11 +244,11 @@ def load_all_annotations(file_path: str) -> str:
         - Pay special attention to Widget annotations, these usually contain form fields and related JavaScript
         - Actions information contains trigger conditions and specific Action types
     """
-    return pdf_inspector.load_all_annotations(file_path)
+    return await _run_tool("load_all_annotations", pdf_inspector.load_all_annotations, file_path)
 
 
 @mcp.tool()
-def get_page_text_content(file_path: str, page_number: int = 0) -> str:
+async def get_page_text_content(file_path: str, page_number: int = 0) -> str:
     """
     Extract text content and metadata from specified PDF page
     
@@ -181,12 +275,11 @@ def get_page_text_content(file_path: str, page_number: int = 0) -> str:
         - Text from some PDFs may not be extracted correctly (such as scanned PDFs)
         - Returned text maintains original format and line breaks
     """
-    result = pdf_inspector.get_page_text_content(file_path, page_number)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool("get_page_text_content", _as_json(pdf_inspector.get_page_text_content), file_path, page_number)
 
 
 @mcp.tool()
-def get_trailer_object(file_path: str) -> str:
+async def get_trailer_object(file_path: str) -> str:
     """
     Get PDF file Trailer object and document structure information
     
@@ -217,27 +310,75 @@ def get_trailer_object(file_path: str) -> str:
         - Encryption information is important for security analysis
         - Some object references may need further parsing
     """
-    result = pdf_inspector.get_trailer_object(file_path)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return await _run_tool("get_trailer_object", _as_json(pdf_inspector.get_trailer_object, cacheable=True), file_path)
+
+
+@mcp.tool()
+async def get_pdf_revision_diff(file_path: str) -> str:
+    """
+    Diff the revisions of an incrementally updated PDF file
+    
+    Enumerate the revisions a PDF file accumulated through incremental updates
+    (each appending a cross-reference section) and report, for every update,
+    which objects it changed and which Actions, form fields and annotations it
+    added, modified or removed. Changes made after a document was signed or
+    distributed, such as a new JavaScript Action or a swapped annotation, are
+    common in malicious or tampered files.
+    
+    Args:
+        file_path: Absolute or relative path to PDF file
+        
+    Returns:
+        JSON format revision information containing:
+            - revision_count: Number of revisions (1 = no incremental updates)
+            - modified_revisions: Revisions that changed Actions, fields or annotations
+            - skipped_revisions, max_revisions: When there are more revisions than
+              PDF_REVISION_DIFF_MAX_REVISIONS, how many of the oldest were not diffed
+            - revisions: Per diffed revision, oldest first:
+                - revision, xref_offset, end_offset, xref_type ("table" or "stream")
+                - changed_objects: Number of objects added or rewritten
+                - changed_object_numbers: Their object numbers (first 1000)
+                - actions: Action counts per level for the first diffed revision, otherwise
+                  the added, modified (before/after) and removed entries per level
+                - annotations, fields: Changed annotations and fields with
+                  change ("added", "modified", "removed"), before and after
+                - extraction: Nodes reused from the previous revision and re-extracted
+                
+    Example:
+        diff = get_pdf_revision_diff("sample.pdf")
+        data = json.loads(diff)
+        revisions = {revision['revision']: revision for revision in data['revisions']}
+        for number in data['modified_revisions']:
+            print(f"Revision {number}: {list(revisions[number]['actions'])}")
+            
+    Note:
+        - Each revision is read from the file itself; nothing is rewritten
+        - Every diffed revision is walked in full, so only the newest
+          PDF_REVISION_DIFF_MAX_REVISIONS revisions are diffed
+    """
+    return await _run_tool("get_pdf_revision_diff", _as_json(pdf_inspector.get_revision_diff, cacheable=True), file_path)
 
 
 @mcp.tool()
-def get_fields_by_name(file_path: str, field_name: str) -> str:
+async def get_fields_by_name(file_path: str, field_name: str, match: str = "substring") -> str:
     """
     Get PDF form field information by field name
     
     Search for form fields with specified name in PDF document and return detailed 
-    field information. Supports fuzzy matching, will find all fields whose names 
-    contain the specified string.
+    field information. By default uses fuzzy matching and finds all fields whose
+    fully-qualified names contain the specified string (case-insensitive).
     
     Args:
         file_path: Absolute or relative path to PDF file
-        field_name: Field name to search for (supports partial matching)
+        field_name: Field name to search for
+        match: Matching mode - "substring" (default), "exact", "prefix" or "regex"
         
     Returns:
         JSON format field information containing:
             - field_name: Searched field name
-            - found_fields: List of matching fields
+            - match: Matching mode used
+            - found_fields: List of matching fields (name, type, value, flags,
+              objnum, partial_name, parents, widget_objnums, widget_pages)
             - total_found: Number of fields found
             
     Example:
@@ -246,41 +387,140 @@ def get_fields_by_name(file_path: str, field_name: str) -> str:
         for field in data['found_fields']:
             print(f"Field: {field['name']}, Type: {field['type']}")
     """
-    result = pdf_inspector.get_fields_by_name(file_path, field_name)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    def get_fields_by_name(path, name, mode):
+        return pdf_inspector.get_fields_by_name(path, name, match=mode)
+    
+    return await _run_tool("get_fields_by_name", _as_json(get_fields_by_name, cacheable=True), file_path, field_name, match)
 
 
 @mcp.tool()
-def get_pdf_object_information(file_path: str, object_number: int) -> str:
+async def get_fields_by_names(file_path: str, field_names: List[str], match: str = "exact") -> str:
+    """
+    Get PDF form field information for many field names in one call
+    
+    Look up every name against the document's field index, which is built
+    once per document. Use this to resolve all fields referenced by
+    JavaScript instead of calling get_fields_by_name repeatedly.
+    
+    Args:
+        file_path: Absolute or relative path to PDF file
+        field_names: Field names to look up
+        match: Matching mode - "exact" (default), "prefix", "substring" or "regex"
+        
+    Returns:
+        JSON format lookup results containing:
+            - match: Matching mode used
+            - results: Matching fields for each requested name
+            - total_found: Number of fields found over all names
+            - not_found: Names without any matching field
+            - total_fields: Number of fields in the document
+            
+    Example:
+        fields = get_fields_by_names("sample.pdf", ["Price", "Total", "Signature1"])
+    """
+    def get_fields_by_names(path, names, mode):
+        return pdf_inspector.get_fields_by_names(path, list(names), match=mode)
+    
+    return await _run_tool("get_fields_by_names", _as_json(get_fields_by_names, cacheable=True), file_path, tuple(field_names), match)
+
+
+@mcp.tool()
+async def get_pdf_object_information(
+    file_path: str, object_number: int, depth: Optional[int] = None, stream_preview_bytes: int = 0
+) -> str:
     """
     Get detailed information of specified object in PDF file
     
     Extract object content and type information for specific object number in PDF.
     Can be used for in-depth analysis of PDF internal structure and object relationships.
+    The content is rendered recursively, following indirect references, so one call
+    shows a useful subtree; depth and a per-call value budget bound its size.
     
     Args:
         file_path: Absolute or relative path to PDF file
         object_number: PDF object number
+        depth: Nesting levels of dictionaries and arrays to render
+               (default from PDF_OBJECT_DUMP_MAX_DEPTH, 0 = top level only)
+        stream_preview_bytes: Decoded bytes of each stream to include as a text
+               preview (0 = none, capped by PDF_OBJECT_DUMP_MAX_PREVIEW_BYTES)
         
     Returns:
         JSON format object information containing:
             - object_number: Object number
             - found: Whether the object was found
-            - object_info: Detailed object information (type, key list, size, etc.)
+            - object_info: Detailed object information:
+                - type, keys, size: Object type, key list and size
+                - content: Rendered content; references appear as {"ref": n, "value": ...}
+                  or, when not expanded, {"ref": n, "omitted": "depth" | "cycle" | "repeated"};
+                  streams carry a "stream_preview" when requested
+                - content_limits: Values rendered, limits applied and whether
+                  the node budget truncated the content
             
     Example:
-        obj_info = get_pdf_object_information("sample.pdf", 5)
+        obj_info = get_pdf_object_information("sample.pdf", 5, depth=2)
         data = json.loads(obj_info)
         if data['found']:
             print(f"Object type: {data['object_info']['type']}")
+            print(data['object_info']['content'])
+    """
+    def get_pdf_object_information(path, number, levels, preview_bytes):
+        return pdf_inspector.get_pdf_object_information(path, number, depth=levels, stream_preview_bytes=preview_bytes)
+    
+    return await _run_tool(
+        "get_pdf_object_information",
+        _as_json(get_pdf_object_information, cacheable=True),
+        file_path, object_number, depth, stream_preview_bytes
+    )
+
+
+@mcp.tool()
+async def get_pdf_objects_information(
+    file_path: str, object_numbers: Optional[List[int]] = None, object_spans: str = "", depth: int = 0
+) -> str:
     """
-    result = pdf_inspector.get_pdf_object_information(file_path, object_number)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    Get information of many PDF objects in one call
+    
+    Look up a list and/or ranges of object numbers, optionally following the
+    references of each object up to depth levels. Every object is resolved
+    once and returned once, even when several requested objects reach it.
+    Use this instead of calling get_pdf_object_information repeatedly.
+    
+    Args:
+        file_path: Absolute or relative path to PDF file
+        object_numbers: PDF object numbers
+        object_spans: Object number ranges, e.g. "10-20,35"
+        depth: Levels of referenced objects to include (0 = requested objects only)
+        
+    Returns:
+        JSON format object information containing:
+            - requested: Requested object numbers
+            - depth: Reference depth followed
+            - objects: Information per object number (type, key list, size,
+              content with references left as {"ref": n}, references to other objects)
+            - not_found: Object numbers that do not exist
+            - total_objects: Number of objects returned
+            - limit_reached / unvisited: Set when the per-call object limit
+              stopped the lookup, with the object numbers left to request
+            
+    Example:
+        objects = get_pdf_objects_information("sample.pdf", [5, 12], depth=2)
+        data = json.loads(objects)
+        for number, info in data['objects'].items():
+            print(f"Object {number}: {info['type']} -> {info['references']}")
+    """
+    def get_pdf_objects_information(path, numbers, spans, levels):
+        return pdf_inspector.get_pdf_objects_information(path, list(numbers), spans, levels)
+    
+    return await _run_tool(
+        "get_pdf_objects_information",
+        _as_json(get_pdf_objects_information, cacheable=True),
+        file_path, tuple(object_numbers or ()), object_spans, depth
+    )
 
 
 # Advanced analysis tools
 @mcp.tool()
-def load_all_annotations_in_page(file_path: str, page_index: int) -> str:
+async def load_all_annotations_in_page(file_path: str, page_index: int) -> str:
     """
     Load all annotations for specified page
     
@@ -291,11 +531,11 @@ def load_all_annotations_in_page(file_path: str, page_index: int) -> str:
     Returns:
         Annotation information for specified page
     """
-    return pdf_inspector.load_all_annotations_in_page(file_path, page_index)
+    return await _run_tool("load_all_annotations_in_page", pdf_inspector.load_all_annotations_in_page, file_path, page_index)
 
 
 @mcp.tool()
-def get_page_information_by_spans(file_path: str, page_spans: str) -> str:
+async def get_page_information_by_spans(file_path: str, page_spans: str) -> str:
     """
     Get information for multiple pages by page range
     
@@ -306,22 +546,62 @@ def get_page_information_by_spans(file_path: str, page_spans: str) -> str:
     Returns:
         Information for pages within specified range
     """
-    return pdf_inspector.get_page_information_by_spans(file_path, page_spans)
+    return await _run_tool("get_page_information_by_spans", pdf_inspector.get_page_information_by_spans, file_path, page_spans)
+
+
+@mcp.tool()
+async def get_page_information_by_spans_paginated(
+    file_path: str, page_spans: str, cursor: int = 0, max_pages: int = 0, max_chars: int = 0
+) -> str:
+    """
+    Get information for multiple pages by page range, one bounded slice per call
+    
+    Use instead of get_page_information_by_spans for large ranges such as
+    "0-4999": each response holds at most max_pages pages and max_chars
+    characters of text, and page text is cached between calls.
+    
+    Args:
+        file_path: PDF file path
+        page_spans: Page range, supported formats: "0", "0-2", "1,3,5", "0-2,5,7-9"
+        cursor: Position in the selected pages to start from (next_cursor of the previous call)
+        max_pages: Maximum pages in this response (0 = server default)
+        max_chars: Maximum text characters in this response (0 = server default)
+        
+    Returns:
+        Slice of page information:
+            - pages_info: Information for the returned pages
+            - total_selected: Number of pages selected by page_spans
+            - next_cursor: Cursor of the next slice, null after the last page
+            - returned_pages, returned_chars: Size of this slice
+    """
+    return await _run_tool(
+        "get_page_information_by_spans_paginated", _as_json(pdf_inspector.get_page_information_by_spans_paginated),
+        file_path, page_spans, cursor, max_pages or None, max_chars or None
+    )
 
 
 @mcp.tool()
-def get_page_index_by_pdfobjnum(file_path: str, obj_num: int) -> str:
+async def get_page_index_by_pdfobjnum(file_path: str, obj_num: int) -> str:
     """
     Find the page containing object by PDF object number
     
+    Works for any object type: pages, annotations, fields, action
+    dictionaries, JavaScript streams and so on. Answered from a reverse
+    reference index built once per document.
+    
     Args:
         file_path: PDF file path
         obj_num: PDF object number
         
     Returns:
-        Information about page containing the object
+        Information about page containing the object:
+            - object_number: Requested object number
+            - is_page: Whether the object is a page itself
+            - found_pages: Indices of the pages owning the object
+            - referrers: Objects referring to it, with the referring key path
+            - total_matches: Number of owning pages
     """
-    return pdf_inspector.get_page_index_by_pdfobjnum(file_path, obj_num)
+    return await _run_tool("get_page_index_by_pdfobjnum", pdf_inspector.get_page_index_by_pdfobjnum, file_path, obj_num)
 
 
 # Management tools
@@ -356,13 +636,36 @@ def get_cache_status() -> str:
     """
     try:
         status = pdf_inspector.get_cache_status()
-        return json.dumps(status, ensure_ascii=False, indent=2)
+        return response_serializer.dumps(status)
     except Exception as e:
         return f"Failed to get cache status: {str(e)}"
 
 
 @mcp.tool()
-def set_pdf_password(file_path: str, password: str) -> str:
+async def get_performance_metrics() -> str:
+    """
+    Get performance metrics
+    
+    Call counts, errors, latency histograms and bytes processed for every
+    MCP tool and every inspector phase (load, decrypt, extract, serialize),
+    plus hit ratios of the reader, result, page text and persistent caches.
+    When PDF_METRICS_PROMETHEUS_PATH is set, the metrics are also written
+    to that file in Prometheus text format.
+        
+    Returns:
+        Performance metrics
+    """
+    def get_performance_metrics(_file_path):
+        return pdf_inspector.get_performance_metrics()
+    
+    try:
+        return await _run_tool("get_performance_metrics", _as_json(get_performance_metrics), None)
+    except Exception as e:
+        return f"Failed to get performance metrics: {str(e)}"
+
+
+@mcp.tool()
+async def set_pdf_password(file_path: str, password: str) -> str:
     """
     Set and verify password for encrypted PDF file
     
@@ -387,18 +690,18 @@ def set_pdf_password(file_path: str, password: str) -> str:
         - Successful password will be used automatically for subsequent operations
     """
     try:
-        cache_manager.set_password(file_path, password)
-        return json.dumps({
+        await tool_runner.run(cache_manager.set_password, file_path, password, file_path=file_path)
+        return response_serializer.dumps({
             "success": True,
             "message": f"Password verified and set for file: {file_path}",
             "file_path": file_path
-        }, ensure_ascii=False, indent=2)
+        })
     except Exception as e:
-        return json.dumps({
+        return response_serializer.dumps({
             "success": False,
             "error": f"Failed to set password: {str(e)}",
             "file_path": file_path
-        }, ensure_ascii=False, indent=2)
+        })
 
 
 def main():
@@ -407,7 +710,10 @@ def main():
     if "PDF_CACHE_TIMEOUT_SECONDS" not in os.environ:
         os.environ["PDF_CACHE_TIMEOUT_SECONDS"] = "120"  # 120 seconds default timeout
     
-    mcp.run()
+    try:
+        mcp.run()
+    finally:
+        pdf_inspector.close()
 
 
 if __name__ == "__main__":
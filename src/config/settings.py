@@ -12,6 +12,13 @@ from typing import Optional
 class Settings:
     """System Configuration Manager"""
     
+    READER_LOAD_MODES = ("memory", "mmap")
+    CACHE_EVICTION_POLICIES = ("lru", "lfu")
+    CACHE_KEY_MODES = ("stat", "digest")
+    PROFILE_MODES = ("off", "cprofile", "tracemalloc", "all")
+    JSON_MODES = ("pretty", "compact")
+    JSON_BACKENDS = ("auto", "orjson", "json")
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self._load_settings()
@@ -21,22 +28,293 @@ class Settings:
         # Cache configuration
         self.cache_timeout = int(os.getenv('PDF_CACHE_TIMEOUT_SECONDS', '120'))
         
+        # Cache budgets (0 disables the limit) and eviction policy ("lru" or "lfu")
+        self.cache_max_entries = int(os.getenv('PDF_CACHE_MAX_ENTRIES', '64'))
+        self.cache_max_bytes = int(os.getenv('PDF_CACHE_MAX_BYTES', str(1024 * 1024 * 1024)))
+        self.cache_eviction_policy = os.getenv('PDF_CACHE_EVICTION_POLICY', 'lru').lower()
+        if self.cache_eviction_policy not in self.CACHE_EVICTION_POLICIES:
+            self.logger.warning(f"Unknown PDF_CACHE_EVICTION_POLICY '{self.cache_eviction_policy}', using 'lru'")
+            self.cache_eviction_policy = 'lru'
+        
+        # Cache key mode: "stat" keys on canonical path and file stat, "digest" on content hash
+        self.cache_key_mode = os.getenv('PDF_CACHE_KEY_MODE', 'stat').lower()
+        if self.cache_key_mode not in self.CACHE_KEY_MODES:
+            self.logger.warning(f"Unknown PDF_CACHE_KEY_MODE '{self.cache_key_mode}', using 'stat'")
+            self.cache_key_mode = 'stat'
+        
+        # Persistent result cache shared across restarts and processes (empty path = disabled, 0 = unlimited)
+        self.persistent_cache_path = os.getenv('PDF_PERSISTENT_CACHE_PATH', '')
+        self.persistent_cache_max_bytes = int(os.getenv('PDF_PERSISTENT_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+        
+        # Maximum number of actions followed in one /Next chain
+        self.action_chain_max_length = int(os.getenv('PDF_ACTION_CHAIN_MAX_LENGTH', '64'))
+        
+        # Name and number tree traversal limits (/Names/JavaScript, /Names/EmbeddedFiles, ...)
+        self.name_tree_max_depth = int(os.getenv('PDF_NAME_TREE_MAX_DEPTH', '32'))
+        self.name_tree_max_entries = int(os.getenv('PDF_NAME_TREE_MAX_ENTRIES', '10000'))
+        self.name_tree_max_nodes = int(os.getenv('PDF_NAME_TREE_MAX_NODES', '10000'))
+        
+        # Async tool execution: worker threads and per-call timeout (0 = no limit)
+        self.worker_threads = int(os.getenv('PDF_WORKER_THREADS', '4'))
+        self.tool_timeout_seconds = float(os.getenv('PDF_TOOL_TIMEOUT_SECONDS', '300'))
+        
+        # Page text cache character budget across all cached documents (0 = unlimited)
+        self.page_text_cache_max_chars = int(os.getenv('PDF_PAGE_TEXT_CACHE_MAX_CHARS', str(20 * 1000 * 1000)))
+        
+        # Paginated page span responses: pages and text characters per response
+        self.span_max_pages = int(os.getenv('PDF_SPAN_MAX_PAGES', '50'))
+        self.span_max_chars = int(os.getenv('PDF_SPAN_MAX_CHARS', '200000'))
+        
+        # JSON Lines Actions: records per inline response, and the only directory exports may write to (unset = no exports)
+        self.ndjson_max_records = int(os.getenv('PDF_NDJSON_MAX_RECORDS', '1000'))
+        self.export_dir = os.getenv('PDF_EXPORT_DIR', '')
+        
+        # Worker processes extracting page text for large page spans (1 = in-process)
+        self.text_workers = int(os.getenv('PDF_TEXT_WORKERS', '1'))
+        
+        # Batch analysis worker processes (0 = one per CPU)
+        self.batch_workers = int(os.getenv('PDF_BATCH_WORKERS', '0'))
+        
+        # Performance metrics, optionally dumped in Prometheus text format (empty path = no dump)
+        self.metrics_enabled = os.getenv('PDF_METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no', 'off')
+        self.metrics_prometheus_path = os.getenv('PDF_METRICS_PROMETHEUS_PATH', '')
+        self.metrics_dump_interval_seconds = float(os.getenv('PDF_METRICS_DUMP_INTERVAL_SECONDS', '60'))
+        
+        # Per-call profiling written to a directory ("off", "cprofile", "tracemalloc" or "all")
+        self.profile_mode = os.getenv('PDF_PROFILE_MODE', 'off').lower()
+        if self.profile_mode not in self.PROFILE_MODES:
+            self.logger.warning(f"Unknown PDF_PROFILE_MODE '{self.profile_mode}', using 'off'")
+            self.profile_mode = 'off'
+        self.profile_dir = os.getenv('PDF_PROFILE_DIR', 'profiles')
+        self.profile_min_seconds = float(os.getenv('PDF_PROFILE_MIN_SECONDS', '0'))
+        self.profile_top_allocations = int(os.getenv('PDF_PROFILE_TOP_ALLOCATIONS', '25'))
+        self.profile_traceback_frames = int(os.getenv('PDF_PROFILE_TRACEBACK_FRAMES', '1'))
+        
+        # Tool response serialization: "pretty" (indented) or "compact", and the JSON backend
+        self.json_mode = os.getenv('PDF_JSON_MODE', 'pretty').lower()
+        if self.json_mode not in self.JSON_MODES:
+            self.logger.warning(f"Unknown PDF_JSON_MODE '{self.json_mode}', using 'pretty'")
+            self.json_mode = 'pretty'
+        self.json_backend = os.getenv('PDF_JSON_BACKEND', 'auto').lower()
+        if self.json_backend not in self.JSON_BACKENDS:
+            self.logger.warning(f"Unknown PDF_JSON_BACKEND '{self.json_backend}', using 'auto'")
+            self.json_backend = 'auto'
+        
+        # Budget of one Actions extraction (0 disables a limit); exhausted budgets return partial, truncated results
+        self.extract_max_seconds = float(os.getenv('PDF_EXTRACT_MAX_SECONDS', '30'))
+        self.extract_max_objects = int(os.getenv('PDF_EXTRACT_MAX_OBJECTS', '1000000'))
+        self.extract_max_stream_bytes = int(os.getenv('PDF_EXTRACT_MAX_STREAM_BYTES', str(64 * 1024 * 1024)))
+        self.extract_max_output_chars = int(os.getenv('PDF_EXTRACT_MAX_OUTPUT_CHARS', str(64 * 1024 * 1024)))
+        
+        # Incremental re-extraction of incrementally updated documents from their cached previous revision,
+        # and the number of revisions whose Actions are kept in memory for it (0 = persistent cache only)
+        self.incremental_extraction = os.getenv('PDF_INCREMENTAL_EXTRACTION', '0').lower() not in ('0', 'false', 'no', 'off')
+        self.revision_cache_entries = int(os.getenv('PDF_REVISION_CACHE_ENTRIES', '16'))
+        
+        # Newest revisions diffed by the revision diff; older ones are only counted
+        self.revision_diff_max_revisions = int(os.getenv('PDF_REVISION_DIFF_MAX_REVISIONS', '16'))
+        
+        # Limits of recursive object content dumps, and the largest stream preview a caller may request
+        self.object_dump_max_depth = int(os.getenv('PDF_OBJECT_DUMP_MAX_DEPTH', '3'))
+        self.object_dump_max_nodes = int(os.getenv('PDF_OBJECT_DUMP_MAX_NODES', '200'))
+        self.object_dump_max_preview_bytes = int(os.getenv('PDF_OBJECT_DUMP_MAX_PREVIEW_BYTES', '4096'))
+        
+        # Most objects one batched object lookup resolves
+        self.object_batch_max_objects = int(os.getenv('PDF_OBJECT_BATCH_MAX_OBJECTS', '500'))
+        
+        # Largest serialized response kept per document and tool (0 disables response caching)
+        self.response_cache_max_bytes = int(os.getenv('PDF_RESPONSE_CACHE_MAX_BYTES', str(8 * 1024 * 1024)))
+        
         # Log configuration
         self.log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
         
         # File size limit (MB)
         self.max_file_size_mb = int(os.getenv('MAX_PDF_FILE_SIZE_MB', '100'))
         
+        # Reader load mode: "memory" reads the file into memory, "mmap" maps it
+        self.reader_load_mode = os.getenv('PDF_READER_LOAD_MODE', 'memory').lower()
+        if self.reader_load_mode not in self.READER_LOAD_MODES:
+            self.logger.warning(f"Unknown PDF_READER_LOAD_MODE '{self.reader_load_mode}', using 'memory'")
+            self.reader_load_mode = 'memory'
+        
         self.logger.info(f"Configuration loaded - cache timeout: {self.cache_timeout} seconds")
     
     def get_cache_timeout_seconds(self) -> int:
         """Get cache timeout (seconds)"""
         return self.cache_timeout
     
+    def get_cache_max_entries(self) -> int:
+        """Get maximum number of cached readers (0 = unlimited)"""
+        return self.cache_max_entries
+    
+    def get_cache_max_bytes(self) -> int:
+        """Get cache byte budget (0 = unlimited)"""
+        return self.cache_max_bytes
+    
+    def get_cache_eviction_policy(self) -> str:
+        """Get cache eviction policy ("lru" or "lfu")"""
+        return self.cache_eviction_policy
+    
+    def get_cache_key_mode(self) -> str:
+        """Get cache key mode ("stat" or "digest")"""
+        return self.cache_key_mode
+    
+    def get_persistent_cache_path(self) -> str:
+        """Get persistent result cache database path (empty = disabled)"""
+        return self.persistent_cache_path
+    
+    def get_persistent_cache_max_bytes(self) -> int:
+        """Get persistent result cache byte budget (0 = unlimited)"""
+        return self.persistent_cache_max_bytes
+    
+    def get_action_chain_max_length(self) -> int:
+        """Get maximum number of actions followed in one /Next chain"""
+        return max(1, self.action_chain_max_length)
+    
+    def get_name_tree_max_depth(self) -> int:
+        """Get maximum /Kids depth followed in name and number trees"""
+        return max(1, self.name_tree_max_depth)
+    
+    def get_name_tree_max_entries(self) -> int:
+        """Get maximum number of leaves read from one name or number tree"""
+        return max(1, self.name_tree_max_entries)
+    
+    def get_name_tree_max_nodes(self) -> int:
+        """Get maximum number of nodes, intermediate or leaf, visited in one name or number tree"""
+        return max(1, self.name_tree_max_nodes)
+    
+    def get_worker_threads(self) -> int:
+        """Get number of worker threads for blocking PDF processing"""
+        return max(1, self.worker_threads)
+    
+    def get_tool_timeout_seconds(self) -> float:
+        """Get per-call tool timeout in seconds (0 = no limit)"""
+        return self.tool_timeout_seconds
+    
+    def get_page_text_cache_max_chars(self) -> int:
+        """Get page text cache character budget (0 = unlimited)"""
+        return self.page_text_cache_max_chars
+    
+    def get_span_max_pages(self) -> int:
+        """Get maximum number of pages in one paginated page span response"""
+        return max(1, self.span_max_pages)
+    
+    def get_span_max_chars(self) -> int:
+        """Get maximum number of text characters in one paginated page span response"""
+        return max(1, self.span_max_chars)
+    
+    def get_ndjson_max_records(self) -> int:
+        """Get maximum number of JSON Lines Action records in one inline response"""
+        return max(1, self.ndjson_max_records)
+    
+    def get_export_dir(self) -> str:
+        """Get directory files may be exported to (empty = exports disabled)"""
+        return self.export_dir
+    
+    def get_text_workers(self) -> int:
+        """Get number of worker processes extracting page text (1 = in-process)"""
+        return max(1, self.text_workers)
+    
+    def get_batch_workers(self) -> int:
+        """Get number of batch analysis worker processes"""
+        return self.batch_workers if self.batch_workers > 0 else (os.cpu_count() or 1)
+    
+    def get_metrics_enabled(self) -> bool:
+        """Get whether performance metrics are recorded"""
+        return self.metrics_enabled
+    
+    def get_metrics_prometheus_path(self) -> str:
+        """Get file receiving periodic Prometheus text metric dumps (empty = no dump)"""
+        return self.metrics_prometheus_path
+    
+    def get_metrics_dump_interval_seconds(self) -> float:
+        """Get minimum seconds between Prometheus metric dumps"""
+        return self.metrics_dump_interval_seconds
+    
+    def get_profile_mode(self) -> str:
+        """Get profiling mode applied to inspector calls without a per-call flag"""
+        return self.profile_mode
+    
+    def get_profile_dir(self) -> str:
+        """Get directory receiving pstats files and allocation reports"""
+        return self.profile_dir
+    
+    def get_profile_min_seconds(self) -> float:
+        """Get minimum call duration for a profile to be kept"""
+        return self.profile_min_seconds
+    
+    def get_profile_top_allocations(self) -> int:
+        """Get number of allocation sites listed in allocation reports"""
+        return max(1, self.profile_top_allocations)
+    
+    def get_profile_traceback_frames(self) -> int:
+        """Get number of frames tracemalloc records per allocation"""
+        return max(1, self.profile_traceback_frames)
+    
+    def get_extract_max_seconds(self) -> float:
+        """Get wall time budget of one Actions extraction (0 = unlimited)"""
+        return self.extract_max_seconds
+    
+    def get_extract_max_objects(self) -> int:
+        """Get budget of PDF objects visited by one Actions extraction (0 = unlimited)"""
+        return self.extract_max_objects
+    
+    def get_extract_max_stream_bytes(self) -> int:
+        """Get budget of decompressed stream bytes of one Actions extraction (0 = unlimited)"""
+        return self.extract_max_stream_bytes
+    
+    def get_extract_max_output_chars(self) -> int:
+        """Get budget of characters produced by one Actions extraction (0 = unlimited)"""
+        return self.extract_max_output_chars
+    
+    def get_json_mode(self) -> str:
+        """Get tool response JSON layout ("pretty" or "compact")"""
+        return self.json_mode
+    
+    def get_json_backend(self) -> str:
+        """Get JSON backend ("auto" uses orjson when installed)"""
+        return self.json_backend
+    
+    def get_incremental_extraction(self) -> bool:
+        """Get whether Actions of updated documents are re-extracted from their previous revision"""
+        return self.incremental_extraction
+    
+    def get_revision_cache_entries(self) -> int:
+        """Get number of revisions whose Actions are kept in memory for incremental re-extraction"""
+        return max(0, self.revision_cache_entries)
+    
+    def get_revision_diff_max_revisions(self) -> int:
+        """Get number of newest revisions the revision diff extracts and compares"""
+        return max(1, self.revision_diff_max_revisions)
+    
+    def get_object_dump_max_depth(self) -> int:
+        """Get default nesting depth of recursive object content dumps"""
+        return max(0, self.object_dump_max_depth)
+    
+    def get_object_dump_max_nodes(self) -> int:
+        """Get most values rendered in one object content dump"""
+        return max(1, self.object_dump_max_nodes)
+    
+    def get_object_dump_max_preview_bytes(self) -> int:
+        """Get largest stream preview an object content dump may decode"""
+        return max(0, self.object_dump_max_preview_bytes)
+    
+    def get_object_batch_max_objects(self) -> int:
+        """Get most objects one batched object lookup resolves"""
+        return max(1, self.object_batch_max_objects)
+    
+    def get_response_cache_max_bytes(self) -> int:
+        """Get largest serialized response cached per document and tool (0 = disabled)"""
+        return self.response_cache_max_bytes
+    
     def get_max_file_size_bytes(self) -> int:
         """Get maximum file size (bytes)"""
         return self.max_file_size_mb * 1024 * 1024
     
+    def get_reader_load_mode(self) -> str:
+        """Get PDF reader load mode ("memory" or "mmap")"""
+        return self.reader_load_mode
+    
     def setup_logging(self):
         """Setup log configuration"""
         logging.basicConfig(
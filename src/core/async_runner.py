@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Async Tool Runner
+Offload blocking PDF processing from the event loop to a bounded thread pool
+"""
+
+import asyncio
+import logging
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from ..config.settings import settings
+
+
+class _InflightCall:
+    """A running call shared by every caller with the same coalescing key"""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncToolRunner:
+    """
+    Run blocking inspector calls from async MCP tools.
+
+    - Calls execute on a bounded ThreadPoolExecutor, so a slow document
+      never stalls the event loop.
+    - Calls touching the same document run one at a time, because a
+      PdfReader is not safe to use from several threads at once.
+    - Concurrent calls with the same coalescing key share one execution.
+    - Each caller waits at most the configured timeout. A call nobody is
+      waiting for any more is cancelled if it has not started yet; once
+      running in a worker thread it completes in the background (its
+      results still land in the document cache) because Python threads
+      cannot be interrupted.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout_seconds: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers or settings.get_worker_threads()
+        self.timeout_seconds = settings.get_tool_timeout_seconds() if timeout_seconds is None else timeout_seconds
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-inspector")
+        self._inflight: Dict[Hashable, _InflightCall] = {}
+        self._document_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+        self.logger.info(f"Async tool runner started with {self.max_workers} worker threads")
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args,
+        file_path: Optional[str] = None,
+        coalesce_key: Optional[Hashable] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run a blocking function in the worker pool.
+
+        Args:
+            func: Blocking function to run
+            *args: Positional arguments for func
+            file_path: Document the call reads; calls on the same document are serialized
+            coalesce_key: Calls sharing this key while one is in flight share its result
+            timeout: Seconds to wait for the result (defaults to the configured tool timeout, 0 = no limit)
+
+        Returns:
+            The function's return value
+
+        Raises:
+            asyncio.TimeoutError: If the result is not available within the timeout
+        """
+        timeout = self.timeout_seconds if timeout is None else timeout
+        key = coalesce_key if coalesce_key is not None else object()
+
+        call = self._inflight.get(key)
+        if call is None:
+            task = asyncio.ensure_future(self._execute(func, args, file_path))
+            call = _InflightCall(task)
+            self._inflight[key] = call
+            task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.logger.debug(f"Coalescing call into in-flight {func.__name__}")
+
+        call.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(call.task), timeout or None)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is waiting for this call any more
+                call.task.cancel()
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the worker pool"""
+        self._executor.shutdown(wait=wait)
+
+    def _forget(self, key: Hashable, call: _InflightCall):
+        """Remove a finished call from the in-flight table"""
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+
+    def _document_lock(self, file_path: str) -> asyncio.Lock:
+        """Get the lock serializing calls on one document"""
+        lock_key = os.path.realpath(file_path)
+        lock = self._document_locks.get(lock_key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._document_locks[lock_key] = lock
+        return lock
+
+    async def _execute(self, func: Callable[..., Any], args: tuple, file_path: Optional[str]) -> Any:
+        """Run func in the pool, holding the document lock until the worker thread is done"""
+        if file_path is None:
+            return await self._submit(func, args)
+
+        async with self._document_lock(file_path):
+            return await self._submit(func, args)
+
+    async def _submit(self, func: Callable[..., Any], args: tuple) -> Any:
+        """Submit func to the pool and wait for it"""
+        future = self._executor.submit(func, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancel():
+                # Already running: keep the caller's locks held until the thread finishes
+                try:
+                    await asyncio.wrap_future(future)
+                except Exception:
+                    pass
+            raise
+
+
+# Global async tool runner instance
+tool_runner = AsyncToolRunner()
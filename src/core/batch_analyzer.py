@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Batch Analysis Module
+Fan PDF analysis out across a process pool and stream results as JSON Lines
+"""
+
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Union
+
+from ..config.settings import settings
+from ..core.error_handler import error_handler, PDFErrorType
+
+
+def _analyze_file(file_path: str, password: Optional[str] = None) -> Dict[str, Any]:
+    """Analyze one PDF in a worker process"""
+    # Imported here so each worker process builds its own inspector
+    from ..core.inspector import pdf_inspector
+
+    start = time.perf_counter()
+    try:
+        actions = pdf_inspector.extract_pdf_actions(file_path, password)
+        if actions.get("success") is False:
+            record = actions
+        else:
+            overview = pdf_inspector.get_document_overview(file_path, password)
+            if overview.get("success") is False:
+                record = overview
+            else:
+                record = {
+                    "file_path": file_path,
+                    "success": True,
+                    "actions": actions,
+                    "overview": overview
+                }
+    except Exception as e:
+        record = error_handler.create_error_dict(
+            PDFErrorType.PROCESSING_ERROR,
+            f"Batch analysis failed: {str(e)}",
+            file_path
+        )
+    finally:
+        # Every file is analyzed once; do not keep its reader around
+        pdf_inspector.clear_cache(file_path)
+
+    record["elapsed_seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+class BatchAnalyzer:
+    """Process-pool batch analyzer for directories and globs of PDF files"""
+
+    def __init__(self, max_workers: Optional[int] = None, password: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers or settings.get_batch_workers()
+        self.password = password
+
+    def collect_files(self, target: str) -> List[str]:
+        """
+        Resolve a directory or glob pattern to a sorted list of PDF files.
+
+        Directories are searched recursively for ``*.pdf`` (case-insensitive).
+        """
+        if os.path.isdir(target):
+            files = [
+                os.path.join(root, name)
+                for root, _, names in os.walk(target)
+                for name in names
+                if name.lower().endswith(".pdf")
+            ]
+        else:
+            files = [path for path in glob.glob(target, recursive=True) if os.path.isfile(path)]
+
+        return sorted(files)
+
+    def iter_results(self, files: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze files across the process pool, yielding results in completion order.
+
+        At most a few tasks per worker are queued at a time, so memory stays
+        flat for arbitrarily long file lists. If a worker process dies, the
+        files it had in flight are reported as failed and a new pool is
+        started for the rest.
+        """
+        pending_files = iter(files)
+        max_in_flight = self.max_workers * 4
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        in_flight = {}
+        exhausted = False
+
+        try:
+            while True:
+                # Keep the pool fed
+                while not exhausted and len(in_flight) < max_in_flight:
+                    file_path = next(pending_files, None)
+                    if file_path is None:
+                        exhausted = True
+                        break
+                    in_flight[executor.submit(_analyze_file, file_path, self.password)] = file_path
+
+                if not in_flight:
+                    return
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                pool_broken = False
+
+                for future in done:
+                    file_path = in_flight.pop(future)
+                    try:
+                        yield future.result()
+                    except BrokenProcessPool as e:
+                        pool_broken = True
+                        yield error_handler.create_error_dict(
+                            PDFErrorType.PROCESSING_ERROR,
+                            f"Worker process terminated abruptly: {str(e)}",
+                            file_path
+                        )
+                    except Exception as e:
+                        yield error_handler.create_error_dict(
+                            PDFErrorType.PROCESSING_ERROR,
+                            f"Batch analysis failed: {str(e)}",
+                            file_path
+                        )
+
+                if pool_broken:
+                    self.logger.error("Process pool broke, restarting workers")
+                    executor.shutdown(wait=False)
+                    executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        finally:
+            # Drop queued work when the consumer stops early
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def run(self, target: Union[str, List[str]], output: IO[str]) -> Dict[str, Any]:
+        """
+        Analyze a directory, glob or file list and write JSON Lines to output.
+
+        Returns:
+            Run summary with file counts and throughput (files/s, MB/s)
+        """
+        files = self.collect_files(target) if isinstance(target, str) else list(target)
+        total_bytes = 0
+        for file_path in files:
+            try:
+                total_bytes += os.path.getsize(file_path)
+            except OSError:
+                pass
+
+        succeeded = 0
+        failed = 0
+        start = time.perf_counter()
+
+        for record in self.iter_results(files):
+            if record.get("success") is False:
+                failed += 1
+            else:
+                succeeded += 1
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "files": len(files),
+            "succeeded": succeeded,
+            "failed": failed,
+            "total_bytes": total_bytes,
+            "elapsed_seconds": round(elapsed, 4),
+            "files_per_second": round(len(files) / elapsed, 2) if elapsed else 0.0,
+            "mb_per_second": round(total_bytes / 1024 / 1024 / elapsed, 2) if elapsed else 0.0,
+            "workers": self.max_workers
+        }
@@ -3,27 +3,70 @@
 Cache Management Module
 """
 
+import os
 import time
+import hashlib
 import threading
 import logging
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 from io import BytesIO
 
+try:
+    import mmap
+except ImportError:  # Platforms without mmap support
+    mmap = None
+
 from PyPDF2 import PdfReader
 
 from ..config.settings import settings
 from ..core.error_handler import ErrorHandler, PDFErrorType
+from ..core.metrics import metrics, KIND_PHASE, PHASE_DECRYPT, PHASE_EXTRACT, PHASE_LOAD
+from ..core.page_text_cache import PageTextCache
+from ..core.persistent_cache import PersistentResultCache
 
 
 class CacheEntry:
     """Cache Entry"""
     
-    def __init__(self, reader: PdfReader, file_path: str):
+    def __init__(
+        self,
+        reader: PdfReader,
+        file_path: str,
+        canonical_path: Optional[str] = None,
+        signature: Optional[Tuple[int, int, int, int]] = None
+    ):
         self.reader = reader
         self.file_path = file_path
+        self.canonical_path = canonical_path or os.path.realpath(file_path)
+        self.signature = signature
+        self.paths = {self.canonical_path}
+        
+        # Memoized analysis results, dropped together with the reader
+        self.results: Dict[str, Any] = {}
+        
+        # Serializes result builders, which share the (not thread-safe) reader
+        self.lock = threading.RLock()
+        
+        # Callers using the reader outside the lock (see CacheManager.use_reader)
+        self.users = 0
+        self._users_lock = threading.Lock()
         self.created_at = time.time()
         self.last_accessed = time.time()
         self.access_count = 0
+        self.load_mode, self.resident_bytes, self.mapped_bytes = self._measure_stream(reader)
+    
+    @staticmethod
+    def _measure_stream(reader: PdfReader):
+        """Report how the reader's source bytes are held (load mode, resident bytes, mapped bytes)"""
+        stream = getattr(reader, "stream", None)
+        if mmap is not None and isinstance(stream, mmap.mmap):
+            return "mmap", 0, len(stream)
+        if isinstance(stream, BytesIO):
+            return "memory", stream.getbuffer().nbytes, 0
+        return "unknown", 0, 0
     
     def touch(self):
         """Update last access time"""
@@ -33,11 +76,68 @@ class CacheEntry:
     def is_expired(self, timeout_seconds: int) -> bool:
         """Check if expired"""
         return (time.time() - self.last_accessed) > timeout_seconds
+    
+    @property
+    def size_bytes(self) -> int:
+        """Bytes charged against the cache byte budget"""
+        return self.resident_bytes + self.mapped_bytes
+    
+    def _mapping(self):
+        """The reader's mapping, None when it is not memory-mapped"""
+        stream = getattr(self.reader, "stream", None)
+        return stream if mmap is not None and isinstance(stream, mmap.mmap) else None
+    
+    def hold(self) -> bool:
+        """
+        Register a caller using the reader, keeping its mapping open.
+        
+        Returns:
+            False when the mapping was already closed and the reader is unusable
+        """
+        with self._users_lock:
+            mapping = self._mapping()
+            if mapping is not None and mapping.closed:
+                return False
+            self.users += 1
+            return True
+    
+    def release(self):
+        """Unregister a caller registered with hold"""
+        with self._users_lock:
+            self.users -= 1
+    
+    def close(self) -> bool:
+        """
+        Release the reader's mapping, if it has one, unless a builder or a held caller is using it.
+        
+        Returns:
+            Whether the entry is done with: closed, or holding nothing to close
+        """
+        with self._users_lock:
+            mapping = self._mapping()
+            if mapping is None or mapping.closed:
+                return True
+            if self.users or not self.lock.acquire(blocking=False):
+                return False
+            try:
+                mapping.close()
+            except BufferError:
+                # Views of the mapping are still exported; it is released when they are collected
+                pass
+            finally:
+                self.lock.release()
+            return True
 
 
 class CacheManager:
     """PDF Reader Cache Manager"""
     
+    # Maximum number of memoized content digests
+    DIGEST_MEMO_SIZE = 4096
+    
+    # Seconds an evicted entry's mapping stays open for callers still holding its reader
+    RETIRED_GRACE_SECONDS = 30
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.error_handler = ErrorHandler()
@@ -46,6 +146,43 @@ class CacheManager:
         self._cache: Dict[str, CacheEntry] = {}
         self._file_passwords: Dict[str, str] = {}
         
+        # Removed entries whose mappings are still to be closed, with the time they were removed
+        self._retired: List[Tuple[CacheEntry, float]] = []
+        
+        # Readers being loaded, so concurrent requests for one file parse it once
+        self._loading: Dict[str, Future] = {}
+        
+        # Content digests memoized by canonical path and file signature
+        self._digest_memo: Dict[str, Tuple[Tuple[int, int, int, int], str]] = {}
+        
+        # Eviction counters
+        self._eviction_stats = {
+            "stale": 0,
+            "expired": 0,
+            "max_entries": 0,
+            "max_bytes": 0
+        }
+        
+        # Analysis results cache counters
+        self._result_stats = {
+            "hits": 0,
+            "misses": 0
+        }
+        
+        # Results of document revisions by content digest, kept after their readers are dropped
+        self._revision_results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        
+        # Extracted page text, discarded together with its reader
+        self.page_text_cache = PageTextCache(settings.get_page_text_cache_max_chars())
+        
+        # Optional on-disk results shared across restarts and processes
+        self.persistent_cache: Optional[PersistentResultCache] = None
+        if settings.get_persistent_cache_path():
+            self.persistent_cache = PersistentResultCache(
+                settings.get_persistent_cache_path(),
+                settings.get_persistent_cache_max_bytes()
+            )
+        
         # Thread lock
         self._lock = threading.RLock()
         
@@ -59,6 +196,7 @@ class CacheManager:
                 try:
                     time.sleep(30)  # Check every 30 seconds
                     self._cleanup_expired_entries()
+                    self.close_retired_entries()
                 except Exception as e:
                     self.logger.error(f"Cache cleanup thread error: {e}")
         
@@ -77,18 +215,144 @@ class CacheManager:
             ]
             
             for key in expired_keys:
-                self.logger.info(f"Cleaning expired cache: {key}")
-                del self._cache[key]
+                self.logger.info(f"Cleaning expired cache: {self._cache[key].file_path}")
+                self._remove_entry(key, "expired")
+    
+    def _remove_entry(self, key: str, reason: Optional[str] = None):
+        """Remove a Cache Entry, counting it as an eviction when a reason is given"""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self.page_text_cache.discard(entry)
+            if entry.mapped_bytes:
+                self._retired.append((entry, time.time()))
+        if entry is not None and reason:
+            self._eviction_stats[reason] += 1
+    
+    def close_retired_entries(self, grace_seconds: Optional[float] = None):
+        """
+        Close the mappings of removed entries.
+        
+        Runs on the cleanup thread, which never holds an entry lock: an
+        entry is closed once it has been removed for grace_seconds, no
+        builder holds its lock and no use_reader block is using it; busy
+        entries are retried on the next pass.
+        """
+        grace_seconds = self.RETIRED_GRACE_SECONDS if grace_seconds is None else grace_seconds
+        now = time.time()
+        with self._lock:
+            due = [(entry, removed_at) for entry, removed_at in self._retired if now - removed_at >= grace_seconds]
+            self._retired = [(entry, removed_at) for entry, removed_at in self._retired if now - removed_at < grace_seconds]
+        
+        busy = [(entry, removed_at) for entry, removed_at in due if not entry.close()]
+        if busy:
+            with self._lock:
+                self._retired.extend(busy)
+    
+    def _store_entry(self, key: str, entry: CacheEntry):
+        """Store a Cache Entry and enforce the entry and byte budgets"""
+        self._cache[key] = entry
+        self._enforce_budgets(protected_key=key)
+    
+    def _enforce_budgets(self, protected_key: Optional[str] = None):
+        """Evict entries until the cache fits its entry and byte budgets"""
+        max_entries = settings.get_cache_max_entries()
+        max_bytes = settings.get_cache_max_bytes()
+        
+        while True:
+            if max_entries and len(self._cache) > max_entries:
+                reason = "max_entries"
+            elif max_bytes and sum(entry.size_bytes for entry in self._cache.values()) > max_bytes:
+                reason = "max_bytes"
+            else:
+                return
+            
+            victim_key = self._select_victim(protected_key)
+            if victim_key is None:
+                # Only the protected entry is left; keep it even if it exceeds the budget
+                return
+            
+            self.logger.info(f"Evicting cache ({reason}): {self._cache[victim_key].file_path}")
+            self._remove_entry(victim_key, reason)
+    
+    def _select_victim(self, protected_key: Optional[str] = None) -> Optional[str]:
+        """Select the entry to evict according to the eviction policy"""
+        candidates = [
+            (key, entry) for key, entry in self._cache.items()
+            if key != protected_key
+        ]
+        if not candidates:
+            return None
+        
+        if settings.get_cache_eviction_policy() == "lfu":
+            # Least frequently used, ties broken by least recently used
+            return min(candidates, key=lambda item: (item[1].access_count, item[1].last_accessed))[0]
+        
+        return min(candidates, key=lambda item: item[1].last_accessed)[0]
+    
+    def _file_identity(self, file_path: str) -> Tuple[str, Tuple[int, int, int, int]]:
+        """Get canonical path and (st_dev, st_ino, size, mtime) signature of a file"""
+        canonical_path = os.path.realpath(file_path)
+        stat = os.stat(canonical_path)
+        return canonical_path, (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    
+    def _content_digest(self, canonical_path: str, signature: Tuple[int, int, int, int]) -> str:
+        """Get SHA-256 of file content, recomputed only when the file signature changes"""
+        with self._lock:
+            memo = self._digest_memo.get(canonical_path)
+            if memo and memo[0] == signature:
+                return memo[1]
+        
+        digest = hashlib.sha256()
+        with open(canonical_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        
+        with self._lock:
+            self._digest_memo[canonical_path] = (signature, digest.hexdigest())
+            if len(self._digest_memo) > self.DIGEST_MEMO_SIZE:
+                # Drop the oldest memoized digest
+                self._digest_memo.pop(next(iter(self._digest_memo)))
+        
+        return digest.hexdigest()
+    
+    def _build_cache_key(
+        self,
+        canonical_path: str,
+        signature: Tuple[int, int, int, int],
+        password: Optional[str] = None
+    ) -> str:
+        """Build cache key from document identity"""
+        password_tag = hashlib.sha256((password or "").encode("utf-8")).hexdigest()[:16]
+        
+        if settings.get_cache_key_mode() == "digest":
+            return f"sha256:{self._content_digest(canonical_path, signature)}:{password_tag}"
+        
+        dev, ino, size, mtime_ns = signature
+        return f"stat:{canonical_path}:{dev}:{ino}:{size}:{mtime_ns}:{password_tag}"
     
     def _generate_cache_key(self, file_path: str, password: Optional[str] = None) -> str:
         """Generate cache key"""
-        return f"{file_path}:{password or ''}"
+        canonical_path, signature = self._file_identity(file_path)
+        return self._build_cache_key(canonical_path, signature, password)
+    
+    def _invalidate_stale_entries(self, canonical_path: str, signature: Tuple[int, int, int, int]):
+        """Drop entries loaded from an earlier version of the file at canonical_path"""
+        if settings.get_cache_key_mode() == "digest":
+            # Digest entries describe their content, which is still valid for other aliases
+            return
+        
+        stale_keys = [
+            key for key, entry in self._cache.items()
+            if entry.canonical_path == canonical_path and entry.signature != signature
+        ]
+        for key in stale_keys:
+            self.logger.info(f"File changed on disk, dropping cached reader: {canonical_path}")
+            self._remove_entry(key, "stale")
     
     def _load_pdf_reader(self, file_path: str, password: Optional[str] = None) -> PdfReader:
         """Load PDF Reader"""
         try:
             # Check file size
-            import os
             file_size = os.path.getsize(file_path)
             max_size = settings.get_max_file_size_bytes()
             
@@ -99,16 +363,16 @@ class CacheManager:
                     file_path
                 )
             
-            # Read file into memory
-            with open(file_path, "rb") as file:
-                file_content = file.read()
-            
-            # Create PDF Reader
-            reader = PdfReader(BytesIO(file_content))
-            
-            # Handle encrypted documents
-            if reader.is_encrypted:
-                self._handle_encryption(reader, file_path, password)
+            with metrics.time(KIND_PHASE, PHASE_LOAD) as timer:
+                timer.bytes = file_size
+                
+                # Create PDF Reader; objects are parsed lazily from the stream
+                reader = PdfReader(self._open_pdf_stream(file_path))
+                
+                # Handle encrypted documents
+                if reader.is_encrypted:
+                    with metrics.time(KIND_PHASE, PHASE_DECRYPT):
+                        self._handle_encryption(reader, file_path, password)
             
             return reader
             
@@ -142,6 +406,21 @@ class CacheManager:
                     e
                 )
     
+    def _open_pdf_stream(self, file_path: str):
+        """Open the stream backing a PdfReader according to the configured load mode"""
+        if settings.get_reader_load_mode() == "mmap" and mmap is not None:
+            try:
+                with open(file_path, "rb") as file:
+                    # The mapping stays valid after the file object is closed
+                    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError) as e:
+                # Empty files and some file systems cannot be mapped
+                self.logger.debug(f"mmap unavailable for {file_path}, reading into memory: {e}")
+        
+        # Read file into memory
+        with open(file_path, "rb") as file:
+            return BytesIO(file.read())
+    
     def _handle_encryption(self, reader: PdfReader, file_path: str, password: Optional[str] = None):
         """Handle encrypted PDF document"""
         # Try using provided password
@@ -157,7 +436,7 @@ class CacheManager:
                 )
         
         # Try using preset password
-        stored_password = self._file_passwords.get(file_path)
+        stored_password = self._get_stored_password(file_path)
         if stored_password and reader.decrypt(stored_password):
             self.logger.info("Successfully decrypted with preset password")
             return
@@ -169,26 +448,341 @@ class CacheManager:
             file_path
         )
     
-    def get_reader(self, file_path: str, password: Optional[str] = None) -> PdfReader:
-        """Get PDF Reader (with cache)"""
-        cache_key = self._generate_cache_key(file_path, password)
+    def _get_stored_password(self, file_path: str) -> Optional[str]:
+        """Get preset password for a file, matching any path that resolves to it"""
+        stored_password = self._file_passwords.get(file_path)
+        if stored_password:
+            return stored_password
+        
+        canonical_path = os.path.realpath(file_path)
+        for stored_path, stored_password in self._file_passwords.items():
+            if os.path.realpath(stored_path) == canonical_path:
+                return stored_password
+        return None
+    
+    def _get_entry(self, file_path: str, password: Optional[str] = None) -> CacheEntry:
+        """Get the Cache Entry for a file, loading the reader on a miss"""
+        try:
+            canonical_path, signature = self._file_identity(file_path)
+        except OSError:
+            # Let the loader report missing or unreadable files
+            return CacheEntry(self._load_pdf_reader(file_path, password), file_path)
+        
+        cache_key = self._build_cache_key(canonical_path, signature, password)
         
         with self._lock:
+            self._invalidate_stale_entries(canonical_path, signature)
+            
             # Check cache
             if cache_key in self._cache:
                 entry = self._cache[cache_key]
                 entry.touch()
+                entry.paths.add(canonical_path)
                 self.logger.debug(f"Cache hit: {file_path}")
-                return entry.reader
+                metrics.record_cache("reader", True)
+                return entry
             
-            # Load new Reader
+            # Join a load already in progress for this key
+            loading = self._loading.get(cache_key)
+            if loading is None:
+                loading = Future()
+                self._loading[cache_key] = loading
+                is_loader = True
+            else:
+                is_loader = False
+        
+        if not is_loader:
+            self.logger.debug(f"Waiting for in-progress load: {file_path}")
+            return loading.result()
+        
+        # Load new Reader outside the lock so other files are not blocked
+        metrics.record_cache("reader", False)
+        try:
             self.logger.info(f"Loading new PDF: {file_path}")
             reader = self._load_pdf_reader(file_path, password)
+            entry = CacheEntry(reader, file_path, canonical_path, signature)
             
             # Cache Reader
-            self._cache[cache_key] = CacheEntry(reader, file_path)
+            with self._lock:
+                self._store_entry(cache_key, entry)
             
-            return reader
+            loading.set_result(entry)
+            return entry
+        except BaseException as e:
+            loading.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(cache_key, None)
+    
+    def _find_entry(self, file_path: str, password: Optional[str] = None) -> Optional[CacheEntry]:
+        """Get the Cache Entry for a file if its reader is already loaded"""
+        try:
+            cache_key = self._generate_cache_key(file_path, password)
+        except OSError:
+            return None
+        
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is not None:
+                entry.touch()
+            return entry
+    
+    def _persistent_result_key(self, file_path: str, result_key: str, password: Optional[str] = None) -> Optional[str]:
+        """Build the persistent cache key of a result from the document content"""
+        try:
+            canonical_path, signature = self._file_identity(file_path)
+            digest = self._content_digest(canonical_path, signature)
+        except OSError:
+            # Let the loader report missing or unreadable files
+            return None
+        
+        return self._content_result_key(file_path, digest, result_key, password)
+    
+    def get_content_digest(self, file_path: str) -> Optional[str]:
+        """SHA-256 of a file's content, memoized until the file changes; None when it cannot be read"""
+        try:
+            return self._content_digest(*self._file_identity(file_path))
+        except OSError:
+            return None
+    
+    def _content_result_key(self, file_path: str, digest: str, result_key: str, password: Optional[str] = None) -> str:
+        """Build the key of a result of the document content with the given SHA-256"""
+        # Results of encrypted documents are only served to callers holding the
+        # password that produced them; the tag is salted with the content digest
+        effective_password = password or self._get_stored_password(file_path) or ""
+        password_tag = hashlib.sha256(f"{digest}:{effective_password}".encode("utf-8")).hexdigest()[:16]
+        return f"sha256:{digest}:{password_tag}:{result_key}"
+    
+    def get_reader(self, file_path: str, password: Optional[str] = None) -> PdfReader:
+        """
+        Get PDF Reader (with cache).
+        
+        A memory-mapped reader may be closed once its entry has been evicted
+        for RETIRED_GRACE_SECONDS; use use_reader for work that can outlast that.
+        """
+        return self._get_entry(file_path, password).reader
+    
+    @contextmanager
+    def use_reader(self, file_path: str, password: Optional[str] = None) -> Iterator[PdfReader]:
+        """Get PDF Reader (with cache), keeping its mapping open until the block exits, even if evicted"""
+        entry = self._get_entry(file_path, password)
+        # An entry closed between lookup and hold is no longer cached, so the retry loads afresh
+        while not entry.hold():
+            entry = self._get_entry(file_path, password)
+        try:
+            yield entry.reader
+        finally:
+            entry.release()
+    
+    def get_document_result(
+        self,
+        file_path: str,
+        result_key: str,
+        builder: Callable[[PdfReader], Any],
+        password: Optional[str] = None,
+        persistent: bool = False,
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """
+        Get an analysis result memoized on the document's Cache Entry.
+        
+        Args:
+            file_path: PDF file path
+            result_key: Name of the result, including any version tag of the code producing it
+            builder: Function computing the result from the reader on a miss
+            password: Optional document password
+            persistent: Also keep the result in the persistent cache, if enabled.
+                The result must be JSON-serializable, or converted by encode.
+            encode: Convert the result to its JSON-serializable stored form
+            decode: Convert a stored form back to the result
+            
+        Returns:
+            The memoized or freshly built result. Results are shared between
+            callers and must be treated as read-only.
+        """
+        persistent_key = None
+        if persistent and self.persistent_cache is not None:
+            persistent_key = self._persistent_result_key(file_path, result_key, password)
+        
+        if persistent_key is not None and self._find_entry(file_path, password) is None:
+            # Serve stored results without parsing the document at all
+            result = self.persistent_cache.get(persistent_key)
+            if result is not None:
+                return decode(result) if decode else result
+        
+        entry = self._get_entry(file_path, password)
+        
+        # The entry lock makes concurrent callers wait for a single build
+        # without blocking other documents
+        with entry.lock:
+            with self._lock:
+                if result_key in entry.results:
+                    self._result_stats["hits"] += 1
+                    return entry.results[result_key]
+                self._result_stats["misses"] += 1
+            
+            with metrics.time(KIND_PHASE, PHASE_EXTRACT):
+                result = builder(entry.reader)
+            
+            if persistent_key is not None:
+                stored = encode(result) if encode else result
+                # Failed and truncated builds are kept in memory only, so they are retried after a restart
+                if not (isinstance(stored, dict) and ("error" in stored or stored.get("truncated"))):
+                    self.persistent_cache.put(persistent_key, stored)
+            
+            with self._lock:
+                entry.results[result_key] = result
+            return result
+    
+    def peek_document_result(self, file_path: str, result_key: str, password: Optional[str] = None) -> Optional[Any]:
+        """Get a result memoized on an already loaded document, without loading or building anything"""
+        entry = self._find_entry(file_path, password)
+        if entry is None:
+            return None
+        with self._lock:
+            return entry.results.get(result_key)
+    
+    def store_document_result(self, file_path: str, result_key: str, result: Any, password: Optional[str] = None) -> bool:
+        """Memoize a result on an already loaded document, returning whether it was stored"""
+        entry = self._find_entry(file_path, password)
+        if entry is None:
+            return False
+        with self._lock:
+            entry.results[result_key] = result
+        return True
+    
+    def get_revision_result(
+        self,
+        file_path: str,
+        digest: str,
+        result_key: str,
+        password: Optional[str] = None,
+        decode: Optional[Callable[[Any], Any]] = None
+    ) -> Optional[Any]:
+        """
+        Get a result of the document revision whose bytes have the given SHA-256.
+        
+        Revisions kept with store_revision_result are served from memory
+        first. The persistent cache is searched next, which also finds
+        results get_document_result persisted for a file with exactly these
+        bytes, e.g. an earlier version of a document updated incrementally.
+        
+        Args:
+            file_path: Path of the document being analysed (selects the stored password)
+            digest: SHA-256 of the revision's bytes
+            result_key: Name of the result
+            password: Optional document password
+            decode: Convert a persisted form back to the result
+            
+        Returns:
+            The result, or None when the revision is unknown
+        """
+        key = self._content_result_key(file_path, digest, "", password)
+        with self._lock:
+            results = self._revision_results.get(key)
+            if results is not None and result_key in results:
+                self._revision_results.move_to_end(key)
+                return results[result_key]
+        
+        if self.persistent_cache is None:
+            return None
+        
+        stored = self.persistent_cache.get(key + result_key)
+        if stored is None:
+            return None
+        result = decode(stored) if decode else stored
+        self._keep_revision_result(key, result_key, result)
+        return result
+    
+    def store_revision_result(
+        self,
+        file_path: str,
+        digest: str,
+        result_key: str,
+        result: Any,
+        password: Optional[str] = None,
+        persistent: bool = False,
+        encode: Optional[Callable[[Any], Any]] = None
+    ):
+        """
+        Keep a result of a document revision for get_revision_result.
+        
+        Args:
+            file_path: Path of the document being analysed (selects the stored password)
+            digest: SHA-256 of the revision's bytes
+            result_key: Name of the result
+            result: The result, kept in memory as is
+            password: Optional document password
+            persistent: Also keep the result in the persistent cache, if enabled
+            encode: Convert the result to its JSON-serializable stored form
+        """
+        key = self._content_result_key(file_path, digest, "", password)
+        self._keep_revision_result(key, result_key, result)
+        if persistent and self.persistent_cache is not None:
+            self.persistent_cache.put(key + result_key, encode(result) if encode else result)
+    
+    def _keep_revision_result(self, key: str, result_key: str, result: Any):
+        """Keep a revision result in memory, dropping the least recently used revisions beyond the budget"""
+        max_entries = settings.get_revision_cache_entries()
+        if not max_entries:
+            return
+        
+        with self._lock:
+            self._revision_results.setdefault(key, {})[result_key] = result
+            self._revision_results.move_to_end(key)
+            while len(self._revision_results) > max_entries:
+                self._revision_results.popitem(last=False)
+    
+    def get_page_texts(
+        self,
+        file_path: str,
+        page_numbers: List[int],
+        builder: Callable[[PdfReader, List[int]], List[Dict[str, Any]]],
+        password: Optional[str] = None,
+        prefetch: Optional[Callable[[List[int]], Optional[List[Dict[str, Any]]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the extracted text of several pages through the page text cache.
+        
+        Args:
+            file_path: PDF file path
+            page_numbers: Pages to get
+            builder: Function extracting the missing pages from the reader, in order
+            password: Optional document password
+            prefetch: Optional function extracting the missing pages without
+                the shared reader (e.g. in worker processes); it runs outside
+                the entry lock, and returns None to fall back to builder
+            
+        Returns:
+            Page information for every requested page, in order
+        """
+        entry = self._get_entry(file_path, password)
+        
+        with entry.lock:
+            pages = self.page_text_cache.get_many(entry, page_numbers)
+            missing = [page_num for page_num in dict.fromkeys(page_numbers) if page_num not in pages]
+        
+        if missing and prefetch is not None:
+            with metrics.time(KIND_PHASE, PHASE_EXTRACT):
+                page_infos = prefetch(missing)
+            if page_infos is not None:
+                with entry.lock:
+                    for page_num, page_info in zip(missing, page_infos):
+                        self.page_text_cache.put(entry, page_num, page_info)
+                        pages[page_num] = page_info
+                missing = []
+        
+        with entry.lock:
+            if missing:
+                with metrics.time(KIND_PHASE, PHASE_EXTRACT):
+                    page_infos = builder(entry.reader, missing)
+                for page_num, page_info in zip(missing, page_infos):
+                    self.page_text_cache.put(entry, page_num, page_info)
+                    pages[page_num] = page_info
+            
+            return [pages[page_num] for page_num in page_numbers]
     
     def set_password(self, file_path: str, password: str):
         """Set password for file and verify it works"""
@@ -202,8 +796,9 @@ class CacheManager:
                 self.logger.info(f"File password set and verified: {file_path}")
                 
                 # Also cache this successful reader
-                cache_key = self._generate_cache_key(file_path, password)
-                self._cache[cache_key] = CacheEntry(test_reader, file_path)
+                canonical_path, signature = self._file_identity(file_path)
+                cache_key = self._build_cache_key(canonical_path, signature, password)
+                self._store_entry(cache_key, CacheEntry(test_reader, file_path, canonical_path, signature))
                 
             except Exception as e:
                 # Don't store invalid password, re-raise the error
@@ -214,31 +809,74 @@ class CacheManager:
         """Clear cache"""
         with self._lock:
             if file_path:
-                # Clear specific file cache
-                keys_to_remove = [key for key in self._cache.keys() if key.startswith(file_path + ":")]
+                # Clear specific file cache, including entries reached through other paths
+                canonical_path = os.path.realpath(file_path)
+                keys_to_remove = [
+                    key for key, entry in self._cache.items()
+                    if canonical_path in entry.paths or entry.file_path == file_path
+                ]
                 for key in keys_to_remove:
-                    del self._cache[key]
+                    self._remove_entry(key)
                 self.logger.info(f"File cache cleared: {file_path}")
             else:
                 # Clear all cache
-                self._cache.clear()
+                for key in list(self._cache):
+                    self._remove_entry(key)
+                self.page_text_cache.clear()
+                self._revision_results.clear()
                 self._file_passwords.clear()
+                self._digest_memo.clear()
                 self.logger.info("All cache cleared")
     
     def get_cache_status(self) -> Dict[str, Any]:
         """Get cache status"""
         with self._lock:
+            lookups = self._result_stats["hits"] + self._result_stats["misses"]
             return {
                 "total_entries": len(self._cache),
+                "key_mode": settings.get_cache_key_mode(),
+                "load_mode": settings.get_reader_load_mode(),
+                "total_resident_bytes": sum(entry.resident_bytes for entry in self._cache.values()),
+                "total_mapped_bytes": sum(entry.mapped_bytes for entry in self._cache.values()),
+                "eviction": {
+                    "policy": settings.get_cache_eviction_policy(),
+                    "max_entries": settings.get_cache_max_entries(),
+                    "max_bytes": settings.get_cache_max_bytes(),
+                    "total_bytes": sum(entry.size_bytes for entry in self._cache.values()),
+                    "invalidated_stale": self._eviction_stats["stale"],
+                    "evicted_expired": self._eviction_stats["expired"],
+                    "evicted_max_entries": self._eviction_stats["max_entries"],
+                    "evicted_max_bytes": self._eviction_stats["max_bytes"],
+                    "mappings_pending_close": len(self._retired)
+                },
                 "cache_entries": [
                     {
                         "file_path": entry.file_path,
+                        "canonical_path": entry.canonical_path,
                         "created_at": entry.created_at,
                         "last_accessed": entry.last_accessed,
-                        "access_count": entry.access_count
+                        "access_count": entry.access_count,
+                        "load_mode": entry.load_mode,
+                        "resident_bytes": entry.resident_bytes,
+                        "mapped_bytes": entry.mapped_bytes,
+                        "cached_results": sorted(entry.results.keys())
                     }
                     for entry in self._cache.values()
                 ],
+                "results_cache": {
+                    "entries": sum(len(entry.results) for entry in self._cache.values()),
+                    "hits": self._result_stats["hits"],
+                    "misses": self._result_stats["misses"],
+                    "hit_ratio": round(self._result_stats["hits"] / lookups, 4) if lookups else 0.0
+                },
+                "page_text_cache": self.page_text_cache.get_status(),
+                "revision_cache": {
+                    "entries": len(self._revision_results),
+                    "max_entries": settings.get_revision_cache_entries()
+                },
+                "persistent_cache": (
+                    self.persistent_cache.get_status() if self.persistent_cache is not None else {"enabled": False}
+                ),
                 "stored_passwords": len(self._file_passwords)
             }
 
@@ -3,11 +3,12 @@
 Unified Error Handling Module
 """
 
-import json
 import logging
 from typing import Dict, Any, Optional
 from enum import Enum
 
+from .serializer import response_serializer
+
 
 class PDFErrorType(Enum):
     """PDF error type enumeration"""
@@ -19,6 +20,7 @@ class PDFErrorType(Enum):
     PERMISSION_DENIED = "PERMISSION_DENIED"
     FILE_TOO_LARGE = "FILE_TOO_LARGE"
     PROCESSING_ERROR = "PROCESSING_ERROR"
+    TIMEOUT = "TIMEOUT"
 
 
 class PDFProcessingError(Exception):
@@ -60,7 +62,7 @@ class ErrorHandler:
         if file_path:
             error_response["file_path"] = file_path
         
-        return json.dumps(error_response, ensure_ascii=False, indent=2)
+        return response_serializer.dumps(error_response)
     
     def create_error_dict(
         self, 
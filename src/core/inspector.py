@@ -3,16 +3,54 @@
 PDF Action Inspector Core Class
 """
 
-import json
+import itertools
 import logging
-from typing import Dict, Any, Optional
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from PyPDF2 import PdfReader
 
 from ..config.settings import settings
 from ..config.policies import PDF_ACTION_ANALYSIS_POLICY
 from ..core.cache_manager import cache_manager
-from ..core.error_handler import error_handler, PDFProcessingError
+from ..core.error_handler import error_handler, PDFErrorType, PDFProcessingError
+from ..core.metrics import metrics
+from ..core.profiler import profiled
+from ..core.serializer import response_serializer
 from ..utils.pdf_utils import pdf_utils
-from ..utils.action_extractor import action_extractor
+from ..utils.action_extractor import action_extractor, to_ndjson_line, EXTRACTOR_VERSION
+from ..utils.action_index import action_index_builder, ActionIndex
+from ..utils.name_tree import TreeWalk, get_names_tree
+from ..utils.field_index import field_index_builder, FieldIndex, FIELD_INDEX_VERSION, MATCH_MODES
+from ..utils.reference_index import reference_index_builder, ReferenceIndex, REFERENCE_INDEX_VERSION
+from ..utils.revisions import incremental_extractor, RevisionState, REVISION_STATE_KEY
+from ..utils.revision_diff import revision_differ, REVISION_DIFF_VERSION
+
+
+# Fewest uncached pages per worker process before page text is extracted in parallel
+PAGES_PER_TEXT_WORKER = 16
+
+# Reader of the last document a page text worker process read, with its identity
+_worker_reader: Optional[Tuple[Tuple[Any, ...], PdfReader]] = None
+
+
+def _extract_page_texts(file_path: str, page_numbers: List[int], password: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Extract the text of several pages in a worker process, with a reader of its own"""
+    global _worker_reader
+    stat = os.stat(file_path)
+    identity = (os.path.realpath(file_path), stat.st_mtime_ns, stat.st_size, password)
+    if _worker_reader is None or _worker_reader[0] != identity:
+        reader = PdfReader(file_path)
+        if reader.is_encrypted:
+            reader.decrypt(password or "")
+        _worker_reader = (identity, reader)
+
+    reader = _worker_reader[1]
+    return [pdf_utils.extract_text_from_page(reader, page_num) for page_num in page_numbers]
 
 
 class PDFActionInspector:
@@ -29,18 +67,28 @@ class PDFActionInspector:
         # Use built-in analysis policy
         self.policy_text = PDF_ACTION_ANALYSIS_POLICY
         
+        # Page text worker processes, started on first use and kept until close()
+        self._text_pool: Optional[ProcessPoolExecutor] = None
+        self._text_pool_lock = threading.Lock()
+        
         self.logger.info("PDFActionInspector initialization complete")
     
+    def close(self):
+        """Shut down the page text worker processes, if any were started"""
+        with self._text_pool_lock:
+            pool, self._text_pool = self._text_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+    
+    @profiled
     def analyze_pdf_actions_security(self, file_path: str, password: Optional[str] = None) -> str:
         """Generate comprehensive PDF security analysis prompt with action guidance"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            
             # Get document basic information
-            basic_info = pdf_utils.get_document_basic_info(reader, file_path)
+            basic_info = self._get_basic_info(file_path, password)
             
             # Extract all Actions data
-            all_actions = action_extractor.extract_all_actions(reader)
+            all_actions = self._get_all_actions(file_path, password)
             
             # Generate enhanced analysis prompt
             prompt = f"""# PDF Security Analysis Task
@@ -80,7 +128,7 @@ class PDFActionInspector:
 ## Initial Actions Data
 
 ```json
-{json.dumps(all_actions, ensure_ascii=False, indent=2)}
+{response_serializer.dumps(all_actions)}
 ```
 
 ## Required Analysis Steps
@@ -142,15 +190,12 @@ class PDFActionInspector:
             self.logger.error(f"Failed to generate analysis prompt: {e}")
             return self.error_handler.handle_pdf_error(file_path, e)
     
+    @profiled
     def extract_pdf_actions(self, file_path: str, password: Optional[str] = None) -> Dict[str, Any]:
         """Pure PDF Actions data extraction, no analysis"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            
             # Extract all Actions - return complete structured data
-            all_actions = action_extractor.extract_all_actions(reader)
-            
-            return all_actions
+            return self._get_all_actions(file_path, password)
             
         except PDFProcessingError as e:
             self.logger.error(f"PDF processing error: {e}")
@@ -159,19 +204,125 @@ class PDFActionInspector:
             self.logger.error(f"Failed to extract PDF Actions: {e}")
             return self.error_handler.handle_pdf_error_dict(file_path, e)
     
+    def iter_pdf_actions(self, file_path: str, password: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream PDF Actions one record per trigger.
+        
+        Yields the records of ActionExtractor.iter_action_records, or a single
+        error dict if the document cannot be opened. The reader stays in use,
+        so its mapping stays open, until the generator is exhausted or closed.
+        """
+        with ExitStack() as stack:
+            try:
+                reader = stack.enter_context(self.cache_manager.use_reader(file_path, password))
+            except PDFProcessingError as e:
+                self.logger.error(f"PDF processing error: {e}")
+                yield self.error_handler.create_error_dict(e.error_type, e.message, file_path)
+                return
+            except Exception as e:
+                self.logger.error(f"Failed to stream PDF Actions: {e}")
+                yield self.error_handler.handle_pdf_error_dict(file_path, e)
+                return
+            
+            yield from action_extractor.iter_action_records(reader)
+    
+    @profiled
+    def get_pdf_actions_ndjson(
+        self, file_path: str, password: Optional[str] = None, cursor: int = 0, max_records: Optional[int] = None
+    ) -> str:
+        """
+        PDF Actions as compact JSON Lines, one record per trigger, one bounded page at a time.
+        
+        Returns at most max_records records (PDF_NDJSON_MAX_RECORDS by default)
+        starting at record number cursor. When more records follow, the last
+        line is {"next_cursor": n} instead of a record.
+        """
+        max_records = max(1, max_records or settings.get_ndjson_max_records())
+        records = itertools.islice(self.iter_pdf_actions(file_path, password), max(0, cursor), None)
+        
+        lines = []
+        for record in records:
+            if len(lines) == max_records:
+                lines.append(to_ndjson_line({"next_cursor": max(0, cursor) + max_records}))
+                break
+            lines.append(to_ndjson_line(record))
+        return "".join(lines)
+    
+    @profiled
+    def export_pdf_actions_ndjson(self, file_path: str, output_path: str, password: Optional[str] = None) -> Dict[str, Any]:
+        """Stream PDF Actions as JSON Lines to a file under PDF_EXPORT_DIR without building the full result"""
+        try:
+            target = self._resolve_export_path(output_path)
+            with self.cache_manager.use_reader(file_path, password) as reader:
+                records = 0
+                # Never follow a symlink planted at the target
+                flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_NOFOLLOW", 0)
+                with open(os.open(target, flags, 0o644), "w", encoding="utf-8") as output:
+                    for line in action_extractor.iter_action_ndjson(reader):
+                        output.write(line)
+                        records += 1
+                
+                return {
+                    "success": True,
+                    "file_path": file_path,
+                    "output_path": target,
+                    "records": records,
+                    "bytes_written": os.path.getsize(target)
+                }
+            
+        except ValueError as e:
+            return self.error_handler.create_error_dict(PDFErrorType.PROCESSING_ERROR, str(e), file_path)
+        except PDFProcessingError as e:
+            self.logger.error(f"PDF processing error: {e}")
+            return self.error_handler.create_error_dict(e.error_type, e.message, file_path)
+        except Exception as e:
+            self.logger.error(f"Failed to export PDF Actions: {e}")
+            return self.error_handler.handle_pdf_error_dict(file_path, e)
+    
+    def _resolve_export_path(self, output_path: str) -> str:
+        """Real path of an export file, which must lie inside PDF_EXPORT_DIR"""
+        export_dir = settings.get_export_dir()
+        if not export_dir:
+            raise ValueError("Exports are disabled; set PDF_EXPORT_DIR to the directory exports may be written to")
+        
+        root = os.path.realpath(export_dir)
+        target = os.path.realpath(os.path.join(root, output_path))
+        if os.path.commonpath([root, target]) != root or target == root:
+            raise ValueError(f"Output path is outside PDF_EXPORT_DIR: {output_path}")
+        return target
+    
+    @profiled
     def get_document_overview(self, file_path: str, password: Optional[str] = None) -> Dict[str, Any]:
         """Get PDF document overview"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            
             # Basic information
-            basic_info = pdf_utils.get_document_basic_info(reader, file_path)
+            basic_info = self._get_basic_info(file_path, password)
             
             # Structure information
-            structure_info = self._analyze_document_structure(reader)
-            
-            # Actions raw data
-            actions_data = action_extractor.extract_all_actions(reader)
+            structure_info = self.cache_manager.get_document_result(
+                file_path, f"structure:v{EXTRACTOR_VERSION}", self._analyze_document_structure, password,
+                persistent=True
+            )
+            
+            # Actions index; only the levels of the summary are rendered
+            action_index = self._get_action_index(file_path, password)
+            rendered = {}
+            actions_summary = {
+                level: action_index.render_level(level, rendered)
+                for level in (
+                    "document_level_actions",
+                    "document_level_scripts",
+                    "embedded_files",
+                    "pages_level_actions",
+                    "annotations_level_actions",
+                    "field_level_actions"
+                )
+            }
+            actions_summary.update(action_index.summary())
+            truncation = action_index.get_extra("truncation")
+            if truncation:
+                actions_summary["truncated"] = True
+                actions_summary["truncation"] = truncation
             
             overview = {
                 "filename": basic_info.get("filename", ""),
@@ -190,14 +341,7 @@ class PDFActionInspector:
                     "modification_date": basic_info.get("modification_date", "")
                 },
                 "structure": structure_info,
-                "actions_summary": {
-                    "document_level_actions": actions_data.get("document_level_actions", {}),
-                    "pages_level_actions": actions_data.get("pages_level_actions", {}),
-                    "annotations_level_actions": actions_data.get("annotations_level_actions", {}),
-                    "field_level_actions": actions_data.get("field_level_actions", {}),
-                    "total_actions": actions_data.get("total_actions", 0),
-                    "action_types": actions_data.get("action_types", {})
-                }
+                "actions_summary": actions_summary
             }
             
             return overview
@@ -207,123 +351,263 @@ class PDFActionInspector:
         except Exception as e:
             return self.error_handler.handle_pdf_error_dict(file_path, e)
     
+    @profiled
     def get_page_text_content(self, file_path: str, page_number: int = 0, password: Optional[str] = None) -> Dict[str, Any]:
         """Get page text content"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            result = pdf_utils.extract_text_from_page(reader, page_number)
-            return result
+            return self._get_page_texts(file_path, [page_number], password)[0]
             
         except PDFProcessingError as e:
             return self.error_handler.create_error_dict(e.error_type, e.message, file_path)
         except Exception as e:
             return self.error_handler.handle_pdf_error_dict(file_path, e)
     
+    @profiled
     def load_all_annotations(self, file_path: str, password: Optional[str] = None) -> str:
         """Load all annotations"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            annotations = self._extract_all_annotations(reader)
-            return json.dumps(annotations, ensure_ascii=False, indent=2)
+            annotations = self._extract_all_annotations(file_path, password)
+            return response_serializer.dumps(annotations)
             
         except PDFProcessingError as e:
             return self.error_handler.create_error_response(e.error_type, e.message, file_path)
         except Exception as e:
             return self.error_handler.handle_pdf_error(file_path, e)
     
+    @profiled
     def get_trailer_object(self, file_path: str, password: Optional[str] = None) -> Dict[str, Any]:
         """Get Trailer object"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            result = pdf_utils.parse_trailer_object(reader)
-            return result
+            with self.cache_manager.use_reader(file_path, password) as reader:
+                result = pdf_utils.parse_trailer_object(reader)
+                return result
             
         except PDFProcessingError as e:
             return self.error_handler.create_error_dict(e.error_type, e.message, file_path)
         except Exception as e:
             return self.error_handler.handle_pdf_error_dict(file_path, e)
     
-    def get_fields_by_name(self, file_path: str, field_name: str, password: Optional[str] = None) -> Dict[str, Any]:
-        """Find fields by name"""
+    @profiled
+    def get_revision_diff(self, file_path: str, password: Optional[str] = None) -> Dict[str, Any]:
+        """Get the Actions, fields and annotations each recent incremental update changed, memoized per document"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            result = pdf_utils.find_form_fields_by_name(reader, field_name)
-            return result
+            return self.cache_manager.get_document_result(
+                file_path,
+                f"revision_diff:v{EXTRACTOR_VERSION}.{REVISION_DIFF_VERSION}:{revision_differ.max_revisions}",
+                revision_differ.diff,
+                password,
+                persistent=True
+            )
             
         except PDFProcessingError as e:
             return self.error_handler.create_error_dict(e.error_type, e.message, file_path)
         except Exception as e:
             return self.error_handler.handle_pdf_error_dict(file_path, e)
     
-    def get_pdf_object_information(self, file_path: str, object_number: int, password: Optional[str] = None) -> Dict[str, Any]:
-        """Get PDF object information"""
+    @profiled
+    def get_fields_by_name(
+        self, file_path: str, field_name: str, password: Optional[str] = None, match: str = "substring"
+    ) -> Dict[str, Any]:
+        """Find fields by name using the document's cached field index"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            result = pdf_utils.get_pdf_object_info(reader, object_number)
-            return result
+            if match not in MATCH_MODES:
+                return self._invalid_match_error(match, file_path)
+            return self._get_field_index(file_path, password).find(field_name, match)
+            
+        except ValueError as e:
+            return self.error_handler.create_error_dict(PDFErrorType.PROCESSING_ERROR, str(e), file_path)
+        except PDFProcessingError as e:
+            return self.error_handler.create_error_dict(e.error_type, e.message, file_path)
+        except Exception as e:
+            return self.error_handler.handle_pdf_error_dict(file_path, e)
+    
+    @profiled
+    def get_fields_by_names(
+        self, file_path: str, field_names: List[str], password: Optional[str] = None, match: str = "exact"
+    ) -> Dict[str, Any]:
+        """Find many fields by name in one call using the document's cached field index"""
+        try:
+            if match not in MATCH_MODES:
+                return self._invalid_match_error(match, file_path)
+            return self._get_field_index(file_path, password).find_many(field_names, match)
             
+        except ValueError as e:
+            return self.error_handler.create_error_dict(PDFErrorType.PROCESSING_ERROR, str(e), file_path)
+        except PDFProcessingError as e:
+            return self.error_handler.create_error_dict(e.error_type, e.message, file_path)
+        except Exception as e:
+            return self.error_handler.handle_pdf_error_dict(file_path, e)
+    
+    @profiled
+    def get_pdf_object_information(
+        self,
+        file_path: str,
+        object_number: int,
+        password: Optional[str] = None,
+        depth: Optional[int] = None,
+        stream_preview_bytes: int = 0
+    ) -> Dict[str, Any]:
+        """Get PDF object information, with its content rendered down to depth levels"""
+        try:
+            if depth is not None and depth < 0:
+                raise ValueError(f"Invalid depth: {depth}")
+            
+            with self.cache_manager.use_reader(file_path, password) as reader:
+                result = pdf_utils.get_pdf_object_info(
+                    reader,
+                    object_number,
+                    settings.get_object_dump_max_depth() if depth is None else depth,
+                    settings.get_object_dump_max_nodes(),
+                    min(max(0, stream_preview_bytes), settings.get_object_dump_max_preview_bytes())
+                )
+                return result
+            
+        except ValueError as e:
+            return self.error_handler.create_error_dict(PDFErrorType.PROCESSING_ERROR, str(e), file_path)
+        except PDFProcessingError as e:
+            return self.error_handler.create_error_dict(e.error_type, e.message, file_path)
+        except Exception as e:
+            return self.error_handler.handle_pdf_error_dict(file_path, e)
+    
+    @profiled
+    def get_pdf_objects_information(
+        self,
+        file_path: str,
+        object_numbers: Optional[List[int]] = None,
+        object_spans: str = "",
+        depth: int = 0,
+        password: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get information of many objects in one call, following references up to depth levels"""
+        try:
+            if depth < 0:
+                raise ValueError(f"Invalid depth: {depth}")
+            
+            with self.cache_manager.use_reader(file_path, password) as reader:
+                numbers = list(object_numbers or [])
+                if object_spans:
+                    numbers.extend(pdf_utils.parse_page_spans(object_spans, int(reader.trailer.get("/Size", 0))))
+                if not numbers:
+                    raise ValueError("No object numbers given")
+                
+                return pdf_utils.get_pdf_objects_info(
+                    reader,
+                    numbers,
+                    depth,
+                    settings.get_object_batch_max_objects(),
+                    settings.get_object_dump_max_depth(),
+                    settings.get_object_dump_max_nodes()
+                )
+            
+        except ValueError as e:
+            return self.error_handler.create_error_dict(PDFErrorType.PROCESSING_ERROR, str(e), file_path)
         except PDFProcessingError as e:
             return self.error_handler.create_error_dict(e.error_type, e.message, file_path)
         except Exception as e:
             return self.error_handler.handle_pdf_error_dict(file_path, e)
     
+    @profiled
     def load_all_annotations_in_page(self, file_path: str, page_index: int, password: Optional[str] = None) -> str:
         """Load annotations from specified page"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            annotations = self._extract_page_annotations(reader, page_index)
-            return json.dumps(annotations, ensure_ascii=False, indent=2)
+            with self.cache_manager.use_reader(file_path, password) as reader:
+                annotations = self._extract_page_annotations(reader, page_index)
+                return response_serializer.dumps(annotations)
             
         except PDFProcessingError as e:
             return self.error_handler.create_error_response(e.error_type, e.message, file_path)
         except Exception as e:
             return self.error_handler.handle_pdf_error(file_path, e)
     
+    @profiled
     def get_page_information_by_spans(self, file_path: str, page_spans: str, password: Optional[str] = None) -> str:
         """Get information by page ranges"""
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            
-            # Parse page ranges
-            pages = pdf_utils.parse_page_spans(page_spans, len(reader.pages))
-            
-            result = {
-                "page_spans": page_spans,
-                "parsed_indices": pages,
-                "total_pages": len(reader.pages),
-                "pages_info": []
-            }
-            
-            for page_num in pages:
-                page_info = pdf_utils.extract_text_from_page(reader, page_num)
-                result["pages_info"].append(page_info)
-            
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            with self.cache_manager.use_reader(file_path, password) as reader:
+                # Parse page ranges
+                pages = pdf_utils.parse_page_spans(page_spans, len(reader.pages))
+                
+                result = {
+                    "page_spans": page_spans,
+                    "parsed_indices": pages,
+                    "total_pages": len(reader.pages),
+                    "pages_info": []
+                }
+                
+                result["pages_info"] = self._get_page_texts(file_path, pages, password)
+                
+                return response_serializer.dumps(result)
             
         except PDFProcessingError as e:
             return self.error_handler.create_error_response(e.error_type, e.message, file_path)
         except Exception as e:
             return self.error_handler.handle_pdf_error(file_path, e)
     
-    def get_page_index_by_pdfobjnum(self, file_path: str, obj_num: int, password: Optional[str] = None) -> str:
-        """Find page by object number"""
+    @profiled
+    def get_page_information_by_spans_paginated(
+        self,
+        file_path: str,
+        page_spans: str,
+        cursor: int = 0,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        password: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get information by page ranges, one bounded slice of the selected pages per call.
+        
+        Pages are returned in order from the cursor (a position in
+        parsed_indices) until max_pages pages or max_chars characters of
+        text are reached. A page that alone exceeds the character budget is
+        cut and flagged with text_truncated. Pass next_cursor back to get
+        the following slice; it is None after the last page.
+        """
         try:
-            reader = self.cache_manager.get_reader(file_path, password)
-            
-            result = {
-                "object_number": obj_num,
-                "found_pages": [],
-                "total_matches": 0
-            }
-            
-            # Iterate through all pages to find object references
-            for page_num, page in enumerate(reader.pages):
-                if hasattr(page, 'indirect_reference'):
-                    if page.indirect_reference.idnum == obj_num:
-                        result["found_pages"].append(page_num)
+            with self.cache_manager.use_reader(file_path, password) as reader:
+                pages = pdf_utils.parse_page_spans(page_spans, len(reader.pages))
+                
+                max_pages = max_pages or settings.get_span_max_pages()
+                max_chars = max_chars or settings.get_span_max_chars()
+                cursor = max(0, cursor)
+                selected = pages[cursor:cursor + max_pages]
+                
+                pages_info = []
+                chars = 0
+                for page_info in self._get_page_texts(file_path, selected, password):
+                    text_length = page_info.get("text_length", 0)
+                    if pages_info and chars + text_length > max_chars:
+                        break
+                    if text_length > max_chars:
+                        page_info = dict(page_info)
+                        page_info["text_content"] = page_info["text_content"][:max_chars]
+                        page_info["text_truncated"] = True
+                    chars += min(text_length, max_chars)
+                    pages_info.append(page_info)
+                
+                next_cursor = cursor + len(pages_info)
+                return {
+                    "page_spans": page_spans,
+                    "total_pages": len(reader.pages),
+                    "total_selected": len(pages),
+                    "cursor": cursor,
+                    "next_cursor": next_cursor if next_cursor < len(pages) else None,
+                    "returned_pages": len(pages_info),
+                    "returned_chars": chars,
+                    "pages_info": pages_info
+                }
             
+        except PDFProcessingError as e:
+            return self.error_handler.create_error_dict(e.error_type, e.message, file_path)
+        except Exception as e:
+            return self.error_handler.handle_pdf_error_dict(file_path, e)
+    
+    @profiled
+    def get_page_index_by_pdfobjnum(self, file_path: str, obj_num: int, password: Optional[str] = None) -> str:
+        """Find the pages owning any object, using the document's cached reverse reference index"""
+        try:
+            result = self._get_reference_index(file_path, password).locate(obj_num)
             result["total_matches"] = len(result["found_pages"])
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return response_serializer.dumps(result)
             
         except PDFProcessingError as e:
             return self.error_handler.create_error_response(e.error_type, e.message, file_path)
@@ -333,17 +617,188 @@ class PDFActionInspector:
     # Management methods
     def set_password(self, file_path: str, password: str):
         """Set file password"""
-        cache_manager.set_password(file_path, password)
+        self.cache_manager.set_password(file_path, password)
     
     def clear_cache(self, file_path: Optional[str] = None):
         """Clear cache"""
-        cache_manager.clear_cache(file_path)
+        self.cache_manager.clear_cache(file_path)
     
     def get_cache_status(self) -> Dict[str, Any]:
         """Get cache status"""
-        return cache_manager.get_cache_status()
+        status = self.cache_manager.get_cache_status()
+        status["response_cache"] = response_serializer.get_status()
+        status["incremental_extraction"] = incremental_extractor.get_status()
+        return status
+    
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        """
+        Get per-tool and per-phase latency metrics with cache hit ratios.
+        
+        When PDF_METRICS_PROMETHEUS_PATH is configured, the metrics are also
+        written there in Prometheus text format; no other path is ever written.
+        """
+        result = metrics.snapshot()
+        
+        # Result and page text caches keep their own counters
+        status = self.cache_manager.get_cache_status()
+        for cache, section in (("results", "results_cache"), ("page_text", "page_text_cache"), ("persistent", "persistent_cache")):
+            counters = status.get(section, {})
+            if "hits" in counters:
+                result["caches"][cache] = {key: counters[key] for key in ("hits", "misses", "hit_ratio")}
+        
+        prometheus_path = settings.get_metrics_prometheus_path()
+        if prometheus_path:
+            try:
+                result["prometheus_path"] = prometheus_path
+                result["prometheus_bytes"] = metrics.dump_prometheus(prometheus_path)
+            except OSError as e:
+                return self.error_handler.create_error_dict(
+                    PDFErrorType.PROCESSING_ERROR, f"Failed to write metrics: {e}", prometheus_path
+                )
+        
+        return result
     
     # Private methods
+    def _get_all_actions(self, file_path: str, password: Optional[str] = None) -> Dict[str, Any]:
+        """Get all Actions, rendered from the document's action index"""
+        return self._get_action_index(file_path, password).to_actions_dict()
+    
+    def _get_action_index(self, file_path: str, password: Optional[str] = None) -> ActionIndex:
+        """
+        Get the compact action index, built once per document.
+        
+        The persistent cache stores the rendered extract_all_actions form,
+        so stored results stay readable across index layout changes.
+        """
+        return self.cache_manager.get_document_result(
+            file_path, f"actions:v{EXTRACTOR_VERSION}",
+            lambda reader: self._build_action_index(file_path, reader, password), password,
+            persistent=True, encode=ActionIndex.to_actions_dict, decode=ActionIndex.from_actions
+        )
+    
+    def _build_action_index(self, file_path: str, reader, password: Optional[str] = None) -> ActionIndex:
+        """
+        Extract all Actions, re-extracting only what changed since a known previous revision.
+        
+        Each revision's index and the dependencies of its nodes are kept by
+        content digest, so an incremental update of an analysed document,
+        at any path, reuses everything its appended objects did not touch.
+        """
+        if not settings.get_incremental_extraction():
+            return action_index_builder.build(reader)
+        
+        actions_key = f"actions:v{EXTRACTOR_VERSION}"
+        
+        def lookup(digest: str):
+            state = self.cache_manager.get_revision_result(
+                file_path, digest, REVISION_STATE_KEY, password, decode=RevisionState.from_dict
+            )
+            if state is None:
+                return None
+            index = self.cache_manager.get_revision_result(
+                file_path, digest, actions_key, password, decode=ActionIndex.from_actions
+            )
+            return (index.to_actions_dict(), state) if index is not None else None
+        
+        # The digest is memoized per file version and shared with the persistent cache keys
+        revision = incremental_extractor.extract_revision(
+            reader, lookup, digest=self.cache_manager.get_content_digest(file_path)
+        )
+        action_index = ActionIndex.from_actions(revision.actions)
+        
+        if revision.state is not None and revision.digest is not None:
+            # The index itself is persisted by get_document_result under the same key
+            self.cache_manager.store_revision_result(file_path, revision.digest, actions_key, action_index, password)
+            self.cache_manager.store_revision_result(
+                file_path, revision.digest, REVISION_STATE_KEY, revision.state, password,
+                persistent=True, encode=RevisionState.to_dict
+            )
+        return action_index
+    
+    def _get_basic_info(self, file_path: str, password: Optional[str] = None) -> Dict[str, Any]:
+        """Get document basic information, memoized per document"""
+        basic_info = self.cache_manager.get_document_result(
+            file_path,
+            f"basic_info:v{EXTRACTOR_VERSION}",
+            lambda reader: pdf_utils.get_document_basic_info(reader, file_path),
+            password,
+            persistent=True
+        )
+        
+        # The cached entry may be shared by several names of the same content
+        if "filename" in basic_info:
+            basic_info = dict(basic_info, filename=pdf_utils.get_display_filename(file_path))
+        return basic_info
+    
+    def _get_page_texts(self, file_path: str, pages: List[int], password: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the text of several pages through the document's page text cache"""
+        def build(reader, missing: List[int]) -> List[Dict[str, Any]]:
+            return [pdf_utils.extract_text_from_page(reader, page_num) for page_num in missing]
+        
+        def prefetch(missing: List[int]) -> Optional[List[Dict[str, Any]]]:
+            return self._extract_page_texts_parallel(file_path, missing, password)
+        
+        return self.cache_manager.get_page_texts(file_path, pages, build, password, prefetch=prefetch)
+    
+    def _extract_page_texts_parallel(
+        self, file_path: str, pages: List[int], password: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract page text across worker processes, each with its own reader.
+        
+        PdfReader is not thread-safe, so text extraction parallelizes over
+        processes rather than threads. The pool is started once with the
+        spawn method, so workers never inherit this process's locks or
+        threads, and is reused until close(). Returns None when the span is
+        too small to be worth it or the pool fails, so the caller extracts in-process.
+        """
+        workers = min(settings.get_text_workers(), len(pages) // PAGES_PER_TEXT_WORKER)
+        if workers < 2:
+            return None
+        
+        # Workers do not share this process's cache, so pass any password set with set_password
+        if password is None:
+            password = self.cache_manager._get_stored_password(file_path)
+        
+        chunk_size = -(-len(pages) // workers)
+        chunks = [pages[start:start + chunk_size] for start in range(0, len(pages), chunk_size)]
+        try:
+            pool = self._get_text_pool()
+            futures = [pool.submit(_extract_page_texts, file_path, chunk, password) for chunk in chunks]
+            return [page_info for future in futures for page_info in future.result()]
+        except Exception as e:
+            self.logger.warning(f"Parallel page text extraction failed, extracting in-process: {e}")
+            return None
+    
+    def _get_text_pool(self) -> ProcessPoolExecutor:
+        """Get the page text worker pool, starting it on first use"""
+        with self._text_pool_lock:
+            if self._text_pool is None:
+                self._text_pool = ProcessPoolExecutor(
+                    max_workers=settings.get_text_workers(), mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._text_pool
+    
+    def _get_field_index(self, file_path: str, password: Optional[str] = None) -> FieldIndex:
+        """Get the form field index, built once per document"""
+        return self.cache_manager.get_document_result(
+            file_path, f"field_index:v{FIELD_INDEX_VERSION}", field_index_builder.build, password
+        )
+    
+    def _get_reference_index(self, file_path: str, password: Optional[str] = None) -> ReferenceIndex:
+        """Get the reverse reference index, built once per document"""
+        return self.cache_manager.get_document_result(
+            file_path, f"reference_index:v{REFERENCE_INDEX_VERSION}", reference_index_builder.build, password
+        )
+    
+    def _invalid_match_error(self, match: str, file_path: str) -> Dict[str, Any]:
+        """Error for an unsupported field name match mode"""
+        return self.error_handler.create_error_dict(
+            PDFErrorType.PROCESSING_ERROR,
+            f"Unknown match mode '{match}', expected one of: {', '.join(MATCH_MODES)}",
+            file_path
+        )
+    
     def _analyze_document_structure(self, reader) -> Dict[str, Any]:
         """Analyze document structure"""
         try:
@@ -354,24 +809,28 @@ class PDFActionInspector:
             return {
                 "has_acroform": "/AcroForm" in catalog,
                 "has_bookmarks": "/Outlines" in catalog,
-                "has_javascript": "/JavaScript" in catalog or "/JS" in catalog,
+                "has_javascript": "/JavaScript" in catalog or "/JS" in catalog or self._has_names_tree(catalog, "/JavaScript"),
+                "has_embedded_files": self._has_names_tree(catalog, "/EmbeddedFiles"),
                 "page_count": len(reader.pages)
             }
         except:
             return {"error": "Unable to analyze document structure"}
     
+    def _has_names_tree(self, catalog, tree_name: str) -> bool:
+        """Check whether a tree of the catalog /Names dictionary has at least one entry"""
+        tree = get_names_tree(catalog, tree_name)
+        return tree is not None and next(iter(TreeWalk(tree, max_entries=1)), None) is not None
+    
     def _get_file_size(self, file_path: str) -> int:
         """Get file size"""
         try:
-            import os
             return os.path.getsize(file_path)
         except:
             return 0
     
-    def _extract_all_annotations(self, reader) -> Dict[str, Any]:
-        """Extract all annotations"""
-        # Can reuse annotation extraction logic from action_extractor
-        annotations_data = action_extractor.extract_annotation_actions(reader)
+    def _extract_all_annotations(self, file_path: str, password: Optional[str] = None) -> Dict[str, Any]:
+        """Extract all annotations with Actions, rendered from the document's action index"""
+        annotations_data = self._get_action_index(file_path, password).render_level("annotations_level_actions")
         return {
             "total_annotations": len(annotations_data),
             "annotations": annotations_data
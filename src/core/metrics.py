@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Performance Metrics Module
+Per-tool and per-phase call counts, latency histograms, bytes and cache hit ratios
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.settings import settings
+
+
+# Metric kinds: MCP tools and inspector phases
+KIND_TOOL = "tool"
+KIND_PHASE = "phase"
+
+# Inspector phases
+PHASE_LOAD = "load"
+PHASE_DECRYPT = "decrypt"
+PHASE_EXTRACT = "extract"
+PHASE_SERIALIZE = "serialize"
+
+# Latency histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+
+
+class LatencyHistogram:
+    """Call count, errors, bytes and latency distribution of one tool or phase"""
+
+    __slots__ = ("count", "errors", "total_seconds", "max_seconds", "bytes", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        # One counter per bucket plus the +Inf bucket; not cumulative
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, seconds: float, nbytes: int = 0, error: bool = False):
+        """Record one call"""
+        self.count += 1
+        self.errors += error
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes += nbytes
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def cumulative_buckets(self) -> List[Tuple[str, int]]:
+        """(upper bound, calls at or below it) pairs, ending with +Inf"""
+        result = []
+        total = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self.buckets):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary of the recorded calls"""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_seconds": round(self.total_seconds, 6),
+            "mean_seconds": round(self.total_seconds / self.count, 6) if self.count else 0.0,
+            "max_seconds": round(self.max_seconds, 6),
+            "bytes": self.bytes,
+            "latency_buckets": dict(self.cumulative_buckets())
+        }
+
+
+class _Timer:
+    """
+    Time one call; inside the block set ``bytes`` to record bytes processed
+    and ``error`` to count a failure that did not raise.
+    """
+
+    __slots__ = ("registry", "kind", "name", "bytes", "error", "start")
+
+    def __init__(self, registry: "MetricsRegistry", kind: str, name: str):
+        self.registry = registry
+        self.kind = kind
+        self.name = name
+        self.bytes = 0
+        self.error = False
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        error = self.error or exc_type is not None
+        self.registry.observe(self.kind, self.name, time.perf_counter() - self.start, self.bytes, error)
+        return False
+
+
+class _NullTimer:
+    """Stand-in timer used while metrics are disabled"""
+
+    bytes = 0
+    error = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """
+    In-process performance metrics.
+
+    ``time(kind, name)`` returns a context manager recording one call.
+    While disabled it returns a shared no-op timer and ``record_cache`` returns
+    immediately, so instrumented code pays one attribute check per call.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = settings.get_metrics_enabled() if enabled is None else enabled
+
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._cache_counts: Dict[str, List[int]] = {}
+        self._started_at = time.time()
+        self._last_dump: Optional[float] = None
+
+    def time(self, kind: str, name: str):
+        """Context manager timing one call of a tool or phase"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, kind, name)
+
+    def observe(self, kind: str, name: str, seconds: float, nbytes: int = 0, error: bool = False):
+        """Record one call of a tool or phase"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get((kind, name))
+            if histogram is None:
+                histogram = self._histograms[(kind, name)] = LatencyHistogram()
+            histogram.observe(seconds, nbytes, error)
+
+    def record_cache(self, cache: str, hit: bool):
+        """Record a lookup in a named cache"""
+        if not self.enabled:
+            return
+        with self._lock:
+            counts = self._cache_counts.setdefault(cache, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def reset(self):
+        """Forget every recorded value"""
+        with self._lock:
+            self._histograms.clear()
+            self._cache_counts.clear()
+            self._started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get every recorded value"""
+        with self._lock:
+            histograms = {key: histogram.to_dict() for key, histogram in self._histograms.items()}
+            cache_counts = {cache: tuple(counts) for cache, counts in self._cache_counts.items()}
+            started_at = self._started_at
+
+        return {
+            "enabled": self.enabled,
+            "since": started_at,
+            "tools": {name: values for (kind, name), values in sorted(histograms.items()) if kind == KIND_TOOL},
+            "phases": {name: values for (kind, name), values in sorted(histograms.items()) if kind == KIND_PHASE},
+            "caches": {
+                cache: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0
+                }
+                for cache, (hits, misses) in sorted(cache_counts.items())
+            }
+        }
+
+    def to_prometheus(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """Render a snapshot in the Prometheus text exposition format"""
+        snapshot = snapshot or self.snapshot()
+        lines = []
+
+        for kind, section in ((KIND_TOOL, "tools"), (KIND_PHASE, "phases")):
+            metric = f"pdf_inspector_{kind}_duration_seconds"
+            lines.append(f"# HELP {metric} Latency of {kind} calls")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, values in snapshot[section].items():
+                label = f'{kind}="{name}"'
+                for bound, count in values["latency_buckets"].items():
+                    lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f"{metric}_sum{{{label}}} {values['total_seconds']}")
+                lines.append(f"{metric}_count{{{label}}} {values['count']}")
+
+            for suffix, key, help_text in (("errors_total", "errors", "Failed"), ("bytes_total", "bytes", "Bytes processed by")):
+                counter = f"pdf_inspector_{kind}_{suffix}"
+                lines.append(f"# HELP {counter} {help_text} {kind} calls")
+                lines.append(f"# TYPE {counter} counter")
+                for name, values in snapshot[section].items():
+                    lines.append(f'{counter}{{{kind}="{name}"}} {values[key]}')
+
+        for key in ("hits", "misses"):
+            counter = f"pdf_inspector_cache_{key}_total"
+            lines.append(f"# HELP {counter} Cache lookup {key}")
+            lines.append(f"# TYPE {counter} counter")
+            for cache, values in snapshot["caches"].items():
+                lines.append(f'{counter}{{cache="{cache}"}} {values[key]}')
+
+        return "\n".join(lines) + "\n"
+
+    def dump_prometheus(self, path: str) -> int:
+        """Write the Prometheus text to path atomically, returning the bytes written"""
+        text = self.to_prometheus().encode("utf-8")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as output:
+            output.write(text)
+        os.replace(temp_path, path)
+        return len(text)
+
+    def maybe_dump(self):
+        """Dump to the configured Prometheus file if the dump interval has passed"""
+        path = settings.get_metrics_prometheus_path()
+        if not self.enabled or not path:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if self._last_dump is not None and now - self._last_dump < settings.get_metrics_dump_interval_seconds():
+                return
+            self._last_dump = now
+
+        try:
+            self.dump_prometheus(path)
+        except OSError as e:
+            self.logger.warning(f"Failed to write metrics to {path}: {e}")
+
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Page Text Cache Module
+Character-budgeted LRU cache of extracted page text, scoped to cached readers
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Set, Tuple
+
+
+class PageTextCache:
+    """
+    LRU cache of page text extraction results.
+
+    Pages are keyed by (document, page number), where the document is the
+    reader's cache entry, so a document's pages are discarded together with
+    its reader. The text of all cached pages together stays within
+    ``max_chars`` characters (0 = unlimited); the least recently read pages
+    are evicted first. Failed extractions are not cached.
+    """
+
+    def __init__(self, max_chars: int = 0):
+        self.logger = logging.getLogger(__name__)
+        self.max_chars = max_chars
+
+        self._pages: "OrderedDict[Tuple[Hashable, int], Dict[str, Any]]" = OrderedDict()
+        self._documents: Dict[Hashable, Set[int]] = {}
+        self._total_chars = 0
+
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0
+        }
+
+    def get_many(self, document: Hashable, page_numbers: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Get the cached pages among page_numbers, marking them recently used"""
+        found = {}
+        with self._lock:
+            for page_num in page_numbers:
+                page_info = self._pages.get((document, page_num))
+                if page_info is None:
+                    self._stats["misses"] += 1
+                    continue
+                self._pages.move_to_end((document, page_num))
+                self._stats["hits"] += 1
+                found[page_num] = page_info
+        return found
+
+    def put(self, document: Hashable, page_num: int, page_info: Dict[str, Any]):
+        """Cache one page, evicting least recently used pages to stay within budget"""
+        if "error" in page_info:
+            return
+
+        chars = self._chars(page_info)
+        if self.max_chars and chars > self.max_chars:
+            # Would evict everything else and still not fit
+            return
+
+        with self._lock:
+            self._remove((document, page_num))
+            self._pages[(document, page_num)] = page_info
+            self._documents.setdefault(document, set()).add(page_num)
+            self._total_chars += chars
+
+            while self.max_chars and self._total_chars > self.max_chars:
+                oldest = next(iter(self._pages))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def discard(self, document: Hashable):
+        """Drop every cached page of a document"""
+        with self._lock:
+            for page_num in list(self._documents.get(document, ())):
+                self._remove((document, page_num))
+
+    def clear(self):
+        """Drop every cached page"""
+        with self._lock:
+            self._pages.clear()
+            self._documents.clear()
+            self._total_chars = 0
+
+    def _remove(self, key: Tuple[Hashable, int]):
+        """Remove one page; the caller holds the lock"""
+        page_info = self._pages.pop(key, None)
+        if page_info is None:
+            return
+        self._total_chars -= self._chars(page_info)
+
+        document, page_num = key
+        pages = self._documents.get(document)
+        if pages is not None:
+            pages.discard(page_num)
+            if not pages:
+                del self._documents[document]
+
+    @staticmethod
+    def _chars(page_info: Dict[str, Any]) -> int:
+        """Characters charged against the budget for one page"""
+        return len(page_info.get("text_content") or "")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get page text cache status"""
+        with self._lock:
+            stats = dict(self._stats)
+            pages = len(self._pages)
+            documents = len(self._documents)
+            total_chars = self._total_chars
+
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "pages": pages,
+            "documents": documents,
+            "total_chars": total_chars,
+            "max_chars": self.max_chars,
+            "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            **stats
+        }
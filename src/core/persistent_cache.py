@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Persistent Result Cache Module
+SQLite store of serialized analysis results shared across restarts and processes
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class PersistentResultCache:
+    """
+    On-disk cache of JSON-serializable analysis results.
+
+    Results are keyed by the caller (document content digest, password tag
+    and versioned result name), so entries never go stale and can be shared
+    by every server process pointing at the same database file. The store
+    uses SQLite in WAL mode: readers never block each other, and writers
+    from different processes are serialized by SQLite's own locking.
+
+    When the stored payloads exceed ``max_bytes`` the least recently read
+    results are evicted. Read times only order evictions, so they are kept
+    only under a byte budget, and refreshed at most every
+    ``access_update_seconds`` per result: most hits are pure reads and do
+    not take SQLite's write lock. Storage errors are logged and treated as
+    misses, so a broken cache never breaks analysis.
+    """
+
+    # Default seconds before a result's recorded read time is refreshed
+    ACCESS_UPDATE_SECONDS = 60
+
+    def __init__(self, db_path: str, max_bytes: int = 0, access_update_seconds: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.db_path = os.path.abspath(db_path)
+        self.max_bytes = max_bytes
+        self.access_update_seconds = (
+            self.ACCESS_UPDATE_SECONDS if access_update_seconds is None else access_update_seconds
+        )
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "access_updates": 0,
+            "evictions": 0,
+            "errors": 0
+        }
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+        self.logger.info(f"Persistent result cache enabled: {self.db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, reconnecting after a fork"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            # Autocommit mode; writes open explicit transactions
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _create_schema(self):
+        """Create the results table if needed"""
+        connection = self._connect()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)")
+
+    def _count(self, stat: str, amount: int = 1):
+        """Update a statistics counter"""
+        with self._stats_lock:
+            self._stats[stat] += amount
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a stored result, or None on a miss"""
+        try:
+            connection = self._connect()
+            row = connection.execute("SELECT value, accessed_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+
+            now = time.time()
+            if self.max_bytes and now - row[1] >= self.access_update_seconds:
+                connection.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+                self._count("access_updates")
+            value = json.loads(row[0])
+            self._count("hits")
+            return value
+
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.warning(f"Persistent cache read failed for {key}: {e}")
+            self._count("errors")
+            return None
+
+    def put(self, key: str, value: Any):
+        """Store a result, evicting least recently read results beyond the byte budget"""
+        try:
+            payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Result for {key} is not serializable, not persisted: {e}")
+            return
+
+        size = len(payload.encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            self.logger.info(f"Result for {key} exceeds the persistent cache budget ({size} bytes), not persisted")
+            return
+
+        try:
+            connection = self._connect()
+            now = time.time()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, size, now, now)
+                )
+                evicted = self._enforce_budget(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+            self._count("writes")
+            if evicted:
+                self._count("evictions", evicted)
+                self.logger.info(f"Persistent cache evicted {evicted} results")
+
+        except sqlite3.Error as e:
+            self.logger.warning(f"Persistent cache write failed for {key}: {e}")
+            self._count("errors")
+
+    def _enforce_budget(self, connection: sqlite3.Connection) -> int:
+        """Delete least recently read results until the byte budget is met"""
+        if not self.max_bytes:
+            return 0
+
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        victims = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY accessed_at ASC"):
+            victims.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+        connection.executemany("DELETE FROM results WHERE key = ?", victims)
+        return len(victims)
+
+    def clear(self):
+        """Remove all stored results"""
+        try:
+            self._connect().execute("DELETE FROM results")
+            self.logger.info("Persistent result cache cleared")
+        except sqlite3.Error as e:
+            self.logger.warning(f"Persistent cache clear failed: {e}")
+            self._count("errors")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get persistent cache status"""
+        try:
+            entries, total_bytes = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Persistent cache status failed: {e}")
+            entries, total_bytes = None, None
+
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "enabled": True,
+            "path": self.db_path,
+            "entries": entries,
+            "total_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            **stats
+        }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Request Profiler Module
+Opt-in cProfile and tracemalloc captures of individual inspector calls
+"""
+
+import cProfile
+import functools
+import hashlib
+import itertools
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+from ..config.settings import settings
+
+
+# Profiling modes and the profilers each one runs
+PROFILE_MODES = {
+    "off": (),
+    "cprofile": ("cprofile",),
+    "tracemalloc": ("tracemalloc",),
+    "all": ("cprofile", "tracemalloc"),
+}
+
+# Frames of the profiler machinery itself, left out of allocation reports
+_IGNORED_ALLOCATION_FILES = (tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>")
+
+
+class ProfileReport:
+    """Files written for one profiled call"""
+
+    __slots__ = ("method", "file_path", "file_tag", "elapsed_seconds", "pstats_path", "allocations_path")
+
+    def __init__(self, method: str, file_path: str, file_tag: str):
+        self.method = method
+        self.file_path = file_path
+        self.file_tag = file_tag
+        self.elapsed_seconds = 0.0
+        self.pstats_path: Optional[str] = None
+        self.allocations_path: Optional[str] = None
+
+
+class RequestProfiler:
+    """
+    Wrap individual inspector calls with cProfile and/or tracemalloc.
+
+    Each profiled call writes a ``.pstats`` file (load with ``pstats.Stats``)
+    and a ``.allocations.txt`` top-allocation report to the profile
+    directory, named after the method and tagged with the SHA-256 of the
+    PDF, so captures from production can be matched to their sample.
+    Calls faster than the configured minimum keep no files.
+
+    Only one call is profiled at a time: the interpreter supports a single
+    active profiler and tracemalloc is process-wide. Calls made while
+    another is being profiled, including nested inspector calls, run
+    unprofiled.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def resolve_modes(self, profile: Union[None, bool, str]) -> Tuple[str, ...]:
+        """Profilers to run for a per-call flag (None = configured mode, True = all)"""
+        if profile is None:
+            mode = settings.get_profile_mode()
+        elif isinstance(profile, bool):
+            mode = "all" if profile else "off"
+        else:
+            mode = profile.lower()
+
+        if mode not in PROFILE_MODES:
+            self.logger.warning(f"Unknown profile mode '{mode}', not profiling")
+            return ()
+        return PROFILE_MODES[mode]
+
+    @contextmanager
+    def profile(self, method: str, file_path: str, modes: Tuple[str, ...]) -> Iterator[Optional[ProfileReport]]:
+        """
+        Profile the enclosed block.
+
+        Yields:
+            The ProfileReport being filled, or None when another call is
+            already being profiled
+        """
+        if not modes or not self._lock.acquire(blocking=False):
+            yield None
+            return
+
+        report = ProfileReport(method, file_path, self._file_tag(file_path))
+        profiler = cProfile.Profile() if "cprofile" in modes else None
+        started_tracing = False
+        baseline = None
+
+        try:
+            if "tracemalloc" in modes:
+                if tracemalloc.is_tracing():
+                    baseline = tracemalloc.take_snapshot()
+                else:
+                    tracemalloc.start(settings.get_profile_traceback_frames())
+                    started_tracing = True
+
+            start = time.perf_counter()
+            if profiler is not None:
+                try:
+                    profiler.enable()
+                except ValueError as e:
+                    # Another profiling tool is already active in this interpreter
+                    self.logger.warning(f"cProfile unavailable for {method}: {e}")
+                    profiler = None
+            try:
+                yield report
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                report.elapsed_seconds = time.perf_counter() - start
+
+                if report.elapsed_seconds >= settings.get_profile_min_seconds():
+                    self._write_reports(report, profiler, "tracemalloc" in modes, baseline)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self._lock.release()
+
+    def _write_reports(self, report: ProfileReport, profiler: Optional[cProfile.Profile], traced: bool, baseline):
+        """Write the pstats file and the allocation report of a finished call"""
+        try:
+            directory = settings.get_profile_dir()
+            os.makedirs(directory, exist_ok=True)
+            stem = os.path.join(
+                directory,
+                f"{time.strftime('%Y%m%dT%H%M%S')}_{os.getpid()}_{next(self._sequence)}_{report.method}_{report.file_tag[:16]}"
+            )
+
+            if profiler is not None:
+                report.pstats_path = f"{stem}.pstats"
+                profiler.dump_stats(report.pstats_path)
+
+            if traced:
+                report.allocations_path = f"{stem}.allocations.txt"
+                with open(report.allocations_path, "w", encoding="utf-8") as output:
+                    output.write(self._allocation_report(report, baseline))
+
+            self.logger.info(
+                f"Profiled {report.method}({report.file_path}) in {report.elapsed_seconds:.3f}s: "
+                f"{report.pstats_path or ''} {report.allocations_path or ''}".rstrip()
+            )
+        except Exception as e:
+            # Profiling must never break the call being profiled
+            self.logger.warning(f"Failed to write profile of {report.method}: {e}")
+
+    def _allocation_report(self, report: ProfileReport, baseline) -> str:
+        """Top allocation sites of the call, by size"""
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in _IGNORED_ALLOCATION_FILES]
+        )
+        if baseline is not None:
+            statistics = snapshot.compare_to(baseline, "lineno")
+        else:
+            statistics = snapshot.statistics("lineno")
+
+        top = settings.get_profile_top_allocations()
+        lines = [
+            f"method: {report.method}",
+            f"file: {report.file_path}",
+            f"sha256: {report.file_tag}",
+            f"elapsed_seconds: {report.elapsed_seconds:.6f}",
+            f"traced_current_bytes: {current}",
+            f"traced_peak_bytes: {peak}",
+            f"top {top} allocation sites:",
+        ]
+        lines.extend(str(statistic) for statistic in statistics[:top])
+        return "\n".join(lines) + "\n"
+
+    def _file_tag(self, file_path: str) -> str:
+        """SHA-256 of the PDF, or 'nofile' when it cannot be read"""
+        try:
+            digest = hashlib.sha256()
+            with open(file_path, "rb") as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        except (OSError, TypeError):
+            return "nofile"
+
+
+# Global request profiler instance
+request_profiler = RequestProfiler()
+
+
+def profiled(method: Callable) -> Callable:
+    """
+    Make an inspector method profilable.
+
+    The wrapped method accepts an extra keyword-only ``profile`` flag: None
+    follows PDF_PROFILE_MODE, True/False force profiling on/off, and a mode
+    name ("cprofile", "tracemalloc", "all") picks the profilers.
+    """
+    @functools.wraps(method)
+    def wrapper(self, file_path, *args, profile: Union[None, bool, str] = None, **kwargs):
+        modes = request_profiler.resolve_modes(profile)
+        if not modes:
+            return method(self, file_path, *args, **kwargs)
+
+        with request_profiler.profile(method.__name__, file_path, modes):
+            return method(self, file_path, *args, **kwargs)
+
+    return wrapper
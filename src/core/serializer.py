@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Response Serialization Module
+Single JSON encoding path for tool responses, with a compact mode, an optional fast backend and response caching
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional faster JSON backend
+    orjson = None
+
+from ..config.settings import settings
+from ..core.metrics import metrics, KIND_PHASE, PHASE_SERIALIZE
+
+
+class ResponseSerializer:
+    """
+    Serialize tool responses to JSON text.
+
+    ``dumps`` honours PDF_JSON_MODE ("pretty" indents by two spaces,
+    "compact" drops all whitespace) and uses orjson when it is installed,
+    unless PDF_JSON_BACKEND is "json". Values orjson rejects fall back to
+    the standard library, so every value encodes with either backend and
+    parses back to the same data; the text itself may differ (e.g. float
+    formatting such as 1e16 against 1e+16), so it is not byte-identical.
+
+    ``cached_response`` additionally keeps the text of results that only
+    depend on the document and the call arguments on the document's cache
+    entry, so repeated calls skip both the work and the encoding. The key
+    includes the mode and the backend, so a configuration change never
+    serves text produced under another one. Errors and responses above
+    PDF_RESPONSE_CACHE_MAX_BYTES are not kept.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._warned_missing_backend = False
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stored": 0,
+            "oversized": 0
+        }
+
+    def get_backend(self) -> str:
+        """JSON backend in use ("orjson" or "json")"""
+        backend = settings.get_json_backend()
+        if backend == "json":
+            return "json"
+        if orjson is None:
+            if backend == "orjson" and not self._warned_missing_backend:
+                self._warned_missing_backend = True
+                self.logger.warning("PDF_JSON_BACKEND is 'orjson' but orjson is not installed, using json")
+            return "json"
+        return "orjson"
+
+    def dumps(self, value: Any, mode: Optional[str] = None) -> str:
+        """Encode a value as JSON text in the given or configured mode"""
+        mode = mode or settings.get_json_mode()
+
+        if self.get_backend() == "orjson":
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if mode == "pretty" else 0)
+            try:
+                return orjson.dumps(value, option=option).decode("utf-8")
+            except TypeError:
+                # e.g. lone surrogates or integers beyond 64 bits, which json encodes
+                pass
+
+        if mode == "compact":
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(value, ensure_ascii=False, indent=2)
+
+    def serialize(self, result: Any) -> str:
+        """Encode a tool result, passing through results that already are text"""
+        if isinstance(result, str):
+            return result
+
+        with metrics.time(KIND_PHASE, PHASE_SERIALIZE) as timer:
+            text = self.dumps(result)
+            if metrics.enabled:
+                timer.bytes = len(text.encode("utf-8"))
+        return text
+
+    def cached_response(
+        self,
+        cache_manager,
+        tool_name: str,
+        file_path: str,
+        args: tuple,
+        produce: Callable[[], Any],
+        password: Optional[str] = None
+    ) -> str:
+        """
+        Serialized result of a tool call, cached on the document's cache entry.
+
+        Args:
+            cache_manager: Cache manager holding the document
+            tool_name: Name of the tool, part of the cache key
+            file_path: PDF file path
+            args: Remaining call arguments, part of the cache key (hashable, with a stable repr)
+            produce: Function computing the result on a miss
+            password: Optional document password
+
+        Returns:
+            JSON text of the result
+        """
+        max_bytes = settings.get_response_cache_max_bytes()
+        if not max_bytes:
+            return self.serialize(produce())
+
+        key = f"response:{settings.get_json_mode()}:{self.get_backend()}:{tool_name}:{file_path}:{args!r}"
+        text = cache_manager.peek_document_result(file_path, key, password)
+        hit = text is not None
+        metrics.record_cache("response", hit)
+        with self._lock:
+            self._stats["hits" if hit else "misses"] += 1
+        if hit:
+            return text
+
+        result = produce()
+        text = self.serialize(result)
+
+        if self._is_cacheable(result):
+            if len(text) <= max_bytes:
+                stored = cache_manager.store_document_result(file_path, key, text, password)
+            else:
+                stored = False
+                with self._lock:
+                    self._stats["oversized"] += 1
+            if stored:
+                with self._lock:
+                    self._stats["stored"] += 1
+        return text
+
+    def _is_cacheable(self, result: Any) -> bool:
+        """Whether a result is final; errors and truncated results may differ on a later call"""
+        return (
+            isinstance(result, dict)
+            and result.get("success") is not False
+            and "error" not in result
+            and not result.get("truncated")
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get serializer configuration and response cache counters"""
+        with self._lock:
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "mode": settings.get_json_mode(),
+            "backend": self.get_backend(),
+            "max_bytes": settings.get_response_cache_max_bytes(),
+            "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            **stats
+        }
+
+
+# Global response serializer instance
+response_serializer = ResponseSerializer()
@@ -5,7 +5,8 @@ PDF Action Extractor
 
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from contextlib import nullcontext
+from typing import Dict, Any, Iterator, List, Optional
 
 from PyPDF2 import PdfReader
 from PyPDF2.generic import (
@@ -13,9 +14,502 @@ from PyPDF2.generic import (
     DictionaryObject,
     IndirectObject,
     NameObject,
+    StreamObject,
     TextStringObject,
 )
 
+from ..config.settings import settings
+from .dependency_recorder import DependencyRecorder
+from .extraction_budget import ExtractionBudget
+from .name_tree import TreeWalk, get_names_tree
+from .object_walker import (
+    NODE_ANNOTATION,
+    NODE_CATALOG,
+    NODE_ERROR,
+    NODE_FIELD,
+    NODE_PAGE,
+    NodeCollector,
+    document_walker,
+)
+
+
+# Bump whenever extract_all_actions output changes, so memoized results are rebuilt
+EXTRACTOR_VERSION = "6"
+
+# Node kind and record level of each extract_all_actions level when Actions are streamed
+RECORD_LEVELS = {
+    "document_level_actions": (NODE_CATALOG, "document"),
+    "document_level_scripts": (NODE_CATALOG, "document_script"),
+    "embedded_files": (NODE_CATALOG, "embedded_file"),
+    "pages_level_actions": (NODE_PAGE, "page"),
+    "annotations_level_actions": (NODE_ANNOTATION, "annotation"),
+    "field_level_actions": (NODE_FIELD, "field"),
+}
+
+# Collector method handling each node kind
+VISIT_METHODS = {
+    NODE_CATALOG: "visit_catalog",
+    NODE_PAGE: "visit_page",
+    NODE_ANNOTATION: "visit_annotation",
+    NODE_FIELD: "visit_field",
+}
+
+
+def to_ndjson_line(record: Dict[str, Any]) -> str:
+    """Serialize one record as a compact JSON Lines entry"""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+class ActionChainResolver:
+    """
+    Resolve action dictionaries together with their /Next chains.
+
+    /Next holds a single action or an array of actions, so a chain is really
+    a tree; it is flattened in execution order (depth first). Every chain
+    keeps its own visited set, so cyclic chains terminate and are reported,
+    and at most max_length actions are followed. Actions are memoized by
+    object number, so an action shared by many widgets is parsed once.
+
+    A resolver lives for a single extraction, whose budget it charges;
+    memoized results are not invalidated. The output produced by a memoized
+    result, and with a recorder the objects it read, are charged to every
+    caller reusing it, as the result is repeated for each of them.
+    """
+
+    def __init__(
+        self,
+        extractor: "ActionExtractor",
+        max_length: Optional[int] = None,
+        budget: Optional[ExtractionBudget] = None,
+        recorder: Optional[DependencyRecorder] = None
+    ):
+        self.extractor = extractor
+        self.max_length = max_length or settings.get_action_chain_max_length()
+        self.budget = budget or ExtractionBudget()
+        self.recorder = recorder
+        self._chains: Dict[int, Dict[str, Any]] = {}
+        self._actions: Dict[int, Dict[str, Any]] = {}
+        self._chain_dependencies: Dict[int, Any] = {}
+        self._action_dependencies: Dict[int, Any] = {}
+        self._chain_output: Dict[int, int] = {}
+        self._action_output: Dict[int, int] = {}
+
+    def resolve(self, action) -> Dict[str, Any]:
+        """Parse an action and its /Next chain"""
+        objnum = action.idnum if isinstance(action, IndirectObject) else None
+        if objnum is not None and objnum in self._chains:
+            self._replay(self._chain_dependencies, self._chain_output, objnum)
+            return self._chains[objnum]
+
+        output_chars = self.budget.output_chars
+        with self._frame() as dependencies:
+            details = self._resolve_chain(action, objnum)
+        if objnum is not None:
+            self._chains[objnum] = details
+            self._chain_dependencies[objnum] = dependencies
+            self._chain_output[objnum] = self.budget.output_chars - output_chars
+        return details
+
+    def _parse(self, action, objnum: Optional[int]) -> Dict[str, Any]:
+        """Parse a single action, ignoring /Next"""
+        if objnum is None:
+            self.budget.charge_objects()
+            return self.extractor._parse_single_action_details(action, self.budget)
+
+        details = self._actions.get(objnum)
+        if details is None:
+            self.budget.charge_objects()
+            output_chars = self.budget.output_chars
+            with self._frame() as dependencies:
+                details = self.extractor._parse_single_action_details(action, self.budget)
+            self._actions[objnum] = details
+            self._action_dependencies[objnum] = dependencies
+            self._action_output[objnum] = self.budget.output_chars - output_chars
+        else:
+            self._replay(self._action_dependencies, self._action_output, objnum)
+        return details
+
+    def _frame(self):
+        """Record the objects read by the enclosed block, when recording"""
+        return self.recorder.frame() if self.recorder is not None else nullcontext()
+
+    def _replay(self, dependencies: Dict[int, Any], outputs: Dict[int, int], objnum: int):
+        """Charge the output and objects read of a memoized result to the current caller"""
+        self.budget.charge_output(outputs[objnum])
+        if self.recorder is not None:
+            self.recorder.add(dependencies[objnum])
+
+    def _next_actions(self, action_obj) -> List[Any]:
+        """Get the /Next entries of an action, keeping indirect references"""
+        next_entry = action_obj.get("/Next")
+        if isinstance(next_entry, IndirectObject):
+            resolved = next_entry.get_object()
+            if isinstance(resolved, ArrayObject):
+                next_entry = resolved
+        if next_entry is None:
+            return []
+        return list(next_entry) if isinstance(next_entry, ArrayObject) else [next_entry]
+
+    def _resolve_chain(self, action, objnum: Optional[int]) -> Dict[str, Any]:
+        """Parse an action and follow its /Next chain depth first"""
+        head = self._parse(action, objnum)
+        action_obj = action.get_object() if isinstance(action, IndirectObject) else action
+        if not head or not isinstance(action_obj, DictionaryObject) or "/Next" not in action_obj:
+            return head
+
+        details = dict(head)
+        details.update(self.follow_next(action_obj, objnum))
+        return details
+
+    def follow_next(self, action_obj: DictionaryObject, objnum: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Follow the /Next chain of an already parsed action depth first.
+
+        Returns the Next steps and chain_length, plus chain_cycles and
+        chain_truncated when they apply; the action itself is not parsed.
+        """
+        steps = []
+        cycles = []
+        truncated = False
+        visited = {objnum} if objnum is not None else set()
+        stack = list(reversed(self._next_actions(action_obj)))
+
+        while stack:
+            if self.budget.exhausted:
+                truncated = True
+                break
+
+            next_action = stack.pop()
+            next_objnum = next_action.idnum if isinstance(next_action, IndirectObject) else None
+            if next_objnum is not None:
+                if next_objnum in visited:
+                    cycles.append(next_objnum)
+                    continue
+                visited.add(next_objnum)
+
+            if 1 + len(steps) >= self.max_length:
+                truncated = True
+                break
+
+            step = {"objnum": next_objnum}
+            step.update(self._parse(next_action, next_objnum))
+            steps.append(step)
+
+            next_obj = next_action.get_object() if isinstance(next_action, IndirectObject) else next_action
+            if isinstance(next_obj, DictionaryObject):
+                stack.extend(reversed(self._next_actions(next_obj)))
+
+        details = {"Next": steps, "chain_length": 1 + len(steps)}
+        if cycles:
+            details["chain_cycles"] = cycles
+        if truncated:
+            details["chain_truncated"] = True
+        return details
+
+
+class DocumentActionsCollector(NodeCollector):
+    """Collect Document level Actions from the catalog"""
+
+    node_kinds = (NODE_CATALOG,)
+    error_message = "Failed to extract Document level Actions"
+
+    def __init__(self, extractor: "ActionExtractor", resolver: Optional[ActionChainResolver] = None):
+        super().__init__()
+        self.extractor = extractor
+        self.resolver = resolver or ActionChainResolver(extractor)
+
+    def visit_catalog(self, catalog):
+        document_actions = self.result
+
+        # Check OpenAction
+        open_action = catalog.get("/OpenAction")
+        if open_action:
+            action_data = self.resolver.resolve(open_action)
+            if action_data:
+                document_actions["DocumentOpenAction"] = {
+                    "objnum": getattr(open_action, "idnum", None) if isinstance(open_action, IndirectObject) else None,
+                    "actions": {"OpenAction": action_data}
+                }
+
+        # Check Additional Actions
+        aa = catalog.get("/AA")
+        if aa:
+            if isinstance(aa, IndirectObject):
+                aa = aa.get_object()
+
+            aa_actions = {}
+            for trigger in ["/WC", "/WS", "/DS", "/WP", "/DP"]:
+                if trigger in aa:
+                    action_data = self.resolver.resolve(aa.get(trigger))
+                    if action_data:
+                        aa_actions[trigger[1:]] = action_data
+
+            if aa_actions:
+                document_actions["DocumentAdditionalActions"] = {
+                    "objnum": getattr(aa, "idnum", None) if isinstance(catalog.get("/AA"), IndirectObject) else None,
+                    "actions": aa_actions
+                }
+
+
+class PageActionsCollector(NodeCollector):
+    """Collect Page level Actions"""
+
+    node_kinds = (NODE_PAGE,)
+    error_message = "Failed to extract Page level Actions"
+
+    def __init__(self, extractor: "ActionExtractor", resolver: Optional[ActionChainResolver] = None):
+        super().__init__()
+        self.extractor = extractor
+        self.resolver = resolver or ActionChainResolver(extractor)
+
+    def visit_page(self, page_num: int, page):
+        page_actions = {}
+
+        # Check page Additional Actions
+        aa = page.get("/AA")
+        if aa:
+            if isinstance(aa, IndirectObject):
+                aa = aa.get_object()
+
+            for trigger in ["/O", "/C"]:  # Open/Close
+                if trigger in aa:
+                    action_data = self.resolver.resolve(aa.get(trigger))
+                    if action_data:
+                        page_actions[trigger[1:]] = action_data
+
+        if page_actions:
+            self.result[f"page_{page_num}_actions"] = {
+                "objnum": getattr(page, "idnum", None) if hasattr(page, "idnum") else None,
+                "page_number": page_num,
+                "actions": page_actions
+            }
+
+
+class AnnotationActionsCollector(NodeCollector):
+    """Collect Annotation level Actions"""
+
+    node_kinds = (NODE_ANNOTATION,)
+    error_message = "Failed to extract Annotation level Actions"
+
+    # Common annotation triggers
+    TRIGGER_NAMES = {
+        "/E": "AnnotMouseEnter",
+        "/X": "AnnotMouseExit",
+        "/D": "AnnotMouseDown",
+        "/U": "AnnotMouseUp",
+        "/Fo": "AnnotFocus",
+        "/Bl": "AnnotBlur",
+        "/PO": "AnnotPageOpen",
+        "/PC": "AnnotPageClose",
+        "/PV": "AnnotPageVisible",
+        "/PI": "AnnotPageInvisible"
+    }
+
+    def __init__(self, extractor: "ActionExtractor", resolver: Optional[ActionChainResolver] = None):
+        super().__init__()
+        self.extractor = extractor
+        self.resolver = resolver or ActionChainResolver(extractor)
+
+    def visit_annotation(self, page_num: int, annot_num: int, annot_obj, annot_objnum: Optional[int]):
+        # Get annotation type and detailed info
+        subtype = str(annot_obj.get("/Subtype", "Unknown"))
+        annot_actions = {}
+        field_details = {}
+
+        # If it's a Widget annotation, extract field info
+        if subtype == "/Widget":
+            field_details = self.extractor._extract_field_details(annot_obj)
+
+        # Check Action (/A)
+        action = annot_obj.get("/A")
+        if action:
+            action_data = self.resolver.resolve(action)
+            if action_data:
+                annot_actions["Action"] = action_data
+
+        # Check Additional Actions (/AA)
+        aa = annot_obj.get("/AA")
+        if aa:
+            if isinstance(aa, IndirectObject):
+                aa = aa.get_object()
+
+            for trigger, trigger_name in self.TRIGGER_NAMES.items():
+                if trigger in aa:
+                    action_data = self.resolver.resolve(aa.get(trigger))
+                    if action_data:
+                        annot_actions[trigger_name] = action_data
+
+        if annot_actions:
+            key = f"actions of page_{page_num}_annot_{annot_num}({subtype.strip('/')})"
+            if field_details.get("name"):
+                key += f"[{field_details.get('type', '')} field]"
+
+            self.result[key] = {
+                "objnum": annot_objnum,
+                "page": page_num,
+                "annotation_type": subtype,
+                "actions": annot_actions
+            }
+
+            if field_details:
+                self.result[key]["field_details"] = field_details
+
+
+class FieldActionsCollector(NodeCollector):
+    """Collect Field level Actions (top-level form fields)"""
+
+    node_kinds = (NODE_FIELD,)
+    error_message = "Failed to extract Field level Actions"
+
+    # Field-specific triggers
+    TRIGGER_NAMES = {
+        "/K": "FieldKeystroke",
+        "/F": "FieldFormat",
+        "/V": "FieldValidate",
+        "/C": "FieldCalculate"
+    }
+
+    def __init__(self, extractor: "ActionExtractor", resolver: Optional[ActionChainResolver] = None):
+        super().__init__()
+        self.extractor = extractor
+        self.resolver = resolver or ActionChainResolver(extractor)
+
+    def visit_field(self, field_num: int, field_obj, field_objnum: Optional[int]):
+        field_details = self.extractor._extract_field_details(field_obj)
+        field_actions_dict = {}
+
+        # Check field Actions
+        aa = field_obj.get("/AA")
+        if aa:
+            if isinstance(aa, IndirectObject):
+                aa = aa.get_object()
+
+            for trigger, trigger_name in self.TRIGGER_NAMES.items():
+                if trigger in aa:
+                    action_data = self.resolver.resolve(aa.get(trigger))
+                    if action_data:
+                        field_actions_dict[trigger_name] = action_data
+
+        if field_actions_dict:
+            field_name = field_details.get("name", f"field_{field_num}")
+            field_type = field_details.get("type", "Unknown")
+
+            key = f"field_{field_name}({field_type})"
+            self.result[key] = {
+                "objnum": field_objnum,
+                "field_details": field_details,
+                "actions": field_actions_dict
+            }
+
+
+class NameTreeCollector(NodeCollector):
+    """
+    Base class for collectors reading a tree of the catalog /Names dictionary.
+
+    Trees are walked with TreeWalk, so deep, cyclic or huge trees stay
+    bounded; how a walk was cut short is reported in ``warnings``.
+    """
+
+    node_kinds = (NODE_CATALOG,)
+    tree_name = ""
+
+    def __init__(self, extractor: "ActionExtractor", resolver: Optional[ActionChainResolver] = None):
+        super().__init__()
+        self.extractor = extractor
+        self.resolver = resolver or ActionChainResolver(extractor)
+
+    def visit_catalog(self, catalog):
+        tree = get_names_tree(catalog, self.tree_name)
+        if tree is None:
+            return
+
+        # Every tree node, not only the leaves, is charged to the extraction budget
+        walk = TreeWalk(tree, budget=self.resolver.budget)
+        for name, value in walk:
+            if not self.resolver.budget.charge_objects():
+                break
+
+            entry = self.parse_entry(value)
+            if not entry:
+                continue
+
+            name = str(name.get_object() if isinstance(name, IndirectObject) else name)
+            key = name
+            duplicate = 1
+            while key in self.result:
+                duplicate += 1
+                key = f"{name} ({duplicate})"
+
+            self.result[key] = {
+                "objnum": value.idnum if isinstance(value, IndirectObject) else None,
+                "name": name,
+                **entry
+            }
+
+        for warning in walk.warnings():
+            self.warnings.append(f"/Names{self.tree_name}: {warning}")
+
+    def parse_entry(self, value) -> Dict[str, Any]:
+        """Parse the value of one tree entry, empty to skip it"""
+        return {}
+
+
+class DocumentScriptsCollector(NameTreeCollector):
+    """Collect document level JavaScript from the /Names/JavaScript name tree"""
+
+    tree_name = "/JavaScript"
+    error_message = "Failed to extract document level scripts"
+
+    def parse_entry(self, value) -> Dict[str, Any]:
+        action_data = self.resolver.resolve(value)
+        return {"actions": {"JavaScript": action_data}} if action_data else {}
+
+
+class EmbeddedFilesCollector(NameTreeCollector):
+    """Collect attachments from the /Names/EmbeddedFiles name tree (file data is not read)"""
+
+    tree_name = "/EmbeddedFiles"
+    error_message = "Failed to extract embedded files"
+
+    def parse_entry(self, value) -> Dict[str, Any]:
+        filespec = value.get_object() if isinstance(value, IndirectObject) else value
+        if not isinstance(filespec, DictionaryObject):
+            return {}
+
+        details = {
+            "file_name": str(filespec.get("/UF", filespec.get("/F", ""))),
+            "description": str(filespec.get("/Desc", ""))
+        }
+
+        embedded = filespec.get("/EF")
+        if isinstance(embedded, IndirectObject):
+            embedded = embedded.get_object()
+        stream_ref = embedded.get("/F") if isinstance(embedded, DictionaryObject) else None
+        stream = stream_ref.get_object() if isinstance(stream_ref, IndirectObject) else stream_ref
+
+        if isinstance(stream, DictionaryObject):
+            params = stream.get("/Params")
+            if isinstance(params, IndirectObject):
+                params = params.get_object()
+
+            details["embedded_file_objnum"] = stream_ref.idnum if isinstance(stream_ref, IndirectObject) else None
+            details["subtype"] = str(stream.get("/Subtype", ""))
+            details["size"] = self._as_int(params.get("/Size")) if isinstance(params, DictionaryObject) else None
+            # Parsed streams drop /Length; the raw (still encoded) data gives the stored size
+            stored_length = self._as_int(stream.get("/Length"))
+            if stored_length is None:
+                stored_length = len(getattr(stream, "_data", b"") or b"")
+            details["stored_length"] = stored_length
+
+        return details
+
+    def _as_int(self, value) -> Optional[int]:
+        """Convert a PDF number to int, None when absent or malformed"""
+        try:
+            return int(value.get_object() if isinstance(value, IndirectObject) else value)
+        except (TypeError, ValueError):
+            return None
+
 
 class ActionExtractor:
     """PDF Action Extractor"""
@@ -23,275 +517,178 @@ class ActionExtractor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
-    def extract_all_actions(self, reader: PdfReader) -> Dict[str, Any]:
-        """Extract all Actions, returning data organized by hierarchy"""
-        result = {
-            "document_level_actions": {},
-            "pages_level_actions": {},
-            "annotations_level_actions": {},
-            "field_level_actions": {}
-        }
+    def extract_all_actions(self, reader: PdfReader, budget: Optional[ExtractionBudget] = None) -> Dict[str, Any]:
+        """
+        Extract all Actions, returning data organized by hierarchy.
+        
+        The extraction stops once its budget (configured in Settings unless
+        given) runs out; the partial result then carries "truncated": True
+        and a "truncation" entry with the reason and resource usage.
+        """
+        result = {level: {} for level in RECORD_LEVELS}
+        budget = budget or ExtractionBudget()
         
         try:
-            # Extract Document level Actions
-            doc_actions = self._extract_document_level_actions(reader)
-            result["document_level_actions"] = doc_actions
+            # Walk the document once, feeding every level collector
+            collectors = self.create_level_collectors(budget)
+            document_walker.walk(reader, list(collectors.values()), budget)
             
-            # Extract Page level Actions  
-            page_actions = self._extract_pages_level_actions(reader)
-            result["pages_level_actions"] = page_actions
+            for level, collector in collectors.items():
+                result[level] = collector.result
             
-            # Extract Annotation level Actions
-            annotation_actions = self._extract_annotations_level_actions(reader)
-            result["annotations_level_actions"] = annotation_actions
-            
-            # Extract Field level Actions
-            field_actions = self._extract_field_level_actions(reader)
-            result["field_level_actions"] = field_actions
+            warnings = [warning for collector in collectors.values() for warning in collector.warnings]
+            if warnings:
+                result["warnings"] = warnings
             
         except Exception as e:
             self.logger.error(f"Failed to extract Actions: {e}")
             result["error"] = str(e)
         
+        if budget.exhausted:
+            result["truncated"] = True
+            result["truncation"] = budget.get_status()
+        
         return result
     
-    def _extract_document_level_actions(self, reader: PdfReader) -> Dict[str, Any]:
-        """Extract Document level Actions"""
-        document_actions = {}
+    def create_level_collectors(
+        self, budget: Optional[ExtractionBudget] = None, recorder: Optional[DependencyRecorder] = None
+    ) -> Dict[str, NodeCollector]:
+        """Create the collectors backing each level of extract_all_actions"""
+        # One resolver per extraction, so actions shared between levels are parsed once
+        resolver = ActionChainResolver(self, budget=budget, recorder=recorder)
+        return {
+            "document_level_actions": DocumentActionsCollector(self, resolver),
+            "document_level_scripts": DocumentScriptsCollector(self, resolver),
+            "embedded_files": EmbeddedFilesCollector(self, resolver),
+            "pages_level_actions": PageActionsCollector(self, resolver),
+            "annotations_level_actions": AnnotationActionsCollector(self, resolver),
+            "field_level_actions": FieldActionsCollector(self, resolver)
+        }
+    
+    def iter_action_records(self, reader: PdfReader, budget: Optional[ExtractionBudget] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate Actions one flat record per trigger.
         
-        try:
-            catalog = reader.trailer.get("/Root")
-            if not catalog:
-                return document_actions
+        Records are built by the same collectors as extract_all_actions, but
+        each collector only holds the Actions of the node being visited, so
+        memory stays flat however many annotations the document has.
+        
+        Yields:
+            {"level", "key", "objnum", "page", "annotation_index" | "field_index",
+             "annotation_type", "field_details", "trigger", "action"}, with the
+            position and detail keys present only where they apply. Embedded
+            files have no trigger; their attachment details are inlined instead.
+            {"level", "error"} is yielded once when a level cannot be extracted
+            further, and {"level", "warning"} when a level was cut short.
+            {"truncated": True, "truncation"} is yielded last when the
+            extraction budget ran out.
+        """
+        budget = budget or ExtractionBudget()
+        collectors = self.create_level_collectors(budget)
+        levels: Dict[str, List[Any]] = {kind: [] for kind in VISIT_METHODS}
+        for result_key, (kind, level) in RECORD_LEVELS.items():
+            collector = collectors[result_key]
+            levels[kind].append((level, collector, getattr(collector, VISIT_METHODS[kind])))
+        
+        for kind, payload in document_walker.iter_nodes(reader):
+            if not budget.charge_objects():
+                break
             
-            if isinstance(catalog, IndirectObject):
-                catalog = catalog.get_object()
+            if kind == NODE_ERROR:
+                failed_kind, error = payload
+                for level, collector, _ in levels[failed_kind]:
+                    if not collector.failed:
+                        collector.fail(error)
+                        yield {"level": level, "error": str(error)}
+                continue
             
-            # Check OpenAction
-            open_action = catalog.get("/OpenAction")
-            if open_action:
-                action_data = self._parse_action_details(open_action)
-                if action_data:
-                    document_actions["DocumentOpenAction"] = {
-                        "objnum": getattr(open_action, "idnum", None) if isinstance(open_action, IndirectObject) else None,
-                        "actions": {"OpenAction": action_data}
-                    }
-            
-            # Check Additional Actions
-            aa = catalog.get("/AA")
-            if aa:
-                if isinstance(aa, IndirectObject):
-                    aa = aa.get_object()
+            position = self._record_position(kind, payload)
+            for level, collector, handler in levels[kind]:
+                if collector.failed:
+                    continue
                 
-                aa_actions = {}
-                for trigger in ["/WC", "/WS", "/DS", "/WP", "/DP"]:
-                    if trigger in aa:
-                        action_data = self._parse_action_details(aa[trigger])
-                        if action_data:
-                            aa_actions[trigger[1:]] = action_data
+                collector.result = {}
+                warning_count = len(collector.warnings)
+                try:
+                    handler(*payload)
+                except Exception as e:
+                    collector.fail(e)
+                    yield {"level": level, "error": str(e)}
+                    continue
                 
-                if aa_actions:
-                    document_actions["DocumentAdditionalActions"] = {
-                        "objnum": getattr(aa, "idnum", None) if isinstance(catalog.get("/AA"), IndirectObject) else None,
-                        "actions": aa_actions
-                    }
-                        
-        except Exception as e:
-            self.logger.error(f"Failed to extract Document level Actions: {e}")
+                for key, entry in collector.result.items():
+                    yield from self._flatten_level_entry(level, key, entry, position)
+                for warning in collector.warnings[warning_count:]:
+                    yield {"level": level, "warning": warning}
         
-        return document_actions
+        if budget.exhausted:
+            yield {"truncated": True, "truncation": budget.get_status()}
     
-    def _extract_pages_level_actions(self, reader: PdfReader) -> Dict[str, Any]:
-        """Extract Page level Actions"""
-        pages_actions = {}
+    def iter_action_ndjson(self, reader: PdfReader) -> Iterator[str]:
+        """Iterate Actions as compact JSON Lines, one record per line"""
+        for record in self.iter_action_records(reader):
+            yield to_ndjson_line(record)
+    
+    def _record_position(self, kind: str, payload: tuple) -> Dict[str, Any]:
+        """Position of a node in the document for streamed records"""
+        if kind == NODE_PAGE:
+            return {"page": payload[0]}
+        if kind == NODE_ANNOTATION:
+            return {"page": payload[0], "annotation_index": payload[1]}
+        if kind == NODE_FIELD:
+            return {"field_index": payload[0]}
+        return {}
+    
+    def _flatten_level_entry(
+        self, level: str, key: str, entry: Dict[str, Any], position: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """Split one extract_all_actions entry into a record per trigger"""
+        base = {"level": level, "key": key, "objnum": entry.get("objnum")}
+        base.update(position)
+        for detail in ("annotation_type", "field_details"):
+            if detail in entry:
+                base[detail] = entry[detail]
         
-        try:
-            for page_num, page in enumerate(reader.pages):
-                page_actions = {}
-                
-                # Check page Additional Actions
-                aa = page.get("/AA")
-                if aa:
-                    if isinstance(aa, IndirectObject):
-                        aa = aa.get_object()
-                    
-                    for trigger in ["/O", "/C"]:  # Open/Close
-                        if trigger in aa:
-                            action_data = self._parse_action_details(aa[trigger])
-                            if action_data:
-                                page_actions[trigger[1:]] = action_data
-                
-                if page_actions:
-                    pages_actions[f"page_{page_num}_actions"] = {
-                        "objnum": getattr(page, "idnum", None) if hasattr(page, "idnum") else None,
-                        "page_number": page_num,
-                        "actions": page_actions
-                    }
-                        
-        except Exception as e:
-            self.logger.error(f"Failed to extract Page level Actions: {e}")
+        if "actions" not in entry:
+            # Entries without Actions (embedded files) become a single record
+            base.update((name, value) for name, value in entry.items() if name not in base)
+            yield base
+            return
         
-        return pages_actions
+        for trigger, action in entry["actions"].items():
+            record = dict(base)
+            record["trigger"] = trigger
+            record["action"] = action
+            yield record
+    
+    def _collect(self, reader: PdfReader, collector: NodeCollector) -> Dict[str, Any]:
+        """Run a single collector over the document"""
+        document_walker.walk(reader, [collector])
+        return collector.result
+    
+    def _extract_document_level_actions(self, reader: PdfReader) -> Dict[str, Any]:
+        """Extract Document level Actions"""
+        return self._collect(reader, DocumentActionsCollector(self))
+    
+    def _extract_pages_level_actions(self, reader: PdfReader) -> Dict[str, Any]:
+        """Extract Page level Actions"""
+        return self._collect(reader, PageActionsCollector(self))
     
     def _extract_annotations_level_actions(self, reader: PdfReader) -> Dict[str, Any]:
         """Extract Annotation level Actions"""
-        annotations_actions = {}
-        
-        try:
-            for page_num, page in enumerate(reader.pages):
-                annotations = page.get("/Annots", [])
-                
-                # Handle case where annotations might be an IndirectObject
-                if isinstance(annotations, IndirectObject):
-                    annotations = annotations.get_object()
-                
-                # Ensure annotations is a list/array
-                if not isinstance(annotations, (list, ArrayObject)):
-                    continue
-                
-                for annot_num, annot in enumerate(annotations):
-                    if isinstance(annot, IndirectObject):
-                        annot_obj = annot.get_object()
-                        annot_objnum = annot.idnum
-                    else:
-                        annot_obj = annot
-                        annot_objnum = None
-                    
-                    # Get annotation type and detailed info
-                    subtype = str(annot_obj.get("/Subtype", "Unknown"))
-                    annot_actions = {}
-                    field_details = {}
-                    
-                    # If it's a Widget annotation, extract field info
-                    if subtype == "/Widget":
-                        field_details = self._extract_field_details(annot_obj)
-                    
-                    # Check Action (/A)
-                    action = annot_obj.get("/A")
-                    if action:
-                        action_data = self._parse_action_details(action)
-                        if action_data:
-                            annot_actions["Action"] = action_data
-                    
-                    # Check Additional Actions (/AA)
-                    aa = annot_obj.get("/AA")
-                    if aa:
-                        if isinstance(aa, IndirectObject):
-                            aa = aa.get_object()
-                        
-                        # Common annotation triggers
-                        for trigger in ["/E", "/X", "/D", "/U", "/Fo", "/Bl", "/PO", "/PC", "/PV", "/PI"]:
-                            if trigger in aa:
-                                action_data = self._parse_action_details(aa[trigger])
-                                if action_data:
-                                    trigger_name = {
-                                        "/E": "AnnotMouseEnter",
-                                        "/X": "AnnotMouseExit", 
-                                        "/D": "AnnotMouseDown",
-                                        "/U": "AnnotMouseUp",
-                                        "/Fo": "AnnotFocus",
-                                        "/Bl": "AnnotBlur",
-                                        "/PO": "AnnotPageOpen",
-                                        "/PC": "AnnotPageClose",
-                                        "/PV": "AnnotPageVisible",
-                                        "/PI": "AnnotPageInvisible"
-                                    }.get(trigger, trigger[1:])
-                                    annot_actions[trigger_name] = action_data
-                    
-                    if annot_actions:
-                        key = f"actions of page_{page_num}_annot_{annot_num}({subtype.strip('/')})"
-                        if field_details.get("name"):
-                            key += f"[{field_details.get('type', '')} field]"
-                        
-                        annotations_actions[key] = {
-                            "objnum": annot_objnum,
-                            "page": page_num,
-                            "annotation_type": subtype,
-                            "actions": annot_actions
-                        }
-                        
-                        if field_details:
-                            annotations_actions[key]["field_details"] = field_details
-                        
-        except Exception as e:
-            self.logger.error(f"Failed to extract Annotation level Actions: {e}")
-        
-        return annotations_actions
+        return self._collect(reader, AnnotationActionsCollector(self))
     
     def _extract_field_level_actions(self, reader: PdfReader) -> Dict[str, Any]:
         """Extract Field level Actions (form fields)"""
-        field_actions = {}
-        
-        try:
-            catalog = reader.trailer.get("/Root")
-            if not catalog:
-                return field_actions
-            
-            if isinstance(catalog, IndirectObject):
-                catalog = catalog.get_object()
-            
-            acroform = catalog.get("/AcroForm")
-            if not acroform:
-                return field_actions
-            
-            if isinstance(acroform, IndirectObject):
-                acroform = acroform.get_object()
-            
-            fields = acroform.get("/Fields", [])
-            
-            # Handle case where fields might be an IndirectObject
-            if isinstance(fields, IndirectObject):
-                fields = fields.get_object()
-            
-            # Ensure fields is a list/array
-            if not isinstance(fields, (list, ArrayObject)):
-                return field_actions
-            
-            for field_num, field in enumerate(fields):
-                if isinstance(field, IndirectObject):
-                    field_obj = field.get_object()
-                    field_objnum = field.idnum
-                else:
-                    field_obj = field
-                    field_objnum = None
-                
-                field_details = self._extract_field_details(field_obj)
-                field_actions_dict = {}
-                
-                # Check field Actions
-                aa = field_obj.get("/AA")
-                if aa:
-                    if isinstance(aa, IndirectObject):
-                        aa = aa.get_object()
-                    
-                    # Field-specific triggers
-                    for trigger in ["/K", "/F", "/V", "/C"]:
-                        if trigger in aa:
-                            action_data = self._parse_action_details(aa[trigger])
-                            if action_data:
-                                trigger_name = {
-                                    "/K": "FieldKeystroke",
-                                    "/F": "FieldFormat", 
-                                    "/V": "FieldValidate",
-                                    "/C": "FieldCalculate"
-                                }.get(trigger, trigger[1:])
-                                field_actions_dict[trigger_name] = action_data
-                
-                if field_actions_dict:
-                    field_name = field_details.get("name", f"field_{field_num}")
-                    field_type = field_details.get("type", "Unknown")
-                    
-                    key = f"field_{field_name}({field_type})"
-                    field_actions[key] = {
-                        "objnum": field_objnum,
-                        "field_details": field_details,
-                        "actions": field_actions_dict
-                    }
-                        
-        except Exception as e:
-            self.logger.error(f"Failed to extract Field level Actions: {e}")
-        
-        return field_actions
+        return self._collect(reader, FieldActionsCollector(self))
+    
+    def _extract_document_level_scripts(self, reader: PdfReader) -> Dict[str, Any]:
+        """Extract document level JavaScript from the /Names/JavaScript tree"""
+        return self._collect(reader, DocumentScriptsCollector(self))
+    
+    def _extract_embedded_files(self, reader: PdfReader) -> Dict[str, Any]:
+        """Extract attachments from the /Names/EmbeddedFiles tree"""
+        return self._collect(reader, EmbeddedFilesCollector(self))
     
     def _extract_field_details(self, field_obj) -> Dict[str, Any]:
         """Extract field detailed information"""
@@ -310,10 +707,17 @@ class ActionExtractor:
         
         return details
     
-    def _parse_action_details(self, action) -> Dict[str, Any]:
-        """Parse Action detailed information"""
+    def _parse_action_details(self, action, resolver: Optional[ActionChainResolver] = None) -> Dict[str, Any]:
+        """Parse Action detailed information, following its /Next chain"""
+        if not action:
+            return {}
+        return (resolver or ActionChainResolver(self)).resolve(action)
+    
+    def _parse_single_action_details(self, action, budget: Optional[ExtractionBudget] = None) -> Dict[str, Any]:
+        """Parse Action detailed information of a single action, ignoring /Next"""
         if not action:
             return {}
+        budget = budget or ExtractionBudget()
         
         try:
             if isinstance(action, IndirectObject):
@@ -334,7 +738,16 @@ class ActionExtractor:
             if js_code:
                 if isinstance(js_code, IndirectObject):
                     js_code = js_code.get_object()
-                action_details["JS"] = str(js_code)
+                if isinstance(js_code, StreamObject):
+                    # Inflated within the stream byte budget; a cut or undecodable script is flagged
+                    decoded = budget.read_stream(js_code)
+                    action_details["JS"] = decoded.text
+                    if decoded.truncated:
+                        action_details["JS_truncated"] = True
+                    if decoded.error:
+                        action_details["JS_error"] = decoded.error
+                else:
+                    action_details["JS"] = str(js_code)
             
             # URI
             uri = action.get("/URI")
@@ -351,6 +764,7 @@ class ActionExtractor:
                 if key in action:
                     action_details[key[1:]] = str(action[key])
             
+            budget.charge_output(sum(len(value) for value in action_details.values() if isinstance(value, str)))
             return action_details
             
         except Exception as e:
@@ -360,6 +774,7 @@ class ActionExtractor:
     def _extract_document_actions(self, reader: PdfReader) -> List[Dict[str, Any]]:
         """Extract Document level Actions"""
         actions = []
+        resolver = ActionChainResolver(self)
         
         try:
             catalog = reader.trailer.get("/Root")
@@ -372,14 +787,14 @@ class ActionExtractor:
             # Check OpenAction
             open_action = catalog.get("/OpenAction")
             if open_action:
-                action_info = self._parse_action(open_action, "DocumentOpen")
+                action_info = self._parse_action(open_action, "DocumentOpen", resolver)
                 if action_info:
                     actions.append(action_info)
             
             # Check other Document level Actions
             for key in ["/AA", "/OpenAction"]:
                 if key in catalog:
-                    action_info = self._parse_action(catalog[key], f"Document{key[1:]}")
+                    action_info = self._parse_action(catalog[key], f"Document{key[1:]}", resolver)
                     if action_info:
                         actions.append(action_info)
                         
@@ -391,6 +806,7 @@ class ActionExtractor:
     def _extract_page_actions(self, reader: PdfReader) -> List[Dict[str, Any]]:
         """Extract Page level Actions"""
         actions = []
+        resolver = ActionChainResolver(self)
         
         try:
             for page_num, page in enumerate(reader.pages):
@@ -402,7 +818,7 @@ class ActionExtractor:
                     
                     if isinstance(aa_actions, DictionaryObject):
                         for trigger, action in aa_actions.items():
-                            action_info = self._parse_action(action, f"Page{trigger}")
+                            action_info = self._parse_action(action, f"Page{trigger}", resolver)
                             if action_info:
                                 action_info["page_number"] = page_num
                                 actions.append(action_info)
@@ -415,6 +831,7 @@ class ActionExtractor:
     def _extract_annotation_actions(self, reader: PdfReader) -> List[Dict[str, Any]]:
         """Extract annotation Actions"""
         actions = []
+        resolver = ActionChainResolver(self)
         
         try:
             for page_num, page in enumerate(reader.pages):
@@ -430,7 +847,7 @@ class ActionExtractor:
                     # Check annotation Actions
                     for action_key in ["/A", "/AA"]:
                         if action_key in annot:
-                            action_info = self._parse_action(annot[action_key], f"Annotation{action_key}")
+                            action_info = self._parse_action(annot[action_key], f"Annotation{action_key}", resolver)
                             if action_info:
                                 action_info["page_number"] = page_num
                                 action_info["annotation_type"] = str(annot.get("/Subtype", "Unknown"))
@@ -441,9 +858,11 @@ class ActionExtractor:
         
         return actions
     
-    def _extract_field_actions(self, reader: PdfReader) -> List[Dict[str, Any]]:
+    def _extract_field_actions(self, reader: PdfReader, budget: Optional[ExtractionBudget] = None) -> List[Dict[str, Any]]:
         """Extract field Actions"""
         actions = []
+        budget = budget or ExtractionBudget()
+        resolver = ActionChainResolver(self, budget=budget)
         
         try:
             # Check if there are forms
@@ -461,50 +880,69 @@ class ActionExtractor:
             if isinstance(acro_form, IndirectObject):
                 acro_form = acro_form.get_object()
             
-            # Recursively extract field Actions
-            def extract_from_fields(fields, parent_name=""):
-                if not fields:
-                    return
+            fields = acro_form.get("/Fields", [])
+            if isinstance(fields, IndirectObject):
+                fields = fields.get_object()
+            if not isinstance(fields, (list, ArrayObject)):
+                return actions
+            
+            # Walk the field tree depth first with an explicit stack, so deep,
+            # cyclic or very wide /Kids stay within the budget
+            visited = set()
+            stack = [(field, "") for field in reversed(fields)]
+            while stack:
+                if not budget.charge_objects():
+                    break
                 
-                for field in fields:
-                    if isinstance(field, IndirectObject):
-                        field = field.get_object()
-                    
-                    if not isinstance(field, DictionaryObject):
+                field, parent_name = stack.pop()
+                if isinstance(field, IndirectObject):
+                    if field.idnum in visited:
                         continue
-                    
-                    # Get field name
-                    field_name = field.get("/T", "")
-                    if isinstance(field_name, TextStringObject):
-                        field_name = str(field_name)
-                    
-                    full_name = f"{parent_name}.{field_name}" if parent_name else field_name
-                    
-                    # Check field Actions
-                    for action_key in ["/A", "/AA"]:
-                        if action_key in field:
-                            action_info = self._parse_action(field[action_key], f"Field{action_key}")
-                            if action_info:
-                                action_info["field_name"] = full_name
-                                action_info["field_type"] = str(field.get("/FT", "Unknown"))
-                                actions.append(action_info)
-                    
-                    # Recursively process child fields
-                    kids = field.get("/Kids")
-                    if kids:
-                        extract_from_fields(kids, full_name)
-            
-            fields = acro_form.get("/Fields", [])
-            extract_from_fields(fields)
+                    visited.add(field.idnum)
+                    field = field.get_object()
+                
+                if not isinstance(field, DictionaryObject):
+                    continue
+                
+                # Get field name
+                field_name = field.get("/T", "")
+                if isinstance(field_name, TextStringObject):
+                    field_name = str(field_name)
+                
+                full_name = f"{parent_name}.{field_name}" if parent_name else field_name
+                
+                # Check field Actions
+                for action_key in ["/A", "/AA"]:
+                    if action_key in field:
+                        action_info = self._parse_action(field[action_key], f"Field{action_key}", resolver)
+                        if action_info:
+                            action_info["field_name"] = full_name
+                            action_info["field_type"] = str(field.get("/FT", "Unknown"))
+                            actions.append(action_info)
+                
+                # Child fields are processed before the next sibling
+                kids = field.get("/Kids")
+                if isinstance(kids, IndirectObject):
+                    kids = kids.get_object()
+                if isinstance(kids, (list, ArrayObject)):
+                    stack.extend((kid, full_name) for kid in reversed(kids))
             
         except Exception as e:
             self.logger.error(f"Failed to extract field Actions: {e}")
         
         return actions
     
-    def _parse_action(self, action, context: str) -> Optional[Dict[str, Any]]:
-        """Parse single Action"""
+    def _parse_action(
+        self, action, context: str, resolver: Optional[ActionChainResolver] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Parse single Action, following /Next with the caller's resolver"""
+        resolver = resolver or ActionChainResolver(self)
+        budget = resolver.budget
+        if not budget.charge_objects():
+            return None
+        
         try:
+            objnum = action.idnum if isinstance(action, IndirectObject) else None
             if isinstance(action, IndirectObject):
                 action = action.get_object()
             
@@ -532,6 +970,15 @@ class ActionExtractor:
                 except:
                     action_info["raw_data"][key_str] = "UnparsableValue"
             
+            # Follow /Next chain
+            if "/Next" in action:
+                chain = resolver.follow_next(action, objnum)
+                action_info["next_actions"] = chain["Next"]
+                action_info["chain_length"] = chain["chain_length"]
+                for key in ("chain_cycles", "chain_truncated"):
+                    if key in chain:
+                        action_info[key] = chain[key]
+            
             # JavaScript detection
             if "/JS" in action:
                 action_info["has_javascript"] = True
@@ -541,10 +988,16 @@ class ActionExtractor:
                 elif isinstance(js_code, IndirectObject):
                     try:
                         js_obj = js_code.get_object()
-                        if hasattr(js_obj, 'get_data'):
-                            action_info["javascript_code"] = js_obj.get_data().decode('utf-8', errors='ignore')
+                        if isinstance(js_obj, StreamObject):
+                            decoded = budget.read_stream(js_obj)
+                            action_info["javascript_code"] = decoded.text
+                            if decoded.truncated:
+                                action_info["javascript_truncated"] = True
+                            if decoded.error:
+                                action_info["javascript_error"] = decoded.error
                     except:
                         action_info["javascript_code"] = "Could not extract JS code"
+                budget.charge_output(len(action_info.get("javascript_code", "")))
             
             return action_info
             
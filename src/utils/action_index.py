@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Action Index
+Compact, deduplicated per-document tables of Actions, triggers, owners and scripts
+"""
+
+import logging
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from PyPDF2 import PdfReader
+
+from .action_extractor import action_extractor, RECORD_LEVELS
+
+
+# Keys added to an Action's details by /Next chain resolution
+_CHAIN_KEYS = ("Next", "chain_length", "chain_cycles", "chain_truncated")
+
+# Strings up to this length are interned; longer ones are rarely repeated verbatim
+INTERN_MAX_LENGTH = 256
+
+
+def _intern(value: Any) -> Any:
+    """Intern short strings so repeated names and values share one object"""
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+class _Fields(tuple):
+    """Frozen dictionary: a (names, values) pair rendered back as a dict"""
+
+    __slots__ = ()
+
+
+def _thaw(value: Any) -> Any:
+    """Convert frozen values back into dicts and lists"""
+    if isinstance(value, _Fields):
+        names, values = value
+        return {name: _thaw(item) for name, item in zip(names, values)}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class ActionRecord:
+    """
+    One distinct Action, shared by every trigger that runs identical details.
+
+    ``names`` is the shared key tuple of the parsed details and ``values``
+    the matching values, with the JavaScript replaced by its position in the
+    script table. ``next_objnums`` and ``next_actions`` hold the steps of a
+    /Next chain, or are None for Actions without /Next.
+    """
+
+    __slots__ = ("names", "values", "next_objnums", "next_actions", "cycles", "truncated")
+
+    def __init__(
+        self,
+        names: Tuple[str, ...],
+        values: tuple,
+        next_objnums: Optional[tuple] = None,
+        next_actions: Optional[tuple] = None,
+        cycles: Optional[tuple] = None,
+        truncated: bool = False
+    ):
+        self.names = names
+        self.values = values
+        self.next_objnums = next_objnums
+        self.next_actions = next_actions
+        self.cycles = cycles
+        self.truncated = truncated
+
+    @property
+    def action_type(self) -> Optional[str]:
+        """The /S type of the Action"""
+        return self.values[self.names.index("S")] if "S" in self.names else None
+
+    def to_dict(self, scripts: List[str]) -> Dict[str, Any]:
+        """Action details as produced by ActionExtractor"""
+        details = {
+            name: scripts[value] if name == "JS" else _thaw(value)
+            for name, value in zip(self.names, self.values)
+        }
+        if self.next_actions is not None:
+            steps = []
+            for objnum, step in zip(self.next_objnums, self.next_actions):
+                step_details = {"objnum": objnum}
+                step_details.update(step.to_dict(scripts))
+                steps.append(step_details)
+            details["Next"] = steps
+            details["chain_length"] = 1 + len(steps)
+            if self.cycles:
+                details["chain_cycles"] = list(self.cycles)
+            if self.truncated:
+                details["chain_truncated"] = True
+        return details
+
+
+class OwnerRecord:
+    """
+    A document, page, annotation, field, script or attachment entry.
+
+    ``names`` and ``values`` hold the entry's own fields in order; its
+    triggers are the ``trigger_count`` rows of the trigger table from
+    ``first_trigger``, and ``actions_at`` is where the "actions" key sits
+    among the fields (-1 for entries without Actions, such as embedded files).
+    """
+
+    __slots__ = ("key", "names", "values", "actions_at", "first_trigger", "trigger_count")
+
+    def __init__(
+        self,
+        key: str,
+        names: Tuple[str, ...],
+        values: tuple,
+        actions_at: int,
+        first_trigger: int,
+        trigger_count: int
+    ):
+        self.key = key
+        self.names = names
+        self.values = values
+        self.actions_at = actions_at
+        self.first_trigger = first_trigger
+        self.trigger_count = trigger_count
+
+
+class ActionIndex:
+    """
+    Compact per-document form of extract_all_actions.
+
+    Owners reference triggers, triggers reference Actions and Actions
+    reference scripts, each stored once: identical Actions (e.g. the same
+    format script on thousands of widgets) become one record, identical
+    scripts one string, short values are interned and every dict shape (its
+    key tuple) is shared. The trigger table is array-backed. JSON views are
+    rendered from the tables on demand, so the nested result is never kept
+    in memory.
+    """
+
+    def __init__(self):
+        self.scripts: List[str] = []
+        self.actions: List[ActionRecord] = []
+        self.owners: List[OwnerRecord] = []
+        self.trigger_names: List[str] = []
+        self.trigger_name_ids = array("l")
+        self.trigger_action_ids = array("l")
+
+        # (level, first owner, owner count), in extraction order
+        self.levels: List[Tuple[str, int, int]] = []
+        # Other top-level entries (warnings, error, truncation), frozen
+        self.extras: List[Tuple[str, Any]] = []
+
+        # Build-time lookups, dropped once the index is complete
+        self._script_ids: Dict[str, int] = {}
+        self._action_ids: Dict[tuple, int] = {}
+        self._trigger_name_ids: Dict[str, int] = {}
+        self._shapes: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+    @classmethod
+    def from_actions(cls, all_actions: Dict[str, Any]) -> "ActionIndex":
+        """Build an index from an extract_all_actions result"""
+        index = cls()
+        # Shared detail dicts (memoized by the chain resolver) are indexed once
+        seen: Dict[int, int] = {}
+
+        for level, entries in all_actions.items():
+            if level in RECORD_LEVELS and isinstance(entries, dict):
+                first_owner = len(index.owners)
+                for key, entry in entries.items():
+                    index._add_owner(key, entry, seen)
+                index.levels.append((level, first_owner, len(index.owners) - first_owner))
+            else:
+                index.extras.append((level, index._freeze(entries)))
+
+        index._script_ids = {}
+        index._action_ids = {}
+        index._trigger_name_ids = {}
+        index._shapes = {}
+        return index
+
+    def _shape(self, names: List[str]) -> Tuple[str, ...]:
+        """Shared key tuple of a dict shape"""
+        names = tuple(names)
+        shape = self._shapes.get(names)
+        if shape is None:
+            shape = self._shapes[names] = tuple(_intern(name) for name in names)
+        return shape
+
+    def _freeze(self, value: Any) -> Any:
+        """Convert nested dicts and lists into hashable tuples of interned values"""
+        if isinstance(value, dict):
+            return _Fields((self._shape(list(value)), tuple(self._freeze(item) for item in value.values())))
+        if isinstance(value, list):
+            return tuple(self._freeze(item) for item in value)
+        return _intern(value)
+
+    def _add_owner(self, key: str, entry: Dict[str, Any], seen: Dict[int, int]):
+        """Add one level entry and its triggers"""
+        names = []
+        values = []
+        actions_at = -1
+        first_trigger = len(self.trigger_action_ids)
+
+        for name, value in entry.items():
+            if name == "actions" and isinstance(value, dict):
+                actions_at = len(names)
+                for trigger, action in value.items():
+                    self.trigger_name_ids.append(self._trigger_name_id(trigger))
+                    self.trigger_action_ids.append(self._add_action(action, seen))
+            else:
+                names.append(name)
+                values.append(self._freeze(value))
+
+        self.owners.append(OwnerRecord(
+            _intern(key), self._shape(names), tuple(values),
+            actions_at, first_trigger, len(self.trigger_action_ids) - first_trigger
+        ))
+
+    def _trigger_name_id(self, trigger: str) -> int:
+        """Position of a trigger name in the trigger name table"""
+        name_id = self._trigger_name_ids.get(trigger)
+        if name_id is None:
+            name_id = self._trigger_name_ids[trigger] = len(self.trigger_names)
+            self.trigger_names.append(_intern(trigger))
+        return name_id
+
+    def _add_action(self, details: Dict[str, Any], seen: Optional[Dict[int, int]], skip: tuple = _CHAIN_KEYS) -> int:
+        """
+        Position of an Action in the action table, adding it if it is new.
+
+        ``seen`` memoizes by dict identity and is only valid while the source
+        result is alive; chain steps pass None and skip their "objnum".
+        """
+        if seen is not None:
+            action_id = seen.get(id(details))
+            if action_id is not None:
+                return action_id
+
+        names = []
+        values = []
+        for name, value in details.items():
+            if name in skip:
+                continue
+            names.append(name)
+            if name == "JS" and isinstance(value, str):
+                values.append(self._script_id(value))
+            else:
+                values.append(self._freeze(value))
+
+        next_objnums = next_ids = None
+        if "Next" in details:
+            next_objnums = tuple(step.get("objnum") for step in details["Next"])
+            next_ids = tuple(self._add_action(step, None, ("objnum",)) for step in details["Next"])
+        cycles = tuple(details["chain_cycles"]) if details.get("chain_cycles") else None
+        truncated = bool(details.get("chain_truncated"))
+
+        shape = self._shape(names)
+        content = (shape, tuple(values), next_objnums, next_ids, cycles, truncated)
+        action_id = self._action_ids.get(content)
+        if action_id is None:
+            action_id = self._action_ids[content] = len(self.actions)
+            next_actions = None if next_ids is None else tuple(self.actions[step_id] for step_id in next_ids)
+            self.actions.append(ActionRecord(shape, content[1], next_objnums, next_actions, cycles, truncated))
+
+        if seen is not None:
+            seen[id(details)] = action_id
+        return action_id
+
+    def _script_id(self, script: str) -> int:
+        """Position of a script in the script table"""
+        script_id = self._script_ids.get(script)
+        if script_id is None:
+            script_id = self._script_ids[script] = len(self.scripts)
+            self.scripts.append(script)
+        return script_id
+
+    def render_level(self, level: str, rendered: Optional[Dict[int, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Render one level in the extract_all_actions format.
+
+        Args:
+            level: Level name, e.g. "annotations_level_actions"
+            rendered: Action dicts already rendered for this response, by
+                action position; shared Actions are rendered once
+
+        Returns:
+            The level's entries, empty for an unknown level
+        """
+        rendered = {} if rendered is None else rendered
+        for name, first_owner, owner_count in self.levels:
+            if name == level:
+                return {
+                    owner.key: self._render_owner(owner, rendered)
+                    for owner in self.owners[first_owner:first_owner + owner_count]
+                }
+        return {}
+
+    def _render_owner(self, owner: OwnerRecord, rendered: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """Render one entry with its Actions"""
+        entry = {}
+        for position, (name, value) in enumerate(zip(owner.names, owner.values)):
+            if position == owner.actions_at:
+                entry["actions"] = self._render_actions(owner, rendered)
+            entry[name] = _thaw(value)
+        if owner.actions_at == len(owner.names):
+            entry["actions"] = self._render_actions(owner, rendered)
+        return entry
+
+    def _render_actions(self, owner: OwnerRecord, rendered: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """Render the trigger to Action mapping of an entry"""
+        actions = {}
+        for row in range(owner.first_trigger, owner.first_trigger + owner.trigger_count):
+            action_id = self.trigger_action_ids[row]
+            details = rendered.get(action_id)
+            if details is None:
+                details = rendered[action_id] = self.actions[action_id].to_dict(self.scripts)
+            actions[self.trigger_names[self.trigger_name_ids[row]]] = details
+        return actions
+
+    def to_actions_dict(self) -> Dict[str, Any]:
+        """Render the whole index in the extract_all_actions format"""
+        rendered: Dict[int, Dict[str, Any]] = {}
+        result = {level: self.render_level(level, rendered) for level, _, _ in self.levels}
+        result.update((name, _thaw(value)) for name, value in self.extras)
+        return result
+
+    def get_extra(self, name: str, default: Any = None) -> Any:
+        """Get a top-level entry other than a level, such as warnings or truncation"""
+        for extra_name, value in self.extras:
+            if extra_name == name:
+                return _thaw(value)
+        return default
+
+    def summary(self) -> Dict[str, Any]:
+        """Trigger count and count of triggered Actions per /S type"""
+        action_types: Dict[str, int] = {}
+        for action_id in self.trigger_action_ids:
+            action_type = self.actions[action_id].action_type or "Unknown"
+            action_types[action_type] = action_types.get(action_type, 0) + 1
+        return {
+            "total_actions": len(self.trigger_action_ids),
+            "action_types": action_types
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Table sizes of the index"""
+        return {
+            "owners": len(self.owners),
+            "triggers": len(self.trigger_action_ids),
+            "distinct_actions": len(self.actions),
+            "distinct_scripts": len(self.scripts),
+            "script_chars": sum(len(script) for script in self.scripts)
+        }
+
+
+class ActionIndexBuilder:
+    """Build an ActionIndex from a reader"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def build(self, reader: PdfReader) -> ActionIndex:
+        """Extract all Actions once and compact them; the nested result is discarded"""
+        return ActionIndex.from_actions(action_extractor.extract_all_actions(reader))
+
+
+# Global action index builder instance
+action_index_builder = ActionIndexBuilder()
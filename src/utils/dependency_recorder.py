@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Dependency Recorder
+Record which indirect objects a reader resolves while extracting each node
+"""
+
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Set
+
+from PyPDF2 import PdfReader
+
+
+class DependencyRecorder:
+    """
+    Record the object numbers a reader resolves, per nested frame.
+
+    While ``installed``, every ``reader.get_object`` call, which is how
+    PyPDF2 resolves each indirect reference, adds the object number to the
+    innermost open ``frame``. Closing a frame adds its objects to the
+    enclosing one, so a node's frame also holds what the Actions it
+    resolved read. Results memoized across nodes are charged again with
+    ``add``. Resolutions outside any frame are not recorded.
+    """
+
+    def __init__(self, reader: PdfReader):
+        self.reader = reader
+        self._frames: List[Set[int]] = []
+
+    @contextmanager
+    def installed(self) -> Iterator["DependencyRecorder"]:
+        """Record resolutions of the reader for the enclosed block"""
+        shadowed = self.reader.__dict__.get("get_object")
+        original = self.reader.get_object
+        frames = self._frames
+
+        def get_object(indirect_reference):
+            if frames:
+                frames[-1].add(indirect_reference if isinstance(indirect_reference, int) else indirect_reference.idnum)
+            return original(indirect_reference)
+
+        self.reader.get_object = get_object
+        try:
+            yield self
+        finally:
+            if shadowed is None:
+                del self.reader.get_object
+            else:
+                self.reader.get_object = shadowed
+
+    @contextmanager
+    def frame(self) -> Iterator[Set[int]]:
+        """Collect the objects resolved in the enclosed block"""
+        objnums: Set[int] = set()
+        self._frames.append(objnums)
+        try:
+            yield objnums
+        finally:
+            self._frames.pop()
+            if self._frames:
+                self._frames[-1].update(objnums)
+
+    def add(self, objnums: Iterable[int]):
+        """Charge objects read earlier (e.g. by a memoized result) to the innermost frame"""
+        if self._frames:
+            self._frames[-1].update(objnums)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Extraction Budget
+Per-extraction caps on wall time, objects visited, decompressed stream bytes and output size
+"""
+
+import base64
+import logging
+import time
+import zlib
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+from ..config.settings import settings
+
+
+# Reasons a budget runs out
+REASON_TIME = "time"
+REASON_OBJECTS = "objects"
+REASON_STREAM_BYTES = "stream_bytes"
+REASON_OUTPUT = "output"
+
+
+
+def _resolve(obj):
+    """Resolve an indirect reference"""
+    return obj.get_object() if isinstance(obj, IndirectObject) else obj
+
+
+# Bounded stage decoders: each takes encoded bytes and a limit (0 for none)
+# and stops soon after producing more than limit bytes, so the caller can
+# tell the stage was cut. A cut input decodes to a prefix of the output.
+
+def _inflate(data: bytes, limit: int) -> bytes:
+    """FlateDecode"""
+    return zlib.decompressobj().decompress(data, limit)
+
+
+def _ascii_hex(data: bytes, limit: int) -> bytes:
+    """ASCIIHexDecode; the output is half the input, so it is only cut"""
+    end = data.find(b">")
+    digits = (data if end < 0 else data[:end]).translate(None, b" \t\r\n\f\0")
+    if limit:
+        digits = digits[:2 * limit]
+    if len(digits) % 2:
+        digits += b"0"
+    return bytes.fromhex(digits.decode("ascii"))
+
+
+def _ascii85(data: bytes, limit: int) -> bytes:
+    """ASCII85Decode; every character yields at least 4/5 of a byte, so the input is cut"""
+    data = data.translate(None, b" \t\r\n\f\0")
+    if data.startswith(b"<~"):
+        data = data[2:]
+    end = data.find(b"~>")
+    if end >= 0:
+        data = data[:end]
+    if limit:
+        data = data[:(limit // 4 + 1) * 5]
+    return base64.a85decode(data)
+
+
+def _run_length(data: bytes, limit: int) -> bytes:
+    """RunLengthDecode"""
+    output = bytearray()
+    position = 0
+    while position < len(data) and data[position] != 128 and not (limit and len(output) >= limit):
+        length = data[position]
+        if length < 128:
+            output += data[position + 1:position + 2 + length]
+            position += length + 2
+        else:
+            output += data[position + 1:position + 2] * (257 - length)
+            position += 2
+    return bytes(output)
+
+
+def _lzw(data: bytes, limit: int) -> bytes:
+    """LZWDecode with the default /EarlyChange 1"""
+    output = bytearray()
+    table = [bytes([code]) for code in range(256)] + [b"", b""]
+    bits = 9
+    previous = None
+    buffer = buffered = 0
+    for byte in data:
+        buffer = (buffer << 8 | byte) & 0xFFFFFF
+        buffered += 8
+        while buffered >= bits:
+            buffered -= bits
+            code = buffer >> buffered & ((1 << bits) - 1)
+            if code == 256:
+                del table[258:]
+                bits = 9
+                previous = None
+                continue
+            if code == 257:
+                return bytes(output)
+            if code < len(table):
+                entry = table[code]
+            elif previous is not None and code == len(table):
+                entry = previous + previous[:1]
+            else:
+                raise ValueError(f"Invalid LZW code {code}")
+            output += entry
+            if previous is not None and len(table) < 4096:
+                table.append(previous + entry[:1])
+            previous = entry
+            if len(table) + 1 >= 1 << bits and bits < 12:
+                bits += 1
+            if limit and len(output) >= limit:
+                return bytes(output)
+    return bytes(output)
+
+
+# Stream filters decoded within the budget (full and abbreviated names);
+# /Crypt is the identity filter, as PyPDF2 has already decrypted the data
+STREAM_DECODERS: Dict[str, Callable[[bytes, int], bytes]] = {
+    "/FlateDecode": _inflate, "/Fl": _inflate,
+    "/ASCIIHexDecode": _ascii_hex, "/AHx": _ascii_hex,
+    "/ASCII85Decode": _ascii85, "/A85": _ascii85,
+    "/RunLengthDecode": _run_length, "/RL": _run_length,
+    "/LZWDecode": _lzw, "/LZW": _lzw,
+    "/Crypt": lambda data, limit: data
+}
+
+
+class DecodedStream(NamedTuple):
+    """Text of a stream, whether it was cut short by the budget, and why decoding failed, if it did"""
+    text: str
+    truncated: bool = False
+    error: Optional[str] = None
+
+
+def _stream_filters(stream: StreamObject) -> List[str]:
+    """Filter names of a stream, in decoding order"""
+    filters = _resolve(stream.get("/Filter"))
+    if filters is None:
+        return []
+    if isinstance(filters, ArrayObject):
+        return [str(_resolve(name)) for name in filters]
+    return [str(filters)]
+
+
+def _has_predictor(stream: StreamObject) -> bool:
+    """Whether decoding needs a PNG/TIFF predictor pass, left to PyPDF2"""
+    params = _resolve(stream.get("/DecodeParms"))
+    params_list = params if isinstance(params, ArrayObject) else [params]
+    for entry in params_list:
+        entry = _resolve(entry)
+        if isinstance(entry, DictionaryObject) and int(_resolve(entry.get("/Predictor", 1))) > 1:
+            return True
+    return False
+
+
+def decode_stream(stream: StreamObject, max_bytes: Optional[int] = None) -> Tuple[bytes, bool]:
+    """
+    Decode a stream to at most max_bytes bytes (None for no limit).
+
+    Each filter of the chain is decoded by a bounded decoder from
+    STREAM_DECODERS that stops past max_bytes, so no stage (e.g. a Flate
+    bomb wrapped in ASCIIHex) is ever fully expanded. A PNG/TIFF predictor
+    is then applied by PyPDF2 only when the whole stream fit, since a partial
+    predicted stream is not text. Nothing is charged or logged.
+
+    Returns:
+        The decoded bytes and whether they were cut short
+
+    Raises:
+        NotImplementedError: For a filter without a bounded decoder (image codecs)
+        Exception: Whatever decoding malformed data raises
+    """
+    filters = _stream_filters(stream)
+    unsupported = [name for name in filters if name not in STREAM_DECODERS]
+    if unsupported:
+        raise NotImplementedError(f"Unsupported stream filter {unsupported[0]}")
+
+    data = getattr(stream, "_data", b"") or b""
+    truncated = False
+    for name in filters:
+        data = STREAM_DECODERS[name](data, max_bytes + 1 if max_bytes is not None else 0)
+        if max_bytes is not None and len(data) > max_bytes:
+            data = data[:max_bytes]
+            truncated = True
+    if _has_predictor(stream):
+        data = b"" if truncated else stream.get_data()
+    return data, truncated
+
+
+def decode_text(data: bytes) -> str:
+    """Decode stream bytes as text: UTF-16 or UTF-8 when marked or valid, otherwise Latin-1"""
+    if data.startswith((b"\xfe\xff", b"\xff\xfe")):
+        return data.decode("utf-16", errors="replace")
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+class ExtractionBudget:
+    """
+    Resource budget shared by every step of one extraction.
+
+    Extraction code charges objects visited (``charge_objects``) and
+    characters produced (``charge_output``) and decodes streams through
+    ``read_stream``, which decodes at most the remaining stream byte budget
+    at every filter stage, so decompression bombs stop early. The wall clock is checked on every
+    charge. Once any limit is hit, ``exhausted`` stays true and ``reason``
+    names the limit; callers stop and return what they have, flagged as
+    truncated. A limit of 0 disables that check.
+    """
+
+    def __init__(
+        self,
+        max_seconds: Optional[float] = None,
+        max_objects: Optional[int] = None,
+        max_stream_bytes: Optional[int] = None,
+        max_output_chars: Optional[int] = None
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.max_seconds = settings.get_extract_max_seconds() if max_seconds is None else max_seconds
+        self.max_objects = settings.get_extract_max_objects() if max_objects is None else max_objects
+        self.max_stream_bytes = settings.get_extract_max_stream_bytes() if max_stream_bytes is None else max_stream_bytes
+        self.max_output_chars = settings.get_extract_max_output_chars() if max_output_chars is None else max_output_chars
+
+        self.started_at = time.monotonic()
+        self.objects = 0
+        self.stream_bytes = 0
+        self.output_chars = 0
+        self.reason: Optional[str] = None
+        self.message: Optional[str] = None
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether any limit has been hit"""
+        return self.reason is not None
+
+    def elapsed_seconds(self) -> float:
+        """Seconds since the extraction started"""
+        return time.monotonic() - self.started_at
+
+    def charge_objects(self, count: int = 1) -> bool:
+        """Charge objects visited; returns False once the budget is exhausted"""
+        self.objects += count
+        if self.max_objects and self.objects > self.max_objects:
+            self._exhaust(REASON_OBJECTS, f"visited more than {self.max_objects} objects")
+        return self.check_time()
+
+    def charge_output(self, chars: int) -> bool:
+        """Charge characters added to the result; returns False once the budget is exhausted"""
+        self.output_chars += chars
+        if self.max_output_chars and self.output_chars > self.max_output_chars:
+            self._exhaust(REASON_OUTPUT, f"produced more than {self.max_output_chars} characters of output")
+        return self.check_time()
+
+    def check_time(self) -> bool:
+        """Check the wall clock; returns False once the budget is exhausted"""
+        if self.max_seconds and not self.exhausted and self.elapsed_seconds() > self.max_seconds:
+            self._exhaust(REASON_TIME, f"ran longer than {self.max_seconds} seconds")
+        return not self.exhausted
+
+    def _exhaust(self, reason: str, message: str):
+        """Record the first limit hit"""
+        if self.reason is None:
+            self.reason = reason
+            self.message = f"Extraction truncated: {message}"
+            self.logger.warning(self.message)
+
+    def read_stream(self, stream: StreamObject) -> DecodedStream:
+        """
+        Decode a text stream (e.g. JavaScript) within the stream byte budget.
+
+        Decoding goes through ``decode_stream``, so every filter stage stops
+        past the remaining budget. A stream cut short is returned with
+        ``truncated`` set (its text may then be empty) and a stream that
+        fails to decode or uses a non-text filter with ``error``, never as
+        plain empty text.
+        """
+        remaining = self.max_stream_bytes - self.stream_bytes if self.max_stream_bytes else None
+        if remaining is not None and remaining <= 0:
+            self._exhaust(REASON_STREAM_BYTES, f"decoded more than {self.max_stream_bytes} stream bytes")
+            return DecodedStream("", truncated=True)
+
+        try:
+            data, truncated = decode_stream(stream, remaining)
+        except NotImplementedError as e:
+            return DecodedStream("", error=str(e))
+        except Exception as e:
+            self.logger.warning(f"Failed to decode stream: {e}")
+            return DecodedStream("", error=f"Failed to decode stream: {e}")
+
+        if truncated:
+            self._exhaust(REASON_STREAM_BYTES, f"decoded more than {self.max_stream_bytes} stream bytes")
+        self.stream_bytes += len(data)
+        self.check_time()
+        return DecodedStream(decode_text(data), truncated=truncated)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Usage, limits and the reason the budget ran out, if it did"""
+        return {
+            "reason": self.reason,
+            "message": self.message,
+            "elapsed_seconds": round(self.elapsed_seconds(), 3),
+            "objects": self.objects,
+            "stream_bytes": self.stream_bytes,
+            "output_chars": self.output_chars,
+            "limits": {
+                "max_seconds": self.max_seconds,
+                "max_objects": self.max_objects,
+                "max_stream_bytes": self.max_stream_bytes,
+                "max_output_chars": self.max_output_chars
+            }
+        }
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Form Field Index
+Name-indexed view of the AcroForm field tree, built once per document
+"""
+
+import bisect
+import json
+import logging
+import re
+import subprocess
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject
+
+
+# Bump whenever the indexed field data changes, so cached indexes are rebuilt
+FIELD_INDEX_VERSION = "1"
+
+# Supported name matching modes (all case-insensitive)
+MATCH_MODES = ("exact", "prefix", "substring", "regex")
+
+# Bounds of client-supplied regular expressions: pattern length, characters of
+# each name searched, matches returned, and wall-clock seconds of the search
+MAX_REGEX_LENGTH = 256
+MAX_REGEX_SUBJECT_CHARS = 512
+MAX_REGEX_MATCHES = 1000
+REGEX_TIMEOUT_SECONDS = 5.0
+
+# Quantifier syntax: *, +, ?, {n}, {n,}, {,m} and {n,m}, optionally lazy or possessive
+_QUANTIFIER = re.compile(r"([*+?]|\{\d*(?:,\d*)?\})[?+]?")
+_BACKREFERENCE = re.compile(r"\\[1-9]|\\g<|\(\?P=|\(\?\(")
+# Extension syntax following an opening parenthesis: (?:, (?P<name>, lookarounds, inline flags, comments
+_GROUP_PREFIX = re.compile(r"\?(?:P?<\w+>|<[=!]|[:=!>]|#[^)]*|[aiLmsux-]*:?)")
+
+# Python's re engine cannot be interrupted, so regex searches run in a
+# short-lived interpreter that is killed when REGEX_TIMEOUT_SECONDS elapse
+_REGEX_WORKER = """
+import json, re, sys
+request = json.load(sys.stdin)
+regex = re.compile(request["pattern"], re.IGNORECASE)
+positions = []
+for position, name in enumerate(request["names"]):
+    if regex.search(name):
+        positions.append(position)
+        if len(positions) == request["limit"]:
+            break
+json.dump(positions, sys.stdout)
+"""
+
+
+def _has_repeated_ambiguous_group(pattern: str) -> bool:
+    """
+    Whether pattern repeats a group that contains a quantifier or an
+    alternation, at any nesting depth, e.g. (a+)+, ((a+))+ or (a|a)+.
+
+    Such groups can match the same text in exponentially many ways, which
+    makes a failing search backtrack through all of them.
+    """
+    # One flag per open group: does it contain a quantifier or alternation?
+    ambiguous = [False]
+    # Whether the atom just closed is an ambiguous group (None: nothing to quantify)
+    last_group: Optional[bool] = None
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        quantifier = _QUANTIFIER.match(pattern, i) if last_group is not None or char != "{" else None
+        if quantifier:
+            body = quantifier.group(1)
+            if last_group and body not in ("?", "{0,1}", "{,1}", "{0}", "{1}"):
+                return True
+            # A fixed count {n} matches one way, anything else varies
+            if not re.fullmatch(r"\{\d+\}", body):
+                ambiguous[-1] = True
+            last_group = None
+            i = quantifier.end()
+            continue
+        if char == "\\":
+            i += 2
+        elif char == "[":
+            # Skip the character class; a leading ] or ^] is literal
+            i += 1
+            if pattern.startswith("^", i):
+                i += 1
+            if pattern.startswith("]", i):
+                i += 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif char == "(":
+            ambiguous.append(False)
+            i += 1
+            prefix = _GROUP_PREFIX.match(pattern, i)
+            if prefix:
+                i = prefix.end()
+            last_group = None
+            continue
+        elif char == ")" and len(ambiguous) > 1:
+            closed = ambiguous.pop()
+            ambiguous[-1] = ambiguous[-1] or closed
+            last_group = closed
+            i += 1
+            continue
+        elif char == "|":
+            ambiguous[-1] = True
+            i += 1
+            last_group = None
+            continue
+        else:
+            i += 1
+        last_group = False
+    return False
+
+
+def _resolve(obj):
+    """Resolve an indirect reference"""
+    return obj.get_object() if isinstance(obj, IndirectObject) else obj
+
+
+def _as_int(obj) -> int:
+    """Convert a PDF number to int, 0 when absent or malformed"""
+    try:
+        return int(_resolve(obj))
+    except (TypeError, ValueError):
+        return 0
+
+
+class FieldRecord:
+    """A form field with its fully-qualified name, parent chain and widgets"""
+
+    __slots__ = ("name", "partial_name", "parents", "objnum", "field_type", "value", "flags", "widget_objnums", "widget_pages")
+
+    def __init__(self, name: str, partial_name: str, parents: List[str], objnum: Optional[int], field_obj: DictionaryObject):
+        self.name = name
+        self.partial_name = partial_name
+        self.parents = parents
+        self.objnum = objnum
+        self.field_type = str(_resolve(field_obj.get("/FT", "Unknown")))
+        self.value = str(_resolve(field_obj.get("/V", "")))
+        self.flags = _as_int(field_obj.get("/Ff", 0))
+        self.widget_objnums: List[Optional[int]] = []
+        self.widget_pages: List[int] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Field information as returned by field lookups"""
+        return {
+            "name": self.name,
+            "type": self.field_type,
+            "value": self.value,
+            "flags": self.flags,
+            "objnum": self.objnum,
+            "partial_name": self.partial_name,
+            "parents": list(self.parents),
+            "widget_objnums": list(self.widget_objnums),
+            "widget_pages": list(self.widget_pages)
+        }
+
+
+class FieldIndex:
+    """
+    Per-document index of form fields by fully-qualified name.
+
+    Built with a single iterative walk of /AcroForm/Fields; lookups by exact
+    name, prefix, substring or regular expression never touch the PDF
+    objects again. Kids without a /T entry are widget annotations of their
+    parent field, not fields of their own.
+    """
+
+    def __init__(self, records: List[FieldRecord]):
+        self.records = records
+        self._lower_names = [record.name.lower() for record in records]
+
+        self._by_name: Dict[str, List[int]] = {}
+        for position, lower_name in enumerate(self._lower_names):
+            self._by_name.setdefault(lower_name, []).append(position)
+
+        # Sorted (name, position) pairs for prefix lookups
+        self._sorted_names = sorted((lower_name, position) for position, lower_name in enumerate(self._lower_names))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def lookup(self, pattern: str, match: str = "substring") -> List[FieldRecord]:
+        """
+        Find fields whose fully-qualified name matches pattern.
+
+        Args:
+            pattern: Name, prefix, substring or regular expression
+            match: One of MATCH_MODES
+
+        Returns:
+            Matching fields in document order
+
+        Raises:
+            ValueError: For an unknown match mode, or a regular expression
+                that is invalid, longer than MAX_REGEX_LENGTH, prone to
+                catastrophic backtracking or slower than REGEX_TIMEOUT_SECONDS
+        """
+        if match == "exact":
+            positions = self._by_name.get(pattern.lower(), [])
+        elif match == "prefix":
+            prefix = pattern.lower()
+            start = bisect.bisect_left(self._sorted_names, (prefix, -1))
+            positions = []
+            for lower_name, position in self._sorted_names[start:]:
+                if not lower_name.startswith(prefix):
+                    break
+                positions.append(position)
+            positions.sort()
+        elif match == "substring":
+            needle = pattern.lower()
+            positions = [position for position, lower_name in enumerate(self._lower_names) if needle in lower_name]
+        elif match == "regex":
+            self._compile_regex(pattern)
+            positions = self._search_regex(pattern)
+        else:
+            raise ValueError(f"Unknown match mode '{match}', expected one of: {', '.join(MATCH_MODES)}")
+
+        return [self.records[position] for position in positions]
+
+    @staticmethod
+    def _compile_regex(pattern: str):
+        """Compile a client-supplied regular expression within the bounds above"""
+        if len(pattern) > MAX_REGEX_LENGTH:
+            raise ValueError(f"Regular expression longer than {MAX_REGEX_LENGTH} characters")
+        if _BACKREFERENCE.search(pattern) or _has_repeated_ambiguous_group(pattern):
+            raise ValueError(
+                f"Regular expression '{pattern}' repeats a group containing a quantifier or alternation, "
+                f"or uses backreferences; use prefix or substring matching instead"
+            )
+        try:
+            return re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression '{pattern}': {e}")
+
+    def _search_regex(self, pattern: str) -> List[int]:
+        """Positions of names matching pattern, searched in a worker killed after REGEX_TIMEOUT_SECONDS"""
+        request = {
+            "pattern": pattern,
+            "names": [record.name[:MAX_REGEX_SUBJECT_CHARS] for record in self.records],
+            "limit": MAX_REGEX_MATCHES
+        }
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-I", "-S", "-c", _REGEX_WORKER],
+                input=json.dumps(request), capture_output=True, text=True,
+                timeout=REGEX_TIMEOUT_SECONDS, check=True
+            )
+        except subprocess.TimeoutExpired:
+            raise ValueError(
+                f"Regular expression '{pattern}' took longer than {REGEX_TIMEOUT_SECONDS} seconds; "
+                f"use prefix or substring matching instead"
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise ValueError(f"Regular expression search failed: {e}")
+        return json.loads(completed.stdout)
+
+    def find(self, field_name: str, match: str = "substring") -> Dict[str, Any]:
+        """Look up one name, in the result format of get_fields_by_name"""
+        found_fields = [record.to_dict() for record in self.lookup(field_name, match)]
+        return {
+            "field_name": field_name,
+            "match": match,
+            "found_fields": found_fields,
+            "total_found": len(found_fields)
+        }
+
+    def find_many(self, field_names: Iterable[str], match: str = "exact") -> Dict[str, Any]:
+        """Look up many names at once, in the result format of get_fields_by_names"""
+        results = {}
+        not_found = []
+        for field_name in field_names:
+            found_fields = [record.to_dict() for record in self.lookup(field_name, match)]
+            results[field_name] = found_fields
+            if not found_fields:
+                not_found.append(field_name)
+
+        return {
+            "match": match,
+            "results": results,
+            "total_found": sum(len(found_fields) for found_fields in results.values()),
+            "not_found": not_found,
+            "total_fields": len(self.records)
+        }
+
+
+class FieldIndexBuilder:
+    """Build a FieldIndex from a reader"""
+
+    # Guard against malformed documents with absurdly deep field trees
+    MAX_DEPTH = 1000
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def build(self, reader: PdfReader) -> FieldIndex:
+        """Walk /AcroForm/Fields once and index every field"""
+        fields = self._get_root_fields(reader)
+        if not fields:
+            return FieldIndex([])
+
+        page_numbers = self._page_numbers_by_objnum(reader)
+        annotation_pages: Optional[Dict[int, int]] = None
+
+        def widget_page(widget: DictionaryObject, objnum: Optional[int]) -> Optional[int]:
+            """Find the page of a widget from its /P entry, else from the page annotation lists"""
+            nonlocal annotation_pages
+            page_ref = widget.get("/P")
+            if isinstance(page_ref, IndirectObject) and page_ref.idnum in page_numbers:
+                return page_numbers[page_ref.idnum]
+            if objnum is None:
+                return None
+            if annotation_pages is None:
+                # Only scanned for documents whose widgets lack /P
+                annotation_pages = self._page_numbers_by_annotation(reader)
+            return annotation_pages.get(objnum)
+
+        records: List[FieldRecord] = []
+        visited = set()
+
+        # Iterative depth-first walk in document order: (node, parent record, depth)
+        stack = [(node, None, 0) for node in reversed(fields)]
+        while stack:
+            node, parent, depth = stack.pop()
+
+            objnum = node.idnum if isinstance(node, IndirectObject) else None
+            if objnum is not None:
+                if objnum in visited:
+                    self.logger.warning(f"Field tree cycle at object {objnum}, skipping")
+                    continue
+                visited.add(objnum)
+
+            field_obj = _resolve(node)
+            if not isinstance(field_obj, DictionaryObject):
+                continue
+
+            if "/T" not in field_obj and parent is not None:
+                # A widget annotation of its parent field
+                parent.widget_objnums.append(objnum)
+                page_num = widget_page(field_obj, objnum)
+                if page_num is not None and page_num not in parent.widget_pages:
+                    parent.widget_pages.append(page_num)
+                continue
+
+            partial_name = str(_resolve(field_obj.get("/T", "")))
+            parents = parent.parents + [parent.name] if parent is not None else []
+            name = f"{parent.name}.{partial_name}" if parent is not None else partial_name
+            record = FieldRecord(name, partial_name, parents, objnum, field_obj)
+            records.append(record)
+
+            if field_obj.get("/Subtype") == "/Widget":
+                # Field and widget merged into one dictionary
+                record.widget_objnums.append(objnum)
+                page_num = widget_page(field_obj, objnum)
+                if page_num is not None:
+                    record.widget_pages.append(page_num)
+
+            kids = _resolve(field_obj.get("/Kids"))
+            if isinstance(kids, (list, ArrayObject)):
+                if depth >= self.MAX_DEPTH:
+                    self.logger.warning(f"Field tree deeper than {self.MAX_DEPTH} levels at '{name}', not descending")
+                    continue
+                stack.extend((kid, record, depth + 1) for kid in reversed(kids))
+
+        return FieldIndex(records)
+
+    def _get_root_fields(self, reader: PdfReader) -> List[Any]:
+        """Get the top-level /AcroForm/Fields array"""
+        root = _resolve(reader.trailer.get("/Root"))
+        if not isinstance(root, DictionaryObject):
+            return []
+
+        acroform = _resolve(root.get("/AcroForm"))
+        if not isinstance(acroform, DictionaryObject):
+            return []
+
+        fields = _resolve(acroform.get("/Fields", []))
+        return list(fields) if isinstance(fields, (list, ArrayObject)) else []
+
+    def _page_numbers_by_objnum(self, reader: PdfReader) -> Dict[int, int]:
+        """Map page object numbers to page indices"""
+        page_numbers = {}
+        for page_num, page in enumerate(reader.pages):
+            reference = getattr(page, "indirect_reference", None)
+            if reference is not None:
+                page_numbers[reference.idnum] = page_num
+        return page_numbers
+
+    def _page_numbers_by_annotation(self, reader: PdfReader) -> Dict[int, int]:
+        """Map annotation object numbers to the index of the page listing them"""
+        annotation_pages = {}
+        for page_num, page in enumerate(reader.pages):
+            annots = _resolve(page.get("/Annots"))
+            if not isinstance(annots, (list, ArrayObject)):
+                continue
+            for annot in annots:
+                if isinstance(annot, IndirectObject):
+                    annotation_pages.setdefault(annot.idnum, page_num)
+        return annotation_pages
+
+
+# Global field index builder instance
+field_index_builder = FieldIndexBuilder()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Name and Number Tree Walker
+Iterative, bounded traversal of PDF name trees (/Names) and number trees (/Nums)
+"""
+
+import logging
+from typing import Any, List, Optional, Set, Tuple
+
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject
+
+from ..config.settings import settings
+from .extraction_budget import ExtractionBudget
+
+
+# Leaf array key of each tree kind
+NAME_TREE = "/Names"
+NUMBER_TREE = "/Nums"
+
+
+def _resolve(obj):
+    """Resolve an indirect reference"""
+    return obj.get_object() if isinstance(obj, IndirectObject) else obj
+
+
+def _tree_key(key, kind: str):
+    """Normalize a tree key for comparison: str for name trees, int for number trees"""
+    key = _resolve(key)
+    if kind == NUMBER_TREE:
+        return int(key)
+    return key.decode("latin-1") if isinstance(key, bytes) else str(key)
+
+
+class TreeWalk:
+    """
+    Iterate the (key, value) leaves of a name or number tree in order.
+
+    /Kids are followed with an explicit stack, never recursion. Nodes deeper
+    than max_depth and nodes already visited (cycles) are skipped, and
+    iteration stops after max_entries leaves or max_nodes visited nodes,
+    intermediate /Kids nodes included. With a budget, every visited node is
+    charged to it and the walk stops once it runs out. After iterating,
+    ``truncated``, ``depth_exceeded`` and ``cycles`` tell whether the tree
+    was cut short.
+    Values are returned unresolved, so callers still see object numbers.
+    """
+
+    def __init__(
+        self,
+        root,
+        kind: str = NAME_TREE,
+        max_depth: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        budget: Optional[ExtractionBudget] = None
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        self.kind = kind
+        self.max_depth = settings.get_name_tree_max_depth() if max_depth is None else max_depth
+        self.max_entries = settings.get_name_tree_max_entries() if max_entries is None else max_entries
+        self.max_nodes = settings.get_name_tree_max_nodes() if max_nodes is None else max_nodes
+        self.budget = budget
+
+        self.entries = 0
+        self.nodes = 0
+        self.truncated = False
+        self.node_limit_reached = False
+        self.budget_exhausted = False
+        self.depth_exceeded = False
+        self.cycles: List[int] = []
+
+    def __iter__(self):
+        visited: Set[int] = set()
+        stack: List[Tuple[Any, int]] = [(self.root, 0)]
+
+        while stack:
+            node_ref, depth = stack.pop()
+            if isinstance(node_ref, IndirectObject):
+                if node_ref.idnum in visited:
+                    self.cycles.append(node_ref.idnum)
+                    continue
+                visited.add(node_ref.idnum)
+
+            if self.nodes >= self.max_nodes:
+                self.truncated = True
+                self.node_limit_reached = True
+                self.logger.warning(f"Tree has more than {self.max_nodes} nodes, stopping")
+                return
+            self.nodes += 1
+            if self.budget is not None and not self.budget.charge_objects():
+                self.truncated = True
+                self.budget_exhausted = True
+                return
+
+            node = _resolve(node_ref)
+            if not isinstance(node, DictionaryObject):
+                continue
+
+            leaves = _resolve(node.get(self.kind))
+            if isinstance(leaves, ArrayObject):
+                for index in range(0, len(leaves) - 1, 2):
+                    if self.entries >= self.max_entries:
+                        self.truncated = True
+                        self.logger.warning(f"Tree has more than {self.max_entries} entries, stopping")
+                        return
+                    self.entries += 1
+                    yield leaves[index], leaves[index + 1]
+
+            kids = _resolve(node.get("/Kids"))
+            if isinstance(kids, ArrayObject):
+                if depth >= self.max_depth:
+                    self.depth_exceeded = True
+                    self.logger.warning(f"Tree deeper than {self.max_depth} levels, skipping subtree")
+                    continue
+                stack.extend((kid, depth + 1) for kid in reversed(kids))
+
+    def warnings(self) -> List[str]:
+        """Describe how the walk was cut short, if at all"""
+        warnings = []
+        if self.budget_exhausted:
+            warnings.append("stopped when the extraction budget ran out")
+        elif self.node_limit_reached:
+            warnings.append(f"stopped after visiting {self.max_nodes} nodes")
+        elif self.truncated:
+            warnings.append(f"stopped after {self.max_entries} entries")
+        if self.depth_exceeded:
+            warnings.append(f"skipped subtrees deeper than {self.max_depth} levels")
+        if self.cycles:
+            warnings.append(f"skipped cyclic /Kids references to objects {self.cycles}")
+        return warnings
+
+
+def lookup(
+    root, key, kind: str = NAME_TREE, max_depth: Optional[int] = None, max_nodes: Optional[int] = None
+) -> Optional[Any]:
+    """
+    Look up one key in a name or number tree, following /Limits.
+
+    Only the kids whose /Limits range contains the key are descended into,
+    so a lookup touches one path instead of the whole tree; at most
+    max_nodes nodes, kids whose /Limits are checked included, are read.
+
+    Returns:
+        The unresolved value, or None if the key is absent or not reached
+    """
+    max_depth = settings.get_name_tree_max_depth() if max_depth is None else max_depth
+    nodes_left = settings.get_name_tree_max_nodes() if max_nodes is None else max_nodes
+    wanted = _tree_key(key, kind)
+    visited: Set[int] = set()
+    node_ref = root
+
+    for _ in range(max_depth + 1):
+        if isinstance(node_ref, IndirectObject):
+            if node_ref.idnum in visited:
+                return None
+            visited.add(node_ref.idnum)
+
+        node = _resolve(node_ref)
+        if not isinstance(node, DictionaryObject):
+            return None
+
+        leaves = _resolve(node.get(kind))
+        if isinstance(leaves, ArrayObject):
+            for index in range(0, len(leaves) - 1, 2):
+                try:
+                    if _tree_key(leaves[index], kind) == wanted:
+                        return leaves[index + 1]
+                except (TypeError, ValueError):
+                    continue
+            return None
+
+        kids = _resolve(node.get("/Kids"))
+        if not isinstance(kids, ArrayObject):
+            return None
+
+        node_ref = None
+        for kid in kids:
+            nodes_left -= 1
+            if nodes_left < 0:
+                return None
+            kid_node = _resolve(kid)
+            limits = _resolve(kid_node.get("/Limits")) if isinstance(kid_node, DictionaryObject) else None
+            if not isinstance(limits, ArrayObject) or len(limits) < 2:
+                continue
+            try:
+                if _tree_key(limits[0], kind) <= wanted <= _tree_key(limits[1], kind):
+                    node_ref = kid
+                    break
+            except (TypeError, ValueError):
+                continue
+
+        if node_ref is None:
+            return None
+
+    return None
+
+
+def get_names_tree(catalog, tree_name: str):
+    """Get a tree from the catalog /Names dictionary (e.g. /JavaScript, /EmbeddedFiles)"""
+    names = _resolve(catalog.get("/Names")) if isinstance(catalog, DictionaryObject) else None
+    if not isinstance(names, DictionaryObject):
+        return None
+    return names.get(tree_name)
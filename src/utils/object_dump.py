@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Object Dump
+Bounded recursive rendering of PDF objects as JSON-compatible data
+"""
+
+import logging
+from typing import Any, Dict, Optional, Set
+
+from PyPDF2.generic import (
+    ArrayObject,
+    BooleanObject,
+    ByteStringObject,
+    DictionaryObject,
+    FloatObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    NumberObject,
+    StreamObject,
+)
+
+from .extraction_budget import decode_stream, decode_text
+
+
+# Defaults when no limits are configured
+DEFAULT_MAX_DEPTH = 3
+DEFAULT_MAX_NODES = 200
+
+# Longest string rendered in full
+MAX_STRING_CHARS = 4096
+
+# Keys added next to the entries of a dictionary (PDF keys start with "/"): the
+# decoded preview of a stream, and the marker for entries left out for size
+STREAM_PREVIEW_KEY = "stream_preview"
+OMITTED_ENTRIES_KEY = "omitted_entries"
+
+# Why a value was not expanded
+OMITTED_DEPTH = "depth"
+OMITTED_CYCLE = "cycle"
+OMITTED_REPEATED = "repeated"
+OMITTED_MAX_NODES = "max_nodes"
+
+
+class ObjectDumper:
+    """
+    Render an object and what it contains, within fixed limits.
+
+    Dictionaries and arrays nested more than ``max_depth`` levels below the
+    dumped object, are replaced by a marker giving their type and the reason
+    they were left out. Once ``max_nodes`` values are rendered, the remaining
+    items of each container are replaced by one marker with their count, so
+    output size and latency stay predictable. Indirect references
+    render as ``{"ref": n, "value": ...}``; each object is expanded once,
+    and references back to an object being expanded or already shown are
+    marked instead of followed. With ``follow_references`` off, references
+    are left as ``{"ref": n}``. Streams get a decoded preview of at most
+    ``stream_preview_bytes`` bytes when that is set.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        stream_preview_bytes: int = 0,
+        follow_references: bool = True
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.stream_preview_bytes = stream_preview_bytes
+        self.follow_references = follow_references
+        self.nodes = 0
+        self.truncated = False
+        self._expanded: Set[int] = set()
+        self._path: Set[int] = set()
+
+    def dump(self, obj, object_number: Optional[int] = None) -> Any:
+        """Render an object, given by number when it is an indirect object"""
+        if object_number is not None:
+            self._expanded.add(object_number)
+            self._path.add(object_number)
+        return self._render(obj, 0)
+
+    def _render(self, value, depth: int) -> Any:
+        """Render any value found at the given nesting depth"""
+        if self.nodes >= self.max_nodes:
+            self.truncated = True
+            return {"omitted": OMITTED_MAX_NODES}
+        self.nodes += 1
+
+        if isinstance(value, IndirectObject):
+            return self._render_reference(value, depth)
+        if isinstance(value, (DictionaryObject, ArrayObject)):
+            if depth > self.max_depth:
+                return {"type": type(value).__name__, "size": len(value), "omitted": OMITTED_DEPTH}
+            if isinstance(value, ArrayObject):
+                items = []
+                for index, item in enumerate(value):
+                    if self.nodes >= self.max_nodes:
+                        items.append(self._omitted_nodes(len(value) - index))
+                        break
+                    items.append(self._render(item, depth + 1))
+                return items
+
+            rendered = {}
+            for index, (key, item) in enumerate(value.items()):
+                if self.nodes >= self.max_nodes:
+                    rendered[OMITTED_ENTRIES_KEY] = self._omitted_nodes(len(value) - index)
+                    break
+                rendered[str(key)] = self._render(item, depth + 1)
+            if isinstance(value, StreamObject) and self.stream_preview_bytes > 0:
+                rendered[STREAM_PREVIEW_KEY] = self._preview_stream(value)
+            return rendered
+        return self._render_scalar(value)
+
+    def _omitted_nodes(self, count: int) -> Dict[str, Any]:
+        """Marker for the count remaining items of a container, once max_nodes is reached"""
+        self.truncated = True
+        return {"omitted": OMITTED_MAX_NODES, "count": count}
+
+    def _render_reference(self, reference: IndirectObject, depth: int) -> Dict[str, Any]:
+        """Render an indirect reference, expanding its object at most once"""
+        objnum = reference.idnum
+        if not self.follow_references:
+            return {"ref": objnum}
+        if objnum in self._path:
+            return {"ref": objnum, "omitted": OMITTED_CYCLE}
+        if objnum in self._expanded:
+            return {"ref": objnum, "omitted": OMITTED_REPEATED}
+        if depth > self.max_depth:
+            return {"ref": objnum, "omitted": OMITTED_DEPTH}
+
+        try:
+            target = reference.get_object()
+        except Exception as e:
+            return {"ref": objnum, "error": str(e)}
+
+        self._expanded.add(objnum)
+        self._path.add(objnum)
+        try:
+            return {"ref": objnum, "value": self._render(target, depth)}
+        finally:
+            self._path.discard(objnum)
+
+    def _render_scalar(self, value) -> Any:
+        """Render a name, string, number, boolean or null"""
+        if value is None or isinstance(value, NullObject):
+            return None
+        if isinstance(value, BooleanObject):
+            return bool(value.value)
+        if isinstance(value, FloatObject):
+            return float(value)
+        if isinstance(value, NumberObject):
+            return int(value)
+        if isinstance(value, ByteStringObject):
+            text = f"<{bytes(value).hex()}>"
+        else:
+            text = str(value)
+
+        if len(text) > MAX_STRING_CHARS and not isinstance(value, NameObject):
+            self.truncated = True
+            return text[:MAX_STRING_CHARS]
+        return text
+
+    def _preview_stream(self, stream: StreamObject) -> Dict[str, Any]:
+        """Decode the start of a stream, never decoding more than the preview size at any filter stage"""
+        try:
+            data, truncated = decode_stream(stream, self.stream_preview_bytes)
+        except Exception as e:
+            return {"text": "", "truncated": False, "error": f"Failed to decode stream: {e}"}
+        return {"text": decode_text(data), "truncated": truncated}
+
+    def get_status(self) -> Dict[str, Any]:
+        """Nodes rendered, the limits applied and whether anything was left out for size"""
+        return {
+            "nodes": self.nodes,
+            "max_depth": self.max_depth,
+            "max_nodes": self.max_nodes,
+            "stream_preview_bytes": self.stream_preview_bytes,
+            "truncated": self.truncated
+        }
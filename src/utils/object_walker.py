@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+PDF Object Graph Walker
+Single-pass traversal of catalog, page, annotation and field nodes
+"""
+
+import logging
+from typing import Any, Iterator, List, Optional, Tuple
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import ArrayObject, IndirectObject
+
+from .extraction_budget import ExtractionBudget
+
+
+# Node kinds emitted by the walker
+NODE_CATALOG = "catalog"
+NODE_PAGE = "page"
+NODE_ANNOTATION = "annotation"
+NODE_FIELD = "field"
+NODE_ERROR = "error"
+
+
+class NodeCollector:
+    """
+    Base class for collectors fed by DocumentWalker.
+
+    Subclasses declare the node kinds they consume in ``node_kinds`` and
+    override the matching ``visit_*`` methods. A collector that raises is
+    disabled for the rest of the walk, so it keeps whatever it collected
+    before the failure. Non-fatal problems (e.g. truncated input) are
+    appended to ``warnings``.
+    """
+
+    node_kinds: Tuple[str, ...] = ()
+    error_message = "Collector failed"
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.result: Any = {}
+        self.warnings: List[str] = []
+        self.failed = False
+
+    def visit_catalog(self, catalog):
+        """Handle the document catalog"""
+
+    def visit_page(self, page_num: int, page):
+        """Handle a page object"""
+
+    def visit_annotation(self, page_num: int, annot_num: int, annot_obj, annot_objnum: Optional[int]):
+        """Handle an annotation object"""
+
+    def visit_field(self, field_num: int, field_obj, field_objnum: Optional[int]):
+        """Handle a top-level AcroForm field object"""
+
+    def fail(self, error: Exception):
+        """Stop feeding this collector after an error"""
+        self.failed = True
+        self.logger.error(f"{self.error_message}: {error}")
+
+
+class DocumentWalker:
+    """
+    Single-pass PDF object graph walker.
+
+    Resolves the catalog, every page, every page annotation and every
+    top-level AcroForm field exactly once and emits them as
+    ``(kind, payload)`` nodes in document order. ``iter_nodes`` can be
+    consumed lazily; ``walk`` dispatches the same nodes to collectors.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def iter_nodes(self, reader: PdfReader) -> Iterator[Tuple[str, tuple]]:
+        """
+        Iterate document nodes.
+
+        Yields:
+            (NODE_CATALOG, (catalog,))
+            (NODE_PAGE, (page_num, page))
+            (NODE_ANNOTATION, (page_num, annot_num, annot_obj, annot_objnum))
+            (NODE_FIELD, (field_num, field_obj, field_objnum))
+            (NODE_ERROR, (failed_kind, exception)) when a node stream cannot continue
+        """
+        # Catalog
+        catalog = None
+        try:
+            catalog = reader.trailer.get("/Root")
+            if isinstance(catalog, IndirectObject):
+                catalog = catalog.get_object()
+        except Exception as e:
+            catalog = None
+            yield NODE_ERROR, (NODE_CATALOG, e)
+            yield NODE_ERROR, (NODE_FIELD, e)
+
+        if catalog:
+            yield NODE_CATALOG, (catalog,)
+
+        # Pages and their annotations
+        yield from self._iter_page_nodes(reader)
+
+        # Top-level form fields
+        if catalog:
+            yield from self._iter_field_nodes(catalog)
+
+    def walk(
+        self, reader: PdfReader, collectors: List[NodeCollector], budget: Optional[ExtractionBudget] = None
+    ) -> List[NodeCollector]:
+        """Run all collectors over a single traversal of the document, stopping when the budget runs out"""
+        handler_names = {
+            NODE_CATALOG: "visit_catalog",
+            NODE_PAGE: "visit_page",
+            NODE_ANNOTATION: "visit_annotation",
+            NODE_FIELD: "visit_field",
+        }
+
+        # Bind handlers once instead of looking them up for every node
+        dispatch = {
+            kind: [
+                (collector, getattr(collector, method_name))
+                for collector in collectors
+                if kind in collector.node_kinds
+            ]
+            for kind, method_name in handler_names.items()
+        }
+
+        for kind, payload in self.iter_nodes(reader):
+            if budget is not None and not budget.charge_objects():
+                break
+            
+            if kind == NODE_ERROR:
+                failed_kind, error = payload
+                for collector, _ in dispatch.get(failed_kind, []):
+                    if not collector.failed:
+                        collector.fail(error)
+                continue
+
+            for collector, handler in dispatch[kind]:
+                if collector.failed:
+                    continue
+                try:
+                    handler(*payload)
+                except Exception as e:
+                    collector.fail(e)
+
+        return collectors
+
+    def _iter_page_nodes(self, reader: PdfReader) -> Iterator[Tuple[str, tuple]]:
+        """Iterate pages, each followed by its annotations"""
+        annotations_failed = False
+
+        try:
+            for page_num, page in enumerate(reader.pages):
+                yield NODE_PAGE, (page_num, page)
+
+                if annotations_failed:
+                    continue
+
+                try:
+                    yield from self._iter_annotation_nodes(page_num, page)
+                except Exception as e:
+                    annotations_failed = True
+                    yield NODE_ERROR, (NODE_ANNOTATION, e)
+        except Exception as e:
+            yield NODE_ERROR, (NODE_PAGE, e)
+            if not annotations_failed:
+                yield NODE_ERROR, (NODE_ANNOTATION, e)
+
+    def _iter_annotation_nodes(self, page_num: int, page) -> Iterator[Tuple[str, tuple]]:
+        """Iterate annotations of a single page"""
+        annotations = page.get("/Annots", [])
+
+        # Handle case where annotations might be an IndirectObject
+        if isinstance(annotations, IndirectObject):
+            annotations = annotations.get_object()
+
+        # Ensure annotations is a list/array
+        if not isinstance(annotations, (list, ArrayObject)):
+            return
+
+        for annot_num, annot in enumerate(annotations):
+            if isinstance(annot, IndirectObject):
+                annot_obj = annot.get_object()
+                annot_objnum = annot.idnum
+            else:
+                annot_obj = annot
+                annot_objnum = None
+
+            yield NODE_ANNOTATION, (page_num, annot_num, annot_obj, annot_objnum)
+
+    def _iter_field_nodes(self, catalog) -> Iterator[Tuple[str, tuple]]:
+        """Iterate top-level AcroForm fields"""
+        try:
+            acroform = catalog.get("/AcroForm")
+            if not acroform:
+                return
+
+            if isinstance(acroform, IndirectObject):
+                acroform = acroform.get_object()
+
+            fields = acroform.get("/Fields", [])
+
+            # Handle case where fields might be an IndirectObject
+            if isinstance(fields, IndirectObject):
+                fields = fields.get_object()
+
+            # Ensure fields is a list/array
+            if not isinstance(fields, (list, ArrayObject)):
+                return
+
+            for field_num, field in enumerate(fields):
+                if isinstance(field, IndirectObject):
+                    field_obj = field.get_object()
+                    field_objnum = field.idnum
+                else:
+                    field_obj = field
+                    field_objnum = None
+
+                yield NODE_FIELD, (field_num, field_obj, field_objnum)
+        except Exception as e:
+            yield NODE_ERROR, (NODE_FIELD, e)
+
+
+# Global document walker instance
+document_walker = DocumentWalker()
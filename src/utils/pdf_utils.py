@@ -5,6 +5,7 @@ PDF Processing Utility Functions
 
 import json
 import logging
+from collections import deque
 from typing import Dict, Any, List, Optional
 
 from PyPDF2 import PdfReader
@@ -13,9 +14,13 @@ from PyPDF2.generic import (
     DictionaryObject,
     IndirectObject,
     NameObject,
+    NullObject,
     TextStringObject,
 )
 
+from .field_index import field_index_builder
+from .object_dump import ObjectDumper, DEFAULT_MAX_DEPTH, DEFAULT_MAX_NODES
+
 
 class PDFUtils:
     """PDF Processing Utility Class"""
@@ -41,13 +46,17 @@ class PDFUtils:
                 return None
         return obj
     
+    def get_display_filename(self, file_path: str) -> str:
+        """Get file name component of a path"""
+        return file_path.split("/")[-1] if "/" in file_path else file_path.split("\\")[-1]
+    
     def get_document_basic_info(self, reader: PdfReader, file_path: str) -> Dict[str, Any]:
         """Get document basic information"""
         try:
             metadata = reader.metadata or {}
             
             return {
-                "filename": file_path.split("/")[-1] if "/" in file_path else file_path.split("\\")[-1],
+                "filename": self.get_display_filename(file_path),
                 "pages": len(reader.pages),
                 "encrypted": reader.is_encrypted,
                 "pdf_version": getattr(reader, 'pdf_header', 'Unknown'),
@@ -128,72 +137,30 @@ class PDFUtils:
             self.logger.error(f"Failed to parse Trailer object: {e}")
             return {"error": str(e)}
     
-    def find_form_fields_by_name(self, reader: PdfReader, field_name: str) -> Dict[str, Any]:
-        """Find form fields by name"""
+    def find_form_fields_by_name(self, reader: PdfReader, field_name: str, match: str = "substring") -> Dict[str, Any]:
+        """Find form fields by name (builds a one-off field index; see FieldIndex for repeated lookups)"""
         try:
-            result = {
-                "field_name": field_name,
-                "found_fields": [],
-                "total_found": 0
-            }
-            
-            # Check if there are forms
-            root_obj = self.dereference_object(reader.trailer.get("/Root", {}))
-            
-            if not isinstance(root_obj, DictionaryObject) or "/AcroForm" not in root_obj:
-                return result
-            
-            # Recursively search fields
-            def search_fields(fields, parent_name=""):
-                if not fields:
-                    return
-                
-                for field in fields:
-                    field = self.dereference_object(field)
-                    
-                    if not isinstance(field, DictionaryObject):
-                        continue
-                    
-                    # Get field name
-                    current_name = self.dereference_object(field.get("/T", ""))
-                    if current_name is None:
-                        current_name = ""
-                    else:
-                        current_name = str(current_name)
-                    
-                    full_name = f"{parent_name}.{current_name}" if parent_name else current_name
-                    
-                    # Check if it matches - ensure full_name is a string
-                    full_name_str = str(full_name) if not isinstance(full_name, str) else full_name
-                    if field_name.lower() in full_name_str.lower():
-                        field_info = {
-                            "name": full_name_str,
-                            "type": str(field.get("/FT", "Unknown")),
-                            "value": str(field.get("/V", "")),
-                            "flags": field.get("/Ff", 0)
-                        }
-                        result["found_fields"].append(field_info)
-                    
-                    # Recursively search child fields
-                    kids = field.get("/Kids")
-                    if kids:
-                        search_fields(kids, full_name_str)
-            
-            # Start searching
-            acro_form = self.dereference_object(reader.trailer["/Root"].get("/AcroForm"))
-            if acro_form:
-                fields = acro_form.get("/Fields", [])
-                search_fields(fields)
-            
-            result["total_found"] = len(result["found_fields"])
-            return result
+            return field_index_builder.build(reader).find(field_name, match)
             
         except Exception as e:
             self.logger.error(f"Failed to find form fields: {e}")
             return {"error": str(e)}
     
-    def get_pdf_object_info(self, reader: PdfReader, object_number: int) -> Dict[str, Any]:
-        """Get PDF object information"""
+    def get_pdf_object_info(
+        self,
+        reader: PdfReader,
+        object_number: int,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        stream_preview_bytes: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Get PDF object information.
+        
+        The content is rendered recursively, following indirect references,
+        down to max_depth levels and up to max_nodes values; streams get a
+        decoded preview of up to stream_preview_bytes bytes when set.
+        """
         try:
             result = {
                 "object_number": object_number,
@@ -205,27 +172,8 @@ class PDFUtils:
             try:
                 obj = reader.get_object(object_number)
                 result["found"] = True
-                result["object_info"] = {
-                    "type": type(obj).__name__,
-                    "keys": list(obj.keys()) if hasattr(obj, 'keys') else [],
-                    "size": len(obj) if hasattr(obj, '__len__') else "Unknown"
-                }
-                
-                # If it's a dictionary object, try to get some safe key-values
-                if isinstance(obj, DictionaryObject):
-                    safe_content = {}
-                    for key, value in obj.items():
-                        try:
-                            if isinstance(value, (str, int, float, bool)):
-                                safe_content[str(key)] = value
-                            elif isinstance(value, NameObject):
-                                safe_content[str(key)] = str(value)
-                            else:
-                                safe_content[str(key)] = type(value).__name__
-                        except:
-                            safe_content[str(key)] = "UnparsableValue"
-                    
-                    result["object_info"]["content_sample"] = safe_content
+                dumper = ObjectDumper(max_depth, max_nodes, stream_preview_bytes)
+                result["object_info"] = self._describe_object(obj, dumper, object_number)
                 
             except Exception as e:
                 result["found"] = False
@@ -237,6 +185,96 @@ class PDFUtils:
             self.logger.error(f"Failed to get PDF object information: {e}")
             return {"error": str(e)}
     
+    def get_pdf_objects_info(
+        self,
+        reader: PdfReader,
+        object_numbers: List[int],
+        depth: int = 0,
+        max_objects: int = 500,
+        max_dump_depth: int = DEFAULT_MAX_DEPTH,
+        max_dump_nodes: int = DEFAULT_MAX_NODES
+    ) -> Dict[str, Any]:
+        """
+        Get information of many objects at once, following references up to depth levels.
+        
+        Objects are visited breadth first and each is resolved and described
+        once, however many requested objects reach it; every object lists
+        the objects it refers to by number, so shared subtrees appear a
+        single time. At most max_objects objects are visited. Contents are
+        rendered as in get_pdf_object_info, with references left unexpanded.
+        """
+        requested = list(dict.fromkeys(object_numbers))
+        objects: Dict[str, Any] = {}
+        not_found = []
+        queue = deque((object_number, 0) for object_number in requested)
+        seen = set(requested)
+        
+        while queue and len(objects) + len(not_found) < max_objects:
+            object_number, level = queue.popleft()
+            try:
+                obj = reader.get_object(object_number)
+            except Exception as e:
+                self.logger.debug(f"Object {object_number} cannot be accessed: {e}")
+                obj = None
+            if obj is None or isinstance(obj, NullObject):
+                not_found.append(object_number)
+                continue
+            
+            dumper = ObjectDumper(max_dump_depth, max_dump_nodes, follow_references=False)
+            info = self._describe_object(obj, dumper, object_number)
+            references = self._collect_references(obj)
+            info["references"] = references
+            objects[str(object_number)] = info
+            
+            if level < depth:
+                for reference in references:
+                    if reference not in seen:
+                        seen.add(reference)
+                        queue.append((reference, level + 1))
+        
+        result = {
+            "requested": requested,
+            "depth": depth,
+            "objects": objects,
+            "not_found": not_found,
+            "total_objects": len(objects)
+        }
+        if queue:
+            result["limit_reached"] = True
+            result["unvisited"] = [object_number for object_number, _ in queue]
+        return result
+    
+    def _describe_object(self, obj, dumper: ObjectDumper, object_number: int) -> Dict[str, Any]:
+        """Type, keys, size and bounded recursive content of an object"""
+        object_info = {
+            "type": type(obj).__name__,
+            "keys": list(obj.keys()) if hasattr(obj, 'keys') else [],
+            "size": len(obj) if hasattr(obj, '__len__') else "Unknown"
+        }
+        
+        try:
+            object_info["content_sample"] = dumper.dump(obj, object_number)
+        except Exception as e:
+            self.logger.warning(f"Failed to render object {object_number}: {e}")
+            object_info["content_sample"] = "UnparsableValue"
+        object_info["content_sample_limits"] = dumper.get_status()
+        
+        return object_info
+    
+    def _collect_references(self, obj) -> List[int]:
+        """Numbers of the objects an object refers to directly, in order of appearance"""
+        references = {}
+        stack = [obj]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, IndirectObject):
+                references[value.idnum] = None
+            elif isinstance(value, DictionaryObject):
+                stack.extend(reversed(list(value.values())))
+            elif isinstance(value, ArrayObject):
+                stack.extend(reversed(value))
+        return list(references)
+    
     def parse_page_spans(self, page_spans: str, total_pages: int) -> List[int]:
         """Parse page range string"""
         try:
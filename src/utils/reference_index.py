@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Reverse Reference Index
+Map every PDF object to the objects referring to it and the pages owning it
+"""
+
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import DictionaryObject, IndirectObject
+
+
+# Bump whenever the indexed reference data changes, so cached indexes are rebuilt
+REFERENCE_INDEX_VERSION = "2"
+
+# Keys pointing back up the object graph; following them from a page would
+# reach the page tree (and so every other page) or the owning page itself
+BACK_REFERENCE_KEYS = ("/Parent", "/P")
+
+
+def _iter_references(obj, path: str = "") -> Iterator[Tuple[int, str]]:
+    """Iterate (object number, key path) of every indirect reference held directly by obj"""
+    stack = [(obj, path)]
+    while stack:
+        value, value_path = stack.pop()
+        if isinstance(value, IndirectObject):
+            yield value.idnum, value_path
+        elif isinstance(value, dict):
+            # Stream objects are dictionaries too; their data holds no references
+            for key, item in value.items():
+                stack.append((item, f"{value_path}{key}"))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                stack.append((item, f"{value_path}[{index}]"))
+
+
+class ReferenceIndex:
+    """
+    Per-document reverse reference index.
+
+    Answers "who refers to object N" and "which pages own object N" with
+    dictionary lookups. An object is owned by a page when it is reachable
+    from the page without passing through another page or following a
+    back-reference (/Parent, /P); non-terminal form fields are owned by the
+    pages of their widgets. Objects owned by the same pages share one tuple.
+    """
+
+    def __init__(
+        self,
+        referrers: Dict[int, List[Tuple[Optional[int], str]]],
+        owning_pages: Dict[int, Tuple[int, ...]],
+        page_numbers: Dict[int, int],
+        object_count: int
+    ):
+        self.referrers = referrers
+        self.owning_pages = owning_pages
+        self.page_numbers = page_numbers
+        self.object_count = object_count
+
+    def locate(self, objnum: int) -> Dict[str, Any]:
+        """Describe where an object lives: owning pages and referrers"""
+        referrers = self.referrers.get(objnum, [])
+        return {
+            "object_number": objnum,
+            "is_page": objnum in self.page_numbers,
+            "found_pages": list(self.owning_pages.get(objnum, [])),
+            "referrers": [{"objnum": referrer, "key": key} for referrer, key in referrers]
+        }
+
+
+class ReferenceIndexBuilder:
+    """Build a ReferenceIndex from a reader"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def build(self, reader: PdfReader) -> ReferenceIndex:
+        """Scan every object once, then assign owning pages"""
+        forward: Dict[int, List[Tuple[int, str]]] = {}
+        referrers: Dict[int, List[Tuple[Optional[int], str]]] = {}
+
+        # Forward and reverse edges of every object in the cross-reference tables
+        for objnum, generation in self._iter_object_ids(reader):
+            try:
+                obj = IndirectObject(objnum, generation, reader).get_object()
+            except Exception as e:
+                self.logger.debug(f"Skipping unreadable object {objnum}: {e}")
+                continue
+
+            edges = list(_iter_references(obj))
+            forward[objnum] = edges
+            for target, key in edges:
+                referrers.setdefault(target, []).append((objnum, key))
+
+        # The trailer is not an object, but its references (/Root, /Info, ...) are useful
+        for target, key in _iter_references(reader.trailer, "trailer"):
+            referrers.setdefault(target, []).append((None, key))
+
+        page_numbers = {}
+        for page_num, page in enumerate(reader.pages):
+            reference = getattr(page, "indirect_reference", None)
+            if reference is not None:
+                page_numbers.setdefault(reference.idnum, page_num)
+
+        owning_pages = self._assign_pages(forward, page_numbers)
+        self._assign_field_pages(reader, forward, owning_pages)
+
+        return ReferenceIndex(referrers, owning_pages, page_numbers, len(forward))
+
+    def _iter_object_ids(self, reader: PdfReader) -> Iterator[Tuple[int, int]]:
+        """Iterate (object number, generation) of every object in the cross-reference tables"""
+        seen: Set[int] = set()
+        for generation, entries in reader.xref.items():
+            for objnum in entries:
+                if objnum not in seen:
+                    seen.add(objnum)
+                    yield objnum, generation
+        for objnum in reader.xref_objStm:
+            if objnum not in seen:
+                seen.add(objnum)
+                yield objnum, 0
+
+    def _assign_pages(
+        self, forward: Dict[int, List[Tuple[int, str]]], page_numbers: Dict[int, int]
+    ) -> Dict[int, Tuple[int, ...]]:
+        """
+        One walk from all pages, stopping at other pages and back-references.
+
+        Objects reachable from the pages are grouped into strongly connected
+        components, whose owning pages are then the union of those of the
+        components referring to them, propagated once in topological order.
+        Equal page sets are interned, so an object shared by many pages and
+        everything below it hold a single tuple, and the work follows the
+        size of the graph instead of pages times the shared part of it.
+        """
+        children: Dict[int, List[int]] = {}
+
+        def edges(objnum: int) -> List[int]:
+            if objnum not in children:
+                children[objnum] = list(dict.fromkeys(
+                    target for target, key in forward.get(objnum, [])
+                    if target not in page_numbers and not key.endswith(BACK_REFERENCE_KEYS)
+                ))
+            return children[objnum]
+
+        # Iterative Tarjan; components come out sinks first
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack: Set[int] = set()
+        components: List[List[int]] = []
+        for root in sorted(page_numbers, key=page_numbers.get):
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(edges(root)))]
+            while work:
+                objnum, targets = work[-1]
+                for target in targets:
+                    if target not in index:
+                        index[target] = low[target] = len(index)
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(edges(target))))
+                        break
+                    if target in on_stack:
+                        low[objnum] = min(low[objnum], index[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[objnum])
+                    if low[objnum] == index[objnum]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == objnum:
+                                break
+                        components.append(component)
+
+        component_of = {objnum: number for number, component in enumerate(components) for objnum in component}
+        interned: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+        incoming: Dict[int, Dict[int, Tuple[int, ...]]] = {}
+        owning_pages: Dict[int, Tuple[int, ...]] = {}
+
+        for number in range(len(components) - 1, -1, -1):
+            component = components[number]
+            sources = incoming.pop(number, {})
+            own = [page_numbers[objnum] for objnum in component if objnum in page_numbers]
+            if len(sources) == 1 and not own:
+                pages = next(iter(sources.values()))
+            else:
+                merged = set(own)
+                for source in sources.values():
+                    merged.update(source)
+                pages = tuple(sorted(merged))
+                pages = interned.setdefault(pages, pages)
+
+            for objnum in component:
+                owning_pages[objnum] = pages
+                for target in children[objnum]:
+                    target_component = component_of[target]
+                    if target_component != number:
+                        incoming.setdefault(target_component, {})[id(pages)] = pages
+
+        return owning_pages
+
+    def _assign_field_pages(
+        self,
+        reader: PdfReader,
+        forward: Dict[int, List[Tuple[int, str]]],
+        owning_pages: Dict[int, Tuple[int, ...]]
+    ):
+        """Give non-terminal form fields the pages of their descendants"""
+        try:
+            root = reader.trailer["/Root"].get_object()
+            acroform = root.get("/AcroForm")
+            acroform = acroform.get_object() if isinstance(acroform, IndirectObject) else acroform
+            fields = acroform.get("/Fields", []) if isinstance(acroform, DictionaryObject) else []
+            fields = fields.get_object() if isinstance(fields, IndirectObject) else fields
+            roots = [field.idnum for field in fields if isinstance(field, IndirectObject)]
+        except Exception as e:
+            self.logger.debug(f"No form fields to assign pages to: {e}")
+            return
+
+        # Iterative post-order over /Kids so parents see their children's pages
+        done: Set[int] = set()
+        stack: List[Tuple[int, bool]] = [(objnum, False) for objnum in roots]
+        while stack:
+            objnum, expanded = stack.pop()
+            kids = [target for target, key in forward.get(objnum, []) if key.startswith("/Kids")]
+            if not expanded:
+                if objnum in done:
+                    continue
+                done.add(objnum)
+                stack.append((objnum, True))
+                stack.extend((kid, False) for kid in kids if kid not in done)
+                continue
+
+            pages = set(owning_pages.get(objnum, ()))
+            for kid in kids:
+                pages.update(owning_pages.get(kid, ()))
+            if pages:
+                owning_pages[objnum] = tuple(sorted(pages))
+
+
+# Global reference index builder instance
+reference_index_builder = ReferenceIndexBuilder()
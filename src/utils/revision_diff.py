@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Revision Diff
+Actions, fields and annotations changed by each incremental update of a document
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import DictionaryObject, IndirectObject
+
+from ..config.settings import settings
+from .action_extractor import action_extractor, RECORD_LEVELS
+from .revisions import RevisionMaps, _SectionReader, document_bytes, incremental_extractor, iter_revisions
+
+
+# Bump whenever the diff output changes, so persisted diffs are rebuilt
+REVISION_DIFF_VERSION = "2"
+
+# Changed object numbers listed per revision; the count is always reported
+MAX_LISTED_OBJECTS = 1000
+
+CHANGE_ADDED = "added"
+CHANGE_MODIFIED = "modified"
+CHANGE_REMOVED = "removed"
+
+
+class RevisionDiffer:
+    """
+    Diff consecutive revisions of an incrementally updated document.
+
+    Revisions are visited oldest first. Each cross-reference section is
+    parsed once and applied in place to a single merged map (see
+    RevisionMaps), and each revision is read through that map from the
+    document's own stream, so no revision's bytes are copied. Every diffed
+    revision still gets a fresh reader and a walk of all its nodes: only
+    the collectors of nodes that read no changed object are skipped, their
+    entries being copied from the previous revision. Each step therefore
+    costs about a walk of the whole document, not the size of the update,
+    so only the newest max_revisions revisions are extracted and compared;
+    older sections are parsed for their maps alone and reported as skipped.
+    Fields and annotations are compared on the changed objects alone.
+    """
+
+    def __init__(self, max_revisions: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self._max_revisions = max_revisions
+
+    @property
+    def max_revisions(self) -> int:
+        """Newest revisions extracted and compared (configured in Settings unless given)"""
+        return self._max_revisions or settings.get_revision_diff_max_revisions()
+
+    def diff(self, reader: PdfReader) -> Dict[str, Any]:
+        """
+        Enumerate the revisions of a document and diff each against the previous one.
+
+        Args:
+            reader: Reader of the document (already decrypted if encrypted)
+
+        Returns:
+            Revision count and, per diffed revision (1 = original document),
+            its cross-reference section, changed objects and the Actions,
+            fields and annotations it added, modified or removed; the oldest
+            diffed revision beyond the limit is the baseline, reported with
+            Action counts like revision 1, and older ones are counted in
+            skipped_revisions
+        """
+        data = document_bytes(reader)
+        if data is None:
+            reader.stream.seek(0)
+            data = memoryview(reader.stream.read())
+        with data:
+            revisions = iter_revisions(data)
+        if not revisions:
+            raise ValueError("No cross-reference section found")
+        revisions.reverse()
+
+        section_reader = _SectionReader(reader)
+        maps = RevisionMaps()
+        previous_reader: Optional[PdfReader] = None
+        previous_actions: Optional[Dict[str, Any]] = None
+        previous_state = None
+        result: Dict[str, Any] = {"revision_count": len(revisions), "modified_revisions": [], "revisions": []}
+        first_diffed = max(1, len(revisions) - self.max_revisions + 1)
+        if first_diffed > 1:
+            result["skipped_revisions"] = first_diffed - 1
+            result["max_revisions"] = self.max_revisions
+
+        for number, (offset, end) in enumerate(revisions, 1):
+            section = section_reader.read_section(offset)
+            if number < first_diffed:
+                # Older than the diffed window: only its maps are needed
+                maps.overlay(section)
+                continue
+
+            changed = maps.changed_objects(section)
+            before = {}
+            if previous_reader is not None:
+                before = {objnum: self._describe(previous_reader, objnum) for objnum in changed}
+
+            maps.overlay(section)
+            revision_reader = maps.reader(reader)
+            previous = (previous_actions, previous_state, changed) if previous_state is not None else None
+            extraction = incremental_extractor.extract(revision_reader, previous)
+            actions = extraction.actions
+
+            entry: Dict[str, Any] = {
+                "revision": number,
+                "xref_offset": offset,
+                "end_offset": end,
+                "xref_type": section.kind,
+                "changed_objects": len(changed)
+            }
+            if previous_reader is None:
+                entry["actions"] = {level: len(actions.get(level, {})) for level in RECORD_LEVELS}
+            else:
+                entry["changed_object_numbers"] = sorted(changed)[:MAX_LISTED_OBJECTS]
+                entry["actions"] = self._diff_actions(previous_actions, actions)
+                after = {objnum: self._describe(revision_reader, objnum) for objnum in changed}
+                entry["annotations"] = self._diff_objects(before, after, "annotation")
+                entry["fields"] = self._diff_objects(before, after, "field")
+                if entry["actions"] or entry["annotations"] or entry["fields"]:
+                    result["modified_revisions"].append(number)
+            entry["extraction"] = {
+                "reused_nodes": extraction.reused_nodes,
+                "extracted_nodes": extraction.extracted_nodes
+            }
+            if actions.get("truncated"):
+                entry["truncated"] = True
+                result["truncated"] = True
+            if "error" in actions:
+                entry["extraction_error"] = actions["error"]
+            result["revisions"].append(entry)
+
+            previous_reader, previous_actions, previous_state = revision_reader, actions, extraction.state
+
+        return result
+
+    def _diff_actions(self, before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+        """Entries of each Actions level added, modified or removed"""
+        changes: Dict[str, Any] = {}
+        for level in RECORD_LEVELS:
+            old, new = before.get(level, {}), after.get(level, {})
+            added = {key: value for key, value in new.items() if key not in old}
+            removed = [key for key in old if key not in new]
+            modified = {
+                key: {"before": old[key], "after": value}
+                for key, value in new.items()
+                if key in old and old[key] is not value and old[key] != value
+            }
+            level_changes = {
+                name: value for name, value in
+                ((CHANGE_ADDED, added), (CHANGE_MODIFIED, modified), (CHANGE_REMOVED, removed)) if value
+            }
+            if level_changes:
+                changes[level] = level_changes
+        return changes
+
+    def _diff_objects(
+        self, before: Dict[int, Dict[str, Any]], after: Dict[int, Dict[str, Any]], kind: str
+    ) -> List[Dict[str, Any]]:
+        """Changes of the annotations or fields among the changed objects"""
+        changes = []
+        for objnum in sorted(after):
+            old, new = before.get(objnum, {}).get(kind), after[objnum].get(kind)
+            if old is None and new is None:
+                continue
+            if old is None:
+                change = CHANGE_ADDED
+            elif new is None:
+                change = CHANGE_REMOVED
+            else:
+                change = CHANGE_MODIFIED
+            changes.append({"object_number": objnum, "change": change, "before": old, "after": new})
+        return changes
+
+    def _describe(self, reader: PdfReader, objnum: int) -> Dict[str, Any]:
+        """Annotation and field summary of an object in one revision; empty if it is neither"""
+        generations = [generation for generation, entries in reader.xref.items() if objnum in entries]
+        try:
+            obj = reader.get_object(IndirectObject(objnum, max(generations, default=0), reader))
+        except Exception as e:
+            self.logger.debug(f"Object {objnum} not readable in this revision: {e}")
+            return {}
+        if not isinstance(obj, DictionaryObject):
+            return {}
+
+        description = {}
+        try:
+            if "/Rect" in obj and "/Subtype" in obj:
+                description["annotation"] = {
+                    "subtype": str(obj.get("/Subtype", "Unknown")),
+                    "rect": [float(x) for x in obj["/Rect"]],
+                    "contents": str(obj.get("/Contents", "")),
+                    "has_action": "/A" in obj or "/AA" in obj
+                }
+            if "/FT" in obj or ("/T" in obj and ("/Kids" in obj or "/Parent" in obj)):
+                description["field"] = action_extractor._extract_field_details(obj)
+        except Exception as e:
+            self.logger.debug(f"Failed to describe object {objnum}: {e}")
+        return description
+
+
+# Global revision differ instance
+revision_differ = RevisionDiffer()
@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+"""
+Document Revisions
+Incremental update boundaries, changed objects and revision-aware Actions extraction
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import mmap
+except ImportError:  # Platforms without mmap support
+    mmap = None
+
+from PyPDF2 import PdfReader
+from PyPDF2.errors import PdfReadError
+from PyPDF2.generic import DictionaryObject, IndirectObject, NameObject
+
+from ..config.settings import settings
+from .action_extractor import action_extractor, RECORD_LEVELS, VISIT_METHODS, EXTRACTOR_VERSION
+from .dependency_recorder import DependencyRecorder
+from .extraction_budget import ExtractionBudget
+from .object_walker import NODE_ANNOTATION, NODE_CATALOG, NODE_ERROR, NODE_FIELD, NODE_PAGE, document_walker
+
+
+# Bump whenever recorded node dependencies change, so stored revision states are rebuilt
+REVISION_STATE_VERSION = "1"
+
+# Result name of the revision state stored next to the Actions of a revision
+REVISION_STATE_KEY = f"action_revision:v{EXTRACTOR_VERSION}.{REVISION_STATE_VERSION}"
+
+# Longest /Prev chain followed; real documents have a handful of revisions
+MAX_REVISIONS = 1024
+
+_STARTXREF_PATTERN = re.compile(rb"startxref\s+(\d+)")
+_PREV_PATTERN = re.compile(rb"/Prev\s+(\d+)")
+_TRAILER_PATTERN = re.compile(rb"trailer")
+_STREAM_PATTERN = re.compile(rb"stream")
+_EOF_PATTERN = re.compile(rb"%%EOF")
+
+# Bytes searched for the last startxref
+_TAIL_BYTES = 4096
+
+
+def document_bytes(reader: PdfReader) -> Optional[memoryview]:
+    """A view of the bytes a reader parses, or None when they are not held in memory or mapped"""
+    stream = getattr(reader, "stream", None)
+    if isinstance(stream, BytesIO):
+        return stream.getbuffer()
+    if mmap is not None and isinstance(stream, mmap.mmap):
+        return memoryview(stream)
+    return None
+
+
+def _section_prev(data, offset: int) -> Optional[int]:
+    """/Prev of the cross-reference section at offset, from its trailer or xref stream dictionary"""
+    if bytes(data[offset:offset + 4]) == b"xref":
+        trailer = _TRAILER_PATTERN.search(data, offset)
+        if trailer is None:
+            return None
+        start = trailer.end()
+        end = _STARTXREF_PATTERN.search(data, start)
+    else:
+        # Cross-reference stream: the dictionary precedes the stream data
+        start = offset
+        end = _STREAM_PATTERN.search(data, start)
+
+    match = _PREV_PATTERN.search(data, start, end.start() if end else len(data))
+    return int(match.group(1)) if match else None
+
+
+def iter_revisions(data) -> List[Tuple[int, int]]:
+    """
+    Revisions of a document, newest first, following the /Prev chain.
+
+    Returns:
+        (xref_offset, end) per revision, where end is the offset just past
+        the %%EOF closing the revision; the newest revision ends at the end
+        of the data. Chains pointing forward (linearized files) or in a
+        cycle stop, leaving a single revision.
+    """
+    tail_start = max(0, len(data) - _TAIL_BYTES)
+    startxref = None
+    for match in _STARTXREF_PATTERN.finditer(data, tail_start):
+        startxref = int(match.group(1))
+    if startxref is None or startxref >= len(data):
+        return []
+
+    revisions = [(startxref, len(data))]
+    offset = startxref
+    while len(revisions) < MAX_REVISIONS:
+        previous = _section_prev(data, offset)
+        if previous is None or previous >= offset:
+            break
+
+        eof = _EOF_PATTERN.search(data, previous, offset)
+        if eof is None:
+            break
+        revisions.append((previous, eof.end()))
+        offset = previous
+
+    return revisions
+
+
+def revision_end_candidates(data, end: int) -> List[int]:
+    """Possible ends of a revision: just past %%EOF, and past each end-of-line byte that follows"""
+    candidates = [end]
+    while len(candidates) < 3 and end < len(data) and bytes(data[end:end + 1]) in (b"\r", b"\n"):
+        end += 1
+        candidates.append(end)
+    return candidates
+
+
+def update_objects(reader: PdfReader, offset: int) -> Set[int]:
+    """
+    Objects an incremental update may have changed.
+
+    Every object an update adds or rewrites has an entry in its
+    cross-reference section, so the objects the section at offset lists,
+    plus the members of object streams it rewrites, cover every change.
+    Only that section is parsed; an unchanged object listed again is
+    merely extracted again.
+    """
+    section = _SectionReader(reader).read_section(offset)
+    listed = section.objnums()
+    rewritten_streams = {objnum for objnum in listed if objnum not in section.object_streams}
+    listed.update(
+        objnum for objnum, (stream_objnum, _) in reader.xref_objStm.items()
+        if stream_objnum in rewritten_streams
+    )
+    return listed
+
+
+def _location(xref: Dict[int, Dict[int, int]], free: Dict[int, Dict[int, bool]], object_streams: Dict[int, tuple], objnum: int) -> frozenset:
+    """Where one object lives according to cross-reference maps: its (generation, offset, free) entries and object stream slot"""
+    location = {
+        (generation, entries[objnum], bool(free.get(generation, {}).get(objnum)))
+        for generation, entries in xref.items() if objnum in entries
+    }
+    if objnum in object_streams:
+        stream_objnum, index = object_streams[objnum]
+        location.add(("stream", stream_objnum, index))
+    return frozenset(location)
+
+
+class XrefSection:
+    """Entries and trailer of a single cross-reference section"""
+
+    __slots__ = ("offset", "kind", "xref", "free", "object_streams", "trailer")
+
+    def __init__(self, offset: int, kind: str, xref: Dict, free: Dict, object_streams: Dict, trailer: DictionaryObject):
+        self.offset = offset
+        self.kind = kind
+        self.xref = xref
+        self.free = free
+        self.object_streams = object_streams
+        self.trailer = trailer
+
+    def objnums(self) -> Set[int]:
+        """Objects the section has entries for"""
+        objnums = set(self.object_streams)
+        for entries in self.xref.values():
+            objnums.update(entries)
+        for entries in self.free.values():
+            objnums.update(entries)
+        return objnums
+
+
+class _SectionReader(PdfReader):
+    """
+    Parse single cross-reference sections with PyPDF2's own table and
+    stream parsers, without following /Prev, so every section of a
+    document is read once. Only the state those parsers use is set up;
+    they are private to PyPDF2, whose 3.x line is final, so the
+    requirement is capped below 4.
+    """
+
+    def __init__(self, base: PdfReader):
+        self.strict = False
+        self.flattened_pages = None
+        self.resolved_objects = {}
+        self.xref_index = 0
+        self._page_id2num = None
+        self._override_encryption = True
+        self._encryption = None
+        self.stream = base.stream
+        self._base = base
+
+    def get_object(self, indirect_reference):
+        # Only an indirect /Length of a cross-reference stream is resolved here
+        return self._base.get_object(indirect_reference)
+
+    def read_section(self, offset: int) -> XrefSection:
+        """Parse the cross-reference table or stream at offset"""
+        self.xref = {}
+        self.xref_free_entry = {}
+        self.xref_objStm = {}
+        self.trailer = DictionaryObject()
+
+        stream = self.stream
+        stream.seek(offset, 0)
+        marker = stream.read(1)
+        if marker in b"\r\n":
+            marker = stream.read(1)
+
+        if marker == b"x":
+            self._read_xref(stream)
+            kind = "table"
+        elif marker.isdigit():
+            xref_stream = self._read_pdf15_xref_stream(stream)
+            for key in ("/Root", "/Encrypt", "/Info", "/ID", "/Prev"):
+                if key in xref_stream:
+                    self.trailer[NameObject(key)] = xref_stream.raw_get(key)
+            kind = "stream"
+        else:
+            raise PdfReadError(f"No cross-reference section at offset {offset}")
+
+        return XrefSection(offset, kind, self.xref, self.xref_free_entry, self.xref_objStm, self.trailer)
+
+
+class RevisionMaps:
+    """
+    Cross-reference maps of the revision being visited, oldest first.
+
+    ``overlay`` applies the next section in place, so walking all revisions
+    holds one merged map however many there are. ``reader`` gives a reader
+    of the current revision over the document's own stream.
+    """
+
+    def __init__(self):
+        self.xref: Dict[int, Dict[int, int]] = {}
+        self.free: Dict[int, Dict[int, bool]] = {}
+        self.object_streams: Dict[int, tuple] = {}
+        self.trailer = DictionaryObject()
+
+    @classmethod
+    def from_reader(cls, reader: PdfReader) -> "RevisionMaps":
+        """Maps of the latest revision, as already parsed by a reader"""
+        maps = cls()
+        maps.xref = reader.xref
+        maps.free = getattr(reader, "xref_free_entry", {})
+        maps.object_streams = reader.xref_objStm
+        maps.trailer = reader.trailer
+        return maps
+
+    def changed_objects(self, section: XrefSection) -> Set[int]:
+        """Objects the section adds or moves, including members of object streams it rewrites"""
+        changed = {
+            objnum for objnum in section.objnums()
+            if _location(section.xref, section.free, section.object_streams, objnum)
+            != _location(self.xref, self.free, self.object_streams, objnum)
+        }
+        rewritten_streams = {objnum for objnum in changed if objnum not in section.object_streams}
+        changed.update(
+            objnum for objnum, (stream_objnum, _) in section.object_streams.items()
+            if stream_objnum in rewritten_streams
+        )
+        return changed
+
+    def overlay(self, section: XrefSection):
+        """Apply the next (newer) section; its entries replace every older entry of the same objects"""
+        for objnum in section.objnums():
+            for entries in self.xref.values():
+                entries.pop(objnum, None)
+            for entries in self.free.values():
+                entries.pop(objnum, None)
+            self.object_streams.pop(objnum, None)
+
+        for generation, entries in section.xref.items():
+            self.xref.setdefault(generation, {}).update(entries)
+        for generation, entries in section.free.items():
+            self.free.setdefault(generation, {}).update(entries)
+        self.object_streams.update(section.object_streams)
+        self.trailer.update(section.trailer)
+
+    def reader(self, base: PdfReader) -> "RevisionReader":
+        """Reader of the current revision"""
+        return RevisionReader(base, self)
+
+
+class RevisionReader(PdfReader):
+    """
+    Reader of one revision of a document.
+
+    Objects are read from the document's own stream, located through the
+    merged maps of the revision's cross-reference sections, so only the
+    revision's objects are visible. Encrypted documents reuse the base
+    reader's decryption.
+    """
+
+    def __init__(self, base: PdfReader, maps: RevisionMaps):
+        self._maps = maps
+        super().__init__(base.stream, strict=False)
+        if base.is_encrypted:
+            self._encryption = base._encryption
+
+    def read(self, stream):
+        maps = self._maps
+        self.xref = maps.xref
+        self.xref_free_entry = maps.free
+        self.xref_objStm = maps.object_streams
+        # Trailer references were parsed for the section reader; bind them to this revision
+        self.trailer = DictionaryObject({
+            key: IndirectObject(value.idnum, value.generation, self) if isinstance(value, IndirectObject) else value
+            for key, value in maps.trailer.items()
+        })
+
+
+class RevisionState:
+    """
+    What each node of an extracted revision read and produced.
+
+    ``nodes`` maps a node signature (kind, position and object number) to
+    the objects the node read and, per level, the entry keys and warnings it
+    produced. Nodes without an object number or sharing an entry key with
+    another node are left out; they are always extracted again.
+    """
+
+    __slots__ = ("nodes",)
+
+    def __init__(self, nodes: Dict[str, Tuple[Tuple[int, ...], Dict[str, Tuple[List[str], List[str]]]]]):
+        self.nodes = nodes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form"""
+        return {
+            "nodes": {
+                signature: [list(dependencies), {level: [keys, warnings] for level, (keys, warnings) in levels.items()}]
+                for signature, (dependencies, levels) in self.nodes.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RevisionState":
+        """Rebuild a state from its JSON-serializable form"""
+        return cls({
+            signature: (tuple(dependencies), {level: (keys, warnings) for level, (keys, warnings) in levels.items()})
+            for signature, (dependencies, levels) in data["nodes"].items()
+        })
+
+
+class RevisionExtraction:
+    """Actions of one document revision and how they were obtained"""
+
+    __slots__ = ("actions", "state", "digest", "previous_digest", "changed_objects", "reused_nodes", "extracted_nodes")
+
+    def __init__(self, actions: Dict[str, Any], state: Optional[RevisionState], digest: Optional[str] = None):
+        self.actions = actions
+        self.state = state
+        self.digest = digest
+        self.previous_digest: Optional[str] = None
+        self.changed_objects: Optional[Set[int]] = None
+        self.reused_nodes = 0
+        self.extracted_nodes = 0
+
+
+# Previous revision passed to IncrementalActionExtractor.extract: (Actions, state, changed objects)
+PreviousRevision = Tuple[Dict[str, Any], RevisionState, Set[int]]
+
+
+class IncrementalActionExtractor:
+    """
+    Revision-aware extract_all_actions.
+
+    Every extraction records, per catalog, page, annotation and field node,
+    the objects the node read (see DependencyRecorder), on a reader of its
+    own so shared cached readers are never instrumented. When a document is
+    an incremental update of a revision extracted before, only nodes that
+    read an object listed by the appended cross-reference section, or are
+    new, run through the collectors again; the entries of every other node
+    are copied from the previous revision's Actions. The result is
+    identical to a full extraction of the new revision.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stats = {
+            "extractions": 0,
+            "incremental_extractions": 0,
+            "reused_nodes": 0,
+            "extracted_nodes": 0
+        }
+
+    def extract_revision(
+        self,
+        reader: PdfReader,
+        lookup: Callable[[str], Optional[Tuple[Dict[str, Any], RevisionState]]],
+        budget: Optional[ExtractionBudget] = None,
+        digest: Optional[str] = None
+    ) -> RevisionExtraction:
+        """
+        Extract all Actions of a document, reusing its previous revision when lookup knows it.
+
+        Args:
+            reader: Reader of the document
+            lookup: Get the Actions and state of a revision by the SHA-256 of its bytes
+            budget: Extraction budget (configured in Settings unless given)
+            digest: SHA-256 of the document when already known (e.g. memoized
+                by the cache manager); computed from the reader's bytes otherwise
+
+        Returns:
+            The Actions, the state to keep for the next revision (None for
+            failed or truncated extractions) and the reuse counts
+        """
+        data = document_bytes(reader)
+        if data is None:
+            return self.extract(reader, budget=budget)
+
+        previous = None
+        previous_digest = None
+        # Release the view afterwards; exported buffers cannot be closed
+        with data:
+            if digest is None:
+                digest = hashlib.sha256(data).hexdigest()
+            revisions = iter_revisions(data)
+            if len(revisions) > 1:
+                previous_digest, previous = self._find_previous(reader, data, revisions, lookup)
+
+        extraction = self.extract(reader, previous, budget)
+        extraction.digest = digest
+        if previous is not None:
+            extraction.previous_digest = previous_digest
+            extraction.changed_objects = previous[2]
+        return extraction
+
+    def _find_previous(
+        self, reader: PdfReader, data, revisions: List[Tuple[int, int]], lookup: Callable
+    ) -> Tuple[Optional[str], Optional[PreviousRevision]]:
+        """
+        Find the previous revision by the digest of its bytes.
+
+        Only the bytes up to the previous revision's end are hashed, in place;
+        the objects that changed come from the newest cross-reference section
+        alone, so the previous revision is never copied or parsed again.
+        """
+        candidates = revision_end_candidates(data, revisions[1][1])
+        digest = hashlib.sha256(data[:candidates[0]])
+        for position, candidate in enumerate(candidates):
+            if position:
+                digest.update(data[candidates[position - 1]:candidate])
+            previous_digest = digest.copy().hexdigest()
+            found = lookup(previous_digest)
+            if found is None:
+                continue
+
+            try:
+                changed = update_objects(reader, revisions[0][0])
+            except Exception as e:
+                self.logger.warning(f"Failed to compare with the previous revision, extracting in full: {e}")
+                return None, None
+
+            actions, state = found
+            self.logger.info(f"Incremental update of a known revision, {len(changed)} objects changed")
+            return previous_digest, (actions, state, changed)
+
+        return None, None
+
+    def extract(
+        self,
+        reader: PdfReader,
+        previous: Optional[PreviousRevision] = None,
+        budget: Optional[ExtractionBudget] = None
+    ) -> RevisionExtraction:
+        """
+        Extract all Actions node by node, recording what each node read.
+
+        Nodes of the previous revision that read no changed object are
+        copied from its Actions instead of being extracted.
+        """
+        result = {level: {} for level in RECORD_LEVELS}
+        budget = budget or ExtractionBudget()
+        if not isinstance(reader, RevisionReader):
+            # Record on a reader of its own over the same maps, never on a shared cached reader
+            reader = RevisionMaps.from_reader(reader).reader(reader)
+        recorder = DependencyRecorder(reader)
+        extraction = RevisionExtraction(result, None)
+
+        collectors = action_extractor.create_level_collectors(budget, recorder)
+        levels: Dict[str, List[Any]] = {kind: [] for kind in VISIT_METHODS}
+        for level, (kind, _) in RECORD_LEVELS.items():
+            collector = collectors[level]
+            levels[kind].append((level, collector, getattr(collector, VISIT_METHODS[kind])))
+
+        nodes = {}
+        key_owners: Dict[Tuple[str, str], int] = {}
+        root_objnum = self._root_objnum(reader)
+
+        try:
+            with recorder.installed():
+                for kind, payload in document_walker.iter_nodes(reader):
+                    if not budget.charge_objects():
+                        break
+
+                    if kind == NODE_ERROR:
+                        failed_kind, error = payload
+                        for _, collector, _ in levels.get(failed_kind, []):
+                            if not collector.failed:
+                                collector.fail(error)
+                        continue
+
+                    signature, objnum = self._node_identity(kind, payload, root_objnum)
+                    record = self._reusable_record(signature, previous)
+                    if record is not None:
+                        extraction.reused_nodes += 1
+                        self._replay(record, previous[0], collectors, result)
+                    else:
+                        extraction.extracted_nodes += 1
+                        record = self._extract_node(recorder, levels[kind], payload, objnum, result)
+
+                    for level, (keys, _) in record[1].items():
+                        for key in keys:
+                            key_owners[(level, key)] = key_owners.get((level, key), 0) + 1
+                    if signature is not None and record[1]:
+                        nodes[signature] = record
+
+            warnings = [warning for collector in collectors.values() for warning in collector.warnings]
+            if warnings:
+                result["warnings"] = warnings
+
+        except Exception as e:
+            self.logger.error(f"Failed to extract Actions: {e}")
+            result["error"] = str(e)
+
+        if budget.exhausted:
+            result["truncated"] = True
+            result["truncation"] = budget.get_status()
+        elif "error" not in result:
+            extraction.state = RevisionState({
+                signature: record for signature, record in nodes.items()
+                if all(key_owners[(level, key)] == 1 for level, (keys, _) in record[1].items() for key in keys)
+            })
+
+        with self._lock:
+            self._stats["extractions"] += 1
+            self._stats["incremental_extractions"] += previous is not None
+            self._stats["reused_nodes"] += extraction.reused_nodes
+            self._stats["extracted_nodes"] += extraction.extracted_nodes
+        return extraction
+
+    def _root_objnum(self, reader: PdfReader) -> Optional[int]:
+        """Object number of the catalog"""
+        try:
+            root = reader.trailer.raw_get("/Root")
+        except (KeyError, AttributeError):
+            return None
+        return root.idnum if isinstance(root, IndirectObject) else None
+
+    def _node_identity(self, kind: str, payload: tuple, root_objnum: Optional[int]) -> Tuple[Optional[str], Optional[int]]:
+        """Signature of a node (None when it has no object of its own) and its object number"""
+        if kind == NODE_CATALOG:
+            objnum, position = root_objnum, ()
+        elif kind == NODE_PAGE:
+            page_num, page = payload
+            reference = getattr(page, "indirect_reference", None)
+            objnum, position = (reference.idnum if reference is not None else None), (page_num,)
+        elif kind == NODE_ANNOTATION:
+            page_num, annot_num, _, objnum = payload
+            position = (page_num, annot_num)
+        elif kind == NODE_FIELD:
+            field_num, _, objnum = payload
+            position = (field_num,)
+        else:
+            return None, None
+
+        if objnum is None:
+            return None, None
+        return ":".join([kind, *map(str, position), str(objnum)]), objnum
+
+    def _reusable_record(self, signature: Optional[str], previous: Optional[PreviousRevision]):
+        """The previous revision's record of a node, if none of the objects it read changed"""
+        if signature is None or previous is None:
+            return None
+
+        actions, state, changed = previous
+        record = state.nodes.get(signature)
+        if record is None or not changed.isdisjoint(record[0]):
+            return None
+        for level, (keys, _) in record[1].items():
+            if any(key not in actions.get(level, {}) for key in keys):
+                return None
+        return record
+
+    def _replay(self, record, actions: Dict[str, Any], collectors: Dict[str, Any], result: Dict[str, Any]):
+        """Copy a reused node's entries and warnings from the previous revision"""
+        for level, (keys, warnings) in record[1].items():
+            collector = collectors[level]
+            if collector.failed:
+                continue
+            for key in keys:
+                result[level][key] = actions[level][key]
+            collector.warnings.extend(warnings)
+
+    def _extract_node(
+        self, recorder: DependencyRecorder, handlers: List[Any], payload: tuple, objnum: Optional[int], result: Dict[str, Any]
+    ):
+        """Run the collectors of a node, recording the objects it reads"""
+        produced = {}
+        with recorder.frame() as dependencies:
+            for level, collector, handler in handlers:
+                if collector.failed:
+                    continue
+
+                collector.result = {}
+                warning_count = len(collector.warnings)
+                try:
+                    handler(*payload)
+                except Exception as e:
+                    collector.fail(e)
+
+                # Entries collected before a failure are kept, as in a full extraction
+                result[level].update(collector.result)
+                warnings = collector.warnings[warning_count:]
+                if collector.result or warnings:
+                    produced[level] = (list(collector.result), warnings)
+
+        if objnum is not None:
+            dependencies.add(objnum)
+        return tuple(sorted(dependencies)), produced
+
+    def get_status(self) -> Dict[str, Any]:
+        """Extraction and node reuse counters"""
+        with self._lock:
+            stats = dict(self._stats)
+
+        nodes = stats["reused_nodes"] + stats["extracted_nodes"]
+        return {
+            "enabled": settings.get_incremental_extraction(),
+            "reuse_ratio": round(stats["reused_nodes"] / nodes, 4) if nodes else 0.0,
+            **stats
+        }
+
+
+# Global incremental Action extractor instance
+incremental_extractor = IncrementalActionExtractor()
@@ -56,6 +56,32 @@ def start_mcp_server():
         print(f"Failed to start server: {e}")
 
 
+def run_batch_analysis(argv):
+    """Analyze a directory or glob of PDFs, writing JSON Lines results"""
+    import argparse
+    import json
+    
+    parser = argparse.ArgumentParser(prog="python start.py batch", description="Batch PDF Actions analysis")
+    parser.add_argument("target", help="Directory (searched recursively) or glob pattern of PDF files")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: PDF_BATCH_WORKERS or CPU count)")
+    parser.add_argument("-o", "--output", default=None, help="JSON Lines output file (default: stdout)")
+    parser.add_argument("-p", "--password", default=None, help="Password for encrypted PDFs")
+    args = parser.parse_args(argv)
+    
+    from src.core.batch_analyzer import BatchAnalyzer
+    
+    analyzer = BatchAnalyzer(max_workers=args.workers, password=args.password)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            summary = analyzer.run(args.target, output)
+    else:
+        summary = analyzer.run(args.target, sys.stdout)
+    
+    # Keep stdout pure JSON Lines; report throughput on stderr
+    print(json.dumps({"summary": summary}, ensure_ascii=False), file=sys.stderr)
+    return summary["failed"] == 0
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         print("=== PDF Action Inspector Functionality Test ===")
@@ -63,8 +89,12 @@ if __name__ == "__main__":
         sys.exit(0 if success else 1)
     elif len(sys.argv) > 1 and sys.argv[1] == "server":
         start_mcp_server()
+    elif len(sys.argv) > 1 and sys.argv[1] == "batch":
+        success = run_batch_analysis(sys.argv[2:])
+        sys.exit(0 if success else 1)
     else:
         print("Usage:")
-        print("  python start.py test    - Run functionality test")
-        print("  python start.py server  - Start MCP server")
-        print("  python start.py         - Show this help message")
+        print("  python start.py test                  - Run functionality test")
+        print("  python start.py server                - Start MCP server")
+        print("  python start.py batch <dir-or-glob>   - Analyze PDFs in parallel, JSON Lines to stdout")
+        print("  python start.py                       - Show this help message")
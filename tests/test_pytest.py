@@ -13,6 +13,9 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from src.core.inspector import PDFActionInspector
+from src.utils.action_extractor import action_extractor
+from src.utils.object_walker import NODE_ANNOTATION, NODE_FIELD, NODE_PAGE, document_walker
+from benchmarks.synthetic_pdfs import write_synthetic_pdf
 
 
 class TestPDFActionInspector:
@@ -359,6 +362,1543 @@ class TestPDFActionInspector:
         print(f"✅ Password functionality test completed")
 
 
+
+class TestDocumentWalker:
+    """Test cases for the single-pass document walker"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Build a synthetic PDF with actions on every level"""
+        self.synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "synthetic.pdf"),
+            pages=6,
+            annotations_per_page=3,
+            widgets_per_page=2,
+            named_scripts=3,
+            embedded_files=2
+        )
+    
+    def test_each_node_visited_once(self):
+        """Test that pages, annotations and fields are emitted exactly once"""
+        from PyPDF2 import PdfReader
+        
+        reader = PdfReader(self.synthetic_pdf)
+        kinds = [kind for kind, _ in document_walker.iter_nodes(reader)]
+        
+        assert kinds.count(NODE_PAGE) == 6
+        assert kinds.count(NODE_ANNOTATION) == 6 * (3 + 2)
+        assert kinds.count(NODE_FIELD) == 6 * 2
+    
+    def test_single_pass_matches_per_level_extraction(self):
+        """Test that the single pass produces the same JSON as one traversal per level"""
+        from PyPDF2 import PdfReader
+        
+        single_pass = action_extractor.extract_all_actions(PdfReader(self.synthetic_pdf))
+        
+        reader = PdfReader(self.synthetic_pdf)
+        per_level = {
+            "document_level_actions": action_extractor._extract_document_level_actions(reader),
+            "document_level_scripts": action_extractor._extract_document_level_scripts(reader),
+            "embedded_files": action_extractor._extract_embedded_files(reader),
+            "pages_level_actions": action_extractor._extract_pages_level_actions(reader),
+            "annotations_level_actions": action_extractor._extract_annotations_level_actions(reader),
+            "field_level_actions": action_extractor._extract_field_level_actions(reader)
+        }
+        
+        assert json.dumps(single_pass, ensure_ascii=False, indent=2) == \
+            json.dumps(per_level, ensure_ascii=False, indent=2)
+        assert len(single_pass["pages_level_actions"]) == 6
+        assert len(single_pass["annotations_level_actions"]) == 6 * (3 + 2)
+        assert len(single_pass["field_level_actions"]) == 6 * 2
+        assert "DocumentOpenAction" in single_pass["document_level_actions"]
+        assert len(single_pass["document_level_scripts"]) == 3
+        assert len(single_pass["embedded_files"]) == 2
+    
+    def test_streamed_records_match_extract_all_actions(self, tmp_path, monkeypatch):
+        """Test that JSON Lines records cover every trigger of the nested result"""
+        from PyPDF2 import PdfReader
+        from src.config.settings import settings
+        
+        nested = action_extractor.extract_all_actions(PdfReader(self.synthetic_pdf))
+        expected = sorted(
+            (key, trigger)
+            for level in nested.values()
+            for key, entry in level.items()
+            for trigger in entry.get("actions", {})
+        )
+        
+        records = [json.loads(line) for line in action_extractor.iter_action_ndjson(PdfReader(self.synthetic_pdf))]
+        assert sorted((record["key"], record["trigger"]) for record in records if "trigger" in record) == expected
+        
+        # Attachments have no trigger and are streamed as one record each
+        attachments = [record for record in records if record["level"] == "embedded_file"]
+        assert [record["file_name"] for record in attachments] == ["attachment_0.txt", "attachment_1.txt"]
+        
+        annotation = next(record for record in records if record["level"] == "annotation")
+        assert {"page", "annotation_index", "objnum", "action"} <= set(annotation)
+        
+        # Inline responses are bounded pages, chained by a final next_cursor line
+        inspector = PDFActionInspector()
+        pages, cursor = [], 0
+        while cursor is not None:
+            lines = inspector.get_pdf_actions_ndjson(self.synthetic_pdf, cursor=cursor, max_records=7).splitlines(True)
+            cursor = json.loads(lines[-1]).get("next_cursor")
+            pages.append("".join(lines[:-1] if cursor is not None else lines))
+        assert all(page.count("\n") == 7 for page in pages[:-1])
+        
+        # Export writes the same records to disk
+        output_path = tmp_path / "actions.jsonl"
+        summary = inspector.export_pdf_actions_ndjson(self.synthetic_pdf, "actions.jsonl")
+        assert summary["success"] is False
+        
+        monkeypatch.setattr(settings, "export_dir", str(tmp_path))
+        summary = inspector.export_pdf_actions_ndjson(self.synthetic_pdf, "actions.jsonl")
+        assert summary["success"] is True
+        assert summary["records"] == len(records)
+        assert output_path.read_text(encoding="utf-8") == "".join(pages)
+    
+    def test_export_stays_in_export_dir(self, tmp_path, monkeypatch):
+        """Test that exports cannot escape PDF_EXPORT_DIR through relative, absolute or symlinked paths"""
+        from src.config.settings import settings
+        
+        export_dir = tmp_path / "exports"
+        export_dir.mkdir()
+        (export_dir / "link.jsonl").symlink_to(tmp_path / "outside.jsonl")
+        monkeypatch.setattr(settings, "export_dir", str(export_dir))
+        
+        inspector = PDFActionInspector()
+        for output_path in ("../escape.jsonl", str(tmp_path / "absolute.jsonl"), "link.jsonl", "."):
+            assert inspector.export_pdf_actions_ndjson(self.synthetic_pdf, output_path)["success"] is False
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["exports", "synthetic.pdf"]
+        
+        assert inspector.export_pdf_actions_ndjson(self.synthetic_pdf, "nested/../ok.jsonl")["success"] is True
+
+
+class TestActionChains:
+    """Test cases for /Next action chain resolution"""
+    
+    def _write_pdf(self, path, build):
+        """Write a one-page PDF after letting build(writer, catalog) add actions"""
+        from PyPDF2 import PdfWriter
+        
+        writer = PdfWriter()
+        writer.add_blank_page(width=612, height=792)
+        build(writer, writer._root_object)
+        with open(path, "wb") as file:
+            writer.write(file)
+        return str(path)
+    
+    def _js(self, code):
+        """Create a JavaScript action dictionary"""
+        from PyPDF2.generic import DictionaryObject, NameObject, TextStringObject
+        
+        return DictionaryObject({
+            NameObject("/S"): NameObject("/JavaScript"),
+            NameObject("/JS"): TextStringObject(code)
+        })
+    
+    def test_chain_is_followed_in_order(self, tmp_path):
+        """Test that every /Next stage is reported with the chain length"""
+        from PyPDF2 import PdfReader
+        
+        synthetic_pdf = write_synthetic_pdf(str(tmp_path / "chain.pdf"), pages=1, next_chain_length=5)
+        result = action_extractor.extract_all_actions(PdfReader(synthetic_pdf))
+        
+        open_action = result["document_level_actions"]["DocumentOpenAction"]["actions"]["OpenAction"]
+        assert open_action["chain_length"] == 6
+        assert [step["JS"] for step in open_action["Next"]] == [
+            f"console.println('chain step {index}');" for index in range(5)
+        ]
+        assert "chain_cycles" not in open_action
+    
+    def test_cycle_and_length_limit(self, tmp_path):
+        """Test that cyclic chains terminate and long chains are truncated"""
+        from PyPDF2 import PdfReader
+        from PyPDF2.generic import ArrayObject, NameObject
+        from src.utils.action_extractor import ActionChainResolver
+        
+        def build(writer, catalog):
+            first = self._js("stage(1);")
+            second = self._js("stage(2);")
+            first_ref = writer._add_object(first)
+            second_ref = writer._add_object(second)
+            first[NameObject("/Next")] = ArrayObject([second_ref, writer._add_object(self._js("stage(3);"))])
+            second[NameObject("/Next")] = first_ref
+            catalog[NameObject("/OpenAction")] = first_ref
+        
+        reader = PdfReader(self._write_pdf(tmp_path / "cycle.pdf", build))
+        open_action_ref = reader.trailer["/Root"].raw_get("/OpenAction")
+        
+        resolved = ActionChainResolver(action_extractor).resolve(open_action_ref)
+        assert [step["JS"] for step in resolved["Next"]] == ["stage(2);", "stage(3);"]
+        assert resolved["chain_cycles"] == [open_action_ref.idnum]
+        
+        truncated = ActionChainResolver(action_extractor, max_length=2).resolve(open_action_ref)
+        assert truncated["chain_length"] == 2
+        assert truncated["chain_truncated"] is True
+    
+    def test_shared_action_parsed_once(self, tmp_path, monkeypatch):
+        """Test that an action referenced from many annotations is parsed once per extraction"""
+        from PyPDF2 import PdfReader
+        from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject
+        
+        def build(writer, catalog):
+            shared = writer._add_object(self._js("shared();"))
+            page = writer.pages[0]
+            page[NameObject("/Annots")] = ArrayObject([
+                writer._add_object(DictionaryObject({
+                    NameObject("/Type"): NameObject("/Annot"),
+                    NameObject("/Subtype"): NameObject("/Link"),
+                    NameObject("/A"): shared
+                }))
+                for _ in range(50)
+            ])
+        
+        reader = PdfReader(self._write_pdf(tmp_path / "shared.pdf", build))
+        calls = []
+        original = action_extractor._parse_single_action_details
+        monkeypatch.setattr(
+            action_extractor, "_parse_single_action_details", lambda action, *args: calls.append(1) or original(action, *args)
+        )
+        
+        result = action_extractor.extract_all_actions(reader)
+        assert len(result["annotations_level_actions"]) == 50
+        assert len(calls) == 1
+
+    def test_shared_action_charged_per_use(self, tmp_path):
+        """Test that every reuse of a memoized action is charged to the output budget"""
+        from PyPDF2 import PdfReader
+        from PyPDF2.generic import NameObject
+        from src.utils.action_extractor import ActionChainResolver
+        from src.utils.extraction_budget import ExtractionBudget
+        
+        def build(writer, catalog):
+            head = self._js("head();")
+            head[NameObject("/Next")] = writer._add_object(self._js("shared();"))
+            catalog[NameObject("/OpenAction")] = writer._add_object(head)
+        
+        reader = PdfReader(self._write_pdf(tmp_path / "charged.pdf", build))
+        open_action_ref = reader.trailer["/Root"].raw_get("/OpenAction")
+        
+        shared_ref = open_action_ref.get_object().raw_get("/Next")
+        
+        def resolve_all(resolver, rounds):
+            for _ in range(rounds):
+                resolver.resolve(open_action_ref)
+                resolver.resolve(shared_ref)
+        
+        unlimited = ExtractionBudget(max_output_chars=0)
+        resolve_all(ActionChainResolver(action_extractor, budget=unlimited), 1)
+        once = unlimited.output_chars
+        assert once > 0
+        
+        # Parsing once fits the budget; only the memoized reuses exceed it
+        budget = ExtractionBudget(max_output_chars=once * 2)
+        resolve_all(ActionChainResolver(action_extractor, budget=budget), 3)
+        assert budget.output_chars == once * 3
+        assert budget.reason == "output"
+
+    def test_legacy_list_reuses_one_resolver(self, tmp_path, monkeypatch):
+        """Test that the legacy list API follows /Next without re-parsing heads or shared steps"""
+        from PyPDF2 import PdfReader
+        from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject
+
+        def build(writer, catalog):
+            shared_step = writer._add_object(self._js("step();"))
+            annotations = []
+            for index in range(10):
+                head = self._js(f"head({index});")
+                head[NameObject("/Next")] = shared_step
+                annotations.append(writer._add_object(DictionaryObject({
+                    NameObject("/Type"): NameObject("/Annot"),
+                    NameObject("/Subtype"): NameObject("/Link"),
+                    NameObject("/A"): writer._add_object(head)
+                })))
+            writer.pages[0][NameObject("/Annots")] = ArrayObject(annotations)
+
+        reader = PdfReader(self._write_pdf(tmp_path / "legacy.pdf", build))
+        calls = []
+        original = action_extractor._parse_single_action_details
+        monkeypatch.setattr(
+            action_extractor, "_parse_single_action_details", lambda action, *args: calls.append(1) or original(action, *args)
+        )
+
+        actions = action_extractor._extract_annotation_actions(reader)
+        assert len(actions) == 10
+        assert all(action["chain_length"] == 2 for action in actions)
+        assert actions[0]["next_actions"][0]["JS"] == "step();"
+        assert len(calls) == 1
+
+
+class TestNameTrees:
+    """Test cases for name tree traversal, document level scripts and attachments"""
+    
+    def test_walk_and_lookup_are_bounded(self, tmp_path):
+        """Test that walks honour entry, depth and cycle limits and lookups follow /Limits"""
+        from PyPDF2 import PdfReader
+        from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject
+        from src.utils.name_tree import TreeWalk, get_names_tree, lookup
+        
+        synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "names.pdf"), pages=1, annotations_per_page=0, widgets_per_page=0, named_scripts=300
+        )
+        tree = get_names_tree(PdfReader(synthetic_pdf).trailer["/Root"], "/JavaScript")
+        
+        walk = TreeWalk(tree)
+        assert [str(name) for name, _ in walk][:2] == ["script_000000", "script_000001"]
+        assert walk.entries == 300 and walk.warnings() == []
+        
+        limited = TreeWalk(tree, max_entries=100)
+        assert len(list(limited)) == 100
+        assert limited.truncated is True
+        
+        shallow = TreeWalk(tree, max_depth=0)
+        assert list(shallow) == []
+        assert shallow.depth_exceeded is True
+        
+        assert lookup(tree, "script_000257").get_object()["/JS"] == "console.println('named script 257');"
+        assert lookup(tree, "script_999999") is None
+        
+        # A node listing itself as a kid is visited once
+        node = DictionaryObject()
+        cyclic = self._self_referencing(node)
+        node[NameObject("/Kids")] = ArrayObject([cyclic])
+        cycle_walk = TreeWalk(cyclic)
+        assert list(cycle_walk) == []
+        assert cycle_walk.cycles == [cyclic.idnum]
+
+        # Intermediate nodes count too, even when they hold no leaves
+        wide = DictionaryObject({NameObject("/Kids"): ArrayObject([DictionaryObject() for _ in range(1000)])})
+        node_walk = TreeWalk(wide, max_nodes=50)
+        assert list(node_walk) == []
+        assert node_walk.nodes == 50 and node_walk.truncated is True
+        assert node_walk.warnings() == ["stopped after visiting 50 nodes"]
+        assert lookup(tree, "script_000257", max_nodes=1) is None
+
+    def _self_referencing(self, node):
+        """Register node in a writer and return its indirect reference"""
+        from PyPDF2 import PdfWriter
+        
+        return PdfWriter()._add_object(node)
+    
+    def test_scripts_and_attachments_reported(self, tmp_path):
+        """Test that /Names/JavaScript and /Names/EmbeddedFiles feed extraction and structure"""
+        from src.core.cache_manager import CacheManager
+        
+        synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "names.pdf"), pages=1, annotations_per_page=0, widgets_per_page=0,
+            with_document_actions=False, with_page_actions=False, named_scripts=2, embedded_files=1
+        )
+        inspector = PDFActionInspector(CacheManager())
+        
+        actions = inspector.extract_pdf_actions(synthetic_pdf)
+        script = actions["document_level_scripts"]["script_000001"]
+        assert script["actions"]["JavaScript"]["JS"] == "console.println('named script 1');"
+        attachment = actions["embedded_files"]["file_000000"]
+        assert attachment["file_name"] == "attachment_0.txt"
+        assert attachment["size"] == len(b"attachment 0\n")
+        assert "warnings" not in actions
+        
+        structure = inspector.get_document_overview(synthetic_pdf)["structure"]
+        assert structure["has_javascript"] is True
+        assert structure["has_embedded_files"] is True
+
+
+class TestFieldIndex:
+    """Test cases for the per-document form field index"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Build a synthetic PDF with a nested field tree"""
+        from src.core.cache_manager import CacheManager
+        
+        self.synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "fields.pdf"),
+            pages=3,
+            annotations_per_page=1,
+            widgets_per_page=2,
+            field_tree_depth=3
+        )
+        self.inspector = PDFActionInspector(CacheManager())
+    
+    def test_match_modes(self):
+        """Test exact, prefix, substring and regex lookups on fully-qualified names"""
+        exact = self.inspector.get_fields_by_name(self.synthetic_pdf, "tree.level1.level2.leaf", match="exact")
+        assert exact["total_found"] == 1
+        leaf = exact["found_fields"][0]
+        assert leaf["parents"] == ["tree", "tree.level1", "tree.level1.level2"]
+        assert leaf["widget_pages"] == [0]
+        assert leaf["objnum"] is not None
+        
+        assert self.inspector.get_fields_by_name(self.synthetic_pdf, "TREE.level1", match="prefix")["total_found"] == 3
+        assert self.inspector.get_fields_by_name(self.synthetic_pdf, "_w1")["total_found"] == 3
+        assert self.inspector.get_fields_by_name(self.synthetic_pdf, r"^field_p[12]_", match="regex")["total_found"] == 4
+        
+        invalid = self.inspector.get_fields_by_name(self.synthetic_pdf, "(", match="regex")
+        assert invalid["success"] is False
+
+    def test_regex_lookup_is_bounded(self, monkeypatch):
+        """Test that long, backtracking-prone or slow patterns are refused and matches are capped"""
+        from src.utils import field_index
+
+        rejected = [
+            "a" * (field_index.MAX_REGEX_LENGTH + 1), r"(\w+_?)*$", r"((a+))+$", r"(a|a)+$",
+            r"(?:(?:x|y)?z)*", r"(field)\1", r"(?P<f>field)(?P=f)"
+        ]
+        for pattern in rejected:
+            assert self.inspector.get_fields_by_name(self.synthetic_pdf, pattern, match="regex")["success"] is False
+        for pattern in [r"(?:field_)+p\d", r"(w\d){1}$", r"[(a+)]+"]:
+            assert "total_found" in self.inspector.get_fields_by_name(self.synthetic_pdf, pattern, match="regex")
+
+        # Polynomial backtracking passes the syntax check, so the search itself is killed
+        monkeypatch.setattr(field_index, "REGEX_TIMEOUT_SECONDS", 1.0)
+        slow = self.inspector.get_fields_by_name(self.synthetic_pdf, r"\w*" * 20 + "!", match="regex")
+        assert slow["success"] is False
+        assert "took longer than 1.0 seconds" in slow["error_message"]
+
+        monkeypatch.setattr(field_index, "MAX_REGEX_MATCHES", 2)
+        assert self.inspector.get_fields_by_name(self.synthetic_pdf, "field_", match="regex")["total_found"] == 2
+
+    def test_bulk_lookup_uses_one_index(self):
+        """Test that many names resolve against a single cached index build"""
+        result = self.inspector.get_fields_by_names(
+            self.synthetic_pdf, ["field_p0_w0", "field_p2_w1", "missing"]
+        )
+        assert result["total_found"] == 2
+        assert result["not_found"] == ["missing"]
+        assert result["results"]["field_p2_w1"][0]["widget_pages"] == [2]
+        
+        self.inspector.get_fields_by_name(self.synthetic_pdf, "field")
+        results_cache = self.inspector.get_cache_status()["results_cache"]
+        assert results_cache["misses"] == 1
+        assert results_cache["hits"] == 1
+
+
+class TestReferenceIndex:
+    """Test cases for the reverse reference index behind get_page_index_by_pdfobjnum"""
+    
+    def test_locates_any_object_type(self, tmp_path):
+        """Test that pages, annotations, field tree nodes and actions resolve to their pages"""
+        from PyPDF2 import PdfReader
+        from src.core.cache_manager import CacheManager
+        
+        synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "refs.pdf"), pages=4, annotations_per_page=2, widgets_per_page=1, field_tree_depth=3
+        )
+        reader = PdfReader(synthetic_pdf)
+        page_2 = reader.pages[2]
+        annotation = page_2["/Annots"][1]
+        catalog = reader.trailer["/Root"]
+        field_tree_root = next(
+            field for field in catalog["/AcroForm"]["/Fields"] if "/Kids" in field.get_object()
+        )
+        open_action = catalog.raw_get("/OpenAction")
+        
+        inspector = PDFActionInspector(CacheManager())
+        locate = lambda objnum: json.loads(inspector.get_page_index_by_pdfobjnum(synthetic_pdf, objnum))
+        
+        page_result = locate(page_2.indirect_reference.idnum)
+        assert page_result["is_page"] is True
+        assert page_result["found_pages"] == [2]
+        
+        annotation_result = locate(annotation.idnum)
+        assert annotation_result["found_pages"] == [2]
+        assert {"objnum": page_2.indirect_reference.idnum, "key": "/Annots[1]"} in annotation_result["referrers"]
+        
+        # Non-terminal fields are owned by the pages of their widgets
+        assert locate(field_tree_root.idnum)["found_pages"] == [0]
+        
+        # Document-level objects belong to no page but still report their referrers
+        open_action_result = locate(open_action.idnum)
+        assert open_action_result["found_pages"] == []
+        assert open_action_result["referrers"][0]["key"] == "/OpenAction"
+        
+        assert inspector.get_cache_status()["results_cache"]["misses"] == 1
+
+    def test_shared_objects_store_ownership_once(self):
+        """Test that objects shared by pages, including cycles below them, hold one page tuple"""
+        from src.utils.reference_index import reference_index_builder
+
+        # Pages 10 and 20 share font 1, whose descriptor 2 and file 3 refer to each other;
+        # 4 is private to page 20 and /Parent back-references are not followed
+        forward = {
+            10: [(1, "/Resources/Font/F1"), (4, "/Annots[0]")],
+            20: [(1, "/Resources/Font/F1")],
+            1: [(2, "/FontDescriptor")],
+            2: [(3, "/FontFile"), (10, "/Parent")],
+            3: [(2, "/Descriptor")],
+            4: [(20, "/P")]
+        }
+        owning_pages = reference_index_builder._assign_pages(forward, {10: 0, 20: 1})
+        assert owning_pages[10] == (0,) and owning_pages[4] == (0,)
+        assert owning_pages[1] == owning_pages[2] == owning_pages[3] == (0, 1)
+        assert owning_pages[1] is owning_pages[2] is owning_pages[3]
+
+
+class TestActionIndex:
+    """Test cases for the compact per-document action index"""
+    
+    def test_renders_extraction_result(self, tmp_path):
+        """Test that the index renders exactly the extract_all_actions result and backs every view"""
+        from PyPDF2 import PdfReader
+        from src.core.cache_manager import CacheManager
+        from src.utils.action_extractor import action_extractor
+        from src.utils.action_index import ActionIndex
+        
+        synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "index.pdf"), pages=3, annotations_per_page=2, widgets_per_page=2,
+            next_chain_length=3, named_scripts=2, embedded_files=1
+        )
+        expected = action_extractor.extract_all_actions(PdfReader(synthetic_pdf))
+        index = ActionIndex.from_actions(expected)
+        assert json.dumps(index.to_actions_dict()) == json.dumps(expected)
+        
+        inspector = PDFActionInspector(CacheManager())
+        assert inspector.extract_pdf_actions(synthetic_pdf) == expected
+        
+        summary = inspector.get_document_overview(synthetic_pdf)["actions_summary"]
+        assert summary["total_actions"] == index.get_stats()["triggers"]
+        assert summary["action_types"]["/JavaScript"] > 0
+        assert summary["embedded_files"] == expected["embedded_files"]
+        
+        annotations = json.loads(inspector.load_all_annotations(synthetic_pdf))
+        assert annotations["annotations"] == expected["annotations_level_actions"]
+        assert annotations["total_annotations"] == len(expected["annotations_level_actions"])
+        
+        # One index build serves all three views
+        assert inspector.get_cache_status()["results_cache"]["misses"] == 3  # actions, basic info, structure
+    
+    def test_shares_identical_actions(self):
+        """Test that identical Actions and scripts on many owners are stored once"""
+        from src.utils.action_index import ActionIndex
+        
+        script = {"S": "/JavaScript", "JS": "event.value = AFNumber_Format(2);"}
+        all_actions = {
+            "field_level_actions": {
+                f"field_amount_{i}(Tx)": {
+                    "objnum": 10 + i,
+                    "field_details": {"name": f"amount_{i}", "type": "Tx"},
+                    "actions": {"FieldFormat": dict(script), "FieldKeystroke": {"S": "/JavaScript", "JS": script["JS"]}}
+                }
+                for i in range(100)
+            },
+            "warnings": ["stopped after 100 entries"]
+        }
+        
+        index = ActionIndex.from_actions(all_actions)
+        stats = index.get_stats()
+        assert stats["triggers"] == 200
+        assert stats["distinct_actions"] == 1
+        assert stats["distinct_scripts"] == 1
+        assert index.summary() == {"total_actions": 200, "action_types": {"/JavaScript": 200}}
+        assert index.to_actions_dict() == all_actions
+
+
+class TestExtractionBudget:
+    """Test cases for per-extraction resource budgets"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Create a synthetic PDF with a Flate-compressed JavaScript stream"""
+        self.synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "budget.pdf"), pages=3, annotations_per_page=2, js_stream_bytes=5000
+        )
+    
+    def test_decodes_javascript_streams(self):
+        """Test that JavaScript streams are inflated to text within an unlimited budget"""
+        from PyPDF2 import PdfReader
+        
+        result = action_extractor.extract_all_actions(PdfReader(self.synthetic_pdf))
+        script = result["document_level_actions"]["DocumentAdditionalActions"]["actions"]["WS"]["JS"]
+        assert len(script) == 5000
+        assert script.startswith("var payload = unescape(")
+        assert "truncated" not in result
+    
+    def test_truncates_on_exhausted_budget(self):
+        """Test that extraction stops with a truncation marker when a limit is hit"""
+        from PyPDF2 import PdfReader
+        from src.utils.extraction_budget import ExtractionBudget
+        
+        result = action_extractor.extract_all_actions(
+            PdfReader(self.synthetic_pdf), ExtractionBudget(max_objects=5)
+        )
+        assert result["truncated"] is True
+        assert result["truncation"]["reason"] == "objects"
+        
+        result = action_extractor.extract_all_actions(
+            PdfReader(self.synthetic_pdf), ExtractionBudget(max_stream_bytes=1000)
+        )
+        script = result["document_level_actions"]["DocumentAdditionalActions"]["actions"]["WS"]
+        assert len(script["JS"]) == 1000
+        assert script["JS_truncated"] is True
+        assert result["truncation"]["reason"] == "stream_bytes"
+        assert result["truncation"]["stream_bytes"] == 1000
+    
+    def test_chained_and_predictor_streams_report_truncation(self):
+        """Test that chained Flate and predictor streams are bounded and flagged when cut short"""
+        import zlib
+        from PyPDF2.generic import ArrayObject, DictionaryObject, EncodedStreamObject, NameObject, NumberObject
+        from src.utils.extraction_budget import ExtractionBudget
+        
+        text = b"app.alert('chained');" * 100
+        chained = EncodedStreamObject()
+        chained[NameObject("/Filter")] = ArrayObject([NameObject("/FlateDecode"), NameObject("/FlateDecode")])
+        chained._data = zlib.compress(zlib.compress(text))
+        
+        full = ExtractionBudget(max_stream_bytes=0).read_stream(chained)
+        assert full.text.encode() == text and full.truncated is False
+        cut = ExtractionBudget(max_stream_bytes=100).read_stream(chained)
+        assert cut.text.encode() == text[:100] and cut.truncated is True
+        
+        # PNG "None" predictor rows: a zero tag byte before every 10 bytes of data
+        predicted = EncodedStreamObject()
+        predicted[NameObject("/Filter")] = NameObject("/FlateDecode")
+        predicted[NameObject("/DecodeParms")] = DictionaryObject({
+            NameObject("/Predictor"): NumberObject(12), NameObject("/Columns"): NumberObject(10)
+        })
+        predicted._data = zlib.compress(b"".join(b"\x00" + text[start:start + 10] for start in range(0, len(text), 10)))
+        
+        assert ExtractionBudget(max_stream_bytes=0).read_stream(predicted).text.encode() == text
+        budget = ExtractionBudget(max_stream_bytes=100)
+        assert budget.read_stream(predicted) == ("", True, None)
+        assert budget.reason == "stream_bytes"
+        
+        broken = EncodedStreamObject()
+        broken[NameObject("/Filter")] = NameObject("/FlateDecode")
+        broken._data = b"not deflate data"
+        assert ExtractionBudget().read_stream(broken).error.startswith("Failed to decode stream")
+    
+    def test_wrapped_bombs_are_bounded(self):
+        """Test that every stage of a mixed filter chain is decoded within the budget"""
+        import base64
+        import zlib
+        from PyPDF2.generic import ArrayObject, EncodedStreamObject, NameObject
+        from src.utils.extraction_budget import ExtractionBudget
+        
+        def stream(filters, data):
+            encoded = EncodedStreamObject()
+            encoded[NameObject("/Filter")] = ArrayObject([NameObject(name) for name in filters])
+            encoded._data = data
+            return encoded
+        
+        bomb = zlib.compress(b" " * (64 * 1024 * 1024))
+        for wrapped in [
+            stream(["/ASCIIHexDecode", "/FlateDecode"], bomb.hex().encode() + b">"),
+            stream(["/A85", "/Fl"], b"<~" + base64.a85encode(bomb) + b"~>"),
+            stream(["/RunLengthDecode"], bytes([129, 32]) * (1024 * 1024)),
+            stream(["/AHx", "/A85"], b"7A" * (1024 * 1024) + b">")
+        ]:
+            budget = ExtractionBudget(max_stream_bytes=1000)
+            decoded = budget.read_stream(wrapped)
+            assert decoded.text == " " * 1000 or decoded.text == "\0" * 1000
+            assert decoded.truncated is True and budget.stream_bytes == 1000
+        
+        text = b"app.alert('mixed');" * 50
+        mixed = stream(["/AHx", "/RL", "/FlateDecode"], b"".join(
+            b"%02x" % byte for byte in b"".join(
+                bytes([len(chunk) - 1]) + chunk for chunk in
+                (zlib.compress(text)[start:start + 128] for start in range(0, len(zlib.compress(text)), 128))
+            ) + b"\x80"
+        ) + b">")
+        assert ExtractionBudget(max_stream_bytes=0).read_stream(mixed) == (text.decode(), False, None)
+        # "-----A---B" from the LZWDecode example of the PDF reference
+        assert ExtractionBudget().read_stream(stream(["/LZWDecode"], bytes.fromhex("800B6050220C0C8501"))).text == "-----A---B"
+        assert ExtractionBudget().read_stream(stream(["/DCTDecode"], b"\xff\xd8")).error == "Unsupported stream filter /DCTDecode"
+    
+    def test_name_tree_nodes_are_charged(self, tmp_path):
+        """Test that walking a name tree charges every visited node to the budget"""
+        from PyPDF2 import PdfReader
+        from src.utils.extraction_budget import ExtractionBudget
+        from src.utils.name_tree import TreeWalk, get_names_tree
+        
+        synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "names.pdf"), pages=1, annotations_per_page=0, widgets_per_page=0, named_scripts=300
+        )
+        tree = get_names_tree(PdfReader(synthetic_pdf).trailer["/Root"], "/JavaScript")
+        budget = ExtractionBudget(max_objects=0)
+        walk = TreeWalk(tree, budget=budget)
+        assert len(list(walk)) == 300
+        assert budget.objects == walk.nodes > 1
+        
+        limited = TreeWalk(tree, budget=ExtractionBudget(max_objects=1))
+        assert list(limited) == []
+        assert limited.warnings() == ["stopped when the extraction budget ran out"]
+
+
+class TestRevisions:
+    """Test cases for revision-aware incremental re-extraction"""
+    
+    @pytest.fixture(autouse=True)
+    def enable_incremental_extraction(self, monkeypatch):
+        """Incremental extraction is off by default"""
+        from src.config.settings import settings
+        monkeypatch.setattr(settings, "incremental_extraction", True)
+    
+    def _extract_update(self, tmp_path, objects_for):
+        """Analyse a document, then an incremental update of it built by objects_for(reader)"""
+        from PyPDF2 import PdfReader
+        from src.core.cache_manager import CacheManager
+        from src.utils.revisions import incremental_extractor
+        from benchmarks.synthetic_pdfs import append_incremental_update
+        
+        original = write_synthetic_pdf(
+            str(tmp_path / "v1.pdf"), pages=4, annotations_per_page=4, widgets_per_page=1,
+            named_scripts=2, embedded_files=1, js_stream_bytes=200
+        )
+        updated = append_incremental_update(original, objects_for(PdfReader(original)), str(tmp_path / "v2.pdf"))
+        
+        inspector = PDFActionInspector(CacheManager())
+        inspector.extract_pdf_actions(original)
+        before = incremental_extractor.get_status()
+        actions = inspector.extract_pdf_actions(updated)
+        after = incremental_extractor.get_status()
+        
+        assert actions == action_extractor.extract_all_actions(PdfReader(updated))
+        assert after["incremental_extractions"] == before["incremental_extractions"] + 1
+        counts = {name: after[name] - before[name] for name in ("reused_nodes", "extracted_nodes")}
+        return actions, counts
+    
+    def test_reextracts_only_changed_nodes(self, tmp_path):
+        """Test that an update rewriting one annotation re-extracts only that annotation"""
+        from PyPDF2 import PdfReader
+        from PyPDF2.generic import DictionaryObject, NameObject, TextStringObject
+        from src.utils.revisions import iter_revisions, update_objects
+        
+        def rewrite_annotation(reader):
+            reference = reader.pages[2].raw_get("/Annots")[1]
+            annotation = DictionaryObject(reference.get_object())
+            annotation[NameObject("/A")] = DictionaryObject({
+                NameObject("/S"): NameObject("/JavaScript"),
+                NameObject("/JS"): TextStringObject("app.launchURL('https://example.net');")
+            })
+            self.annotation_objnum = reference.idnum
+            return {reference.idnum: annotation}
+        
+        actions, counts = self._extract_update(tmp_path, rewrite_annotation)
+        annotation = actions["annotations_level_actions"]["actions of page_2_annot_1(Link)"]
+        assert annotation["actions"]["Action"]["JS"] == "app.launchURL('https://example.net');"
+        assert counts["extracted_nodes"] == 1
+        assert counts["reused_nodes"] > 20
+        
+        with open(tmp_path / "v2.pdf", "rb") as file:
+            revisions = iter_revisions(file.read())
+        assert len(revisions) == 2
+        assert update_objects(PdfReader(str(tmp_path / "v2.pdf")), revisions[0][0]) == {self.annotation_objnum}
+    
+    def test_tracks_indirect_dependencies(self, tmp_path):
+        """Test that rewriting only a JavaScript stream re-extracts the node whose Action reads it"""
+        from PyPDF2.generic import DecodedStreamObject
+        
+        def rewrite_script(reader):
+            aa = reader.trailer["/Root"]["/AA"]
+            reference = aa["/WS"].raw_get("/JS")
+            stream = DecodedStreamObject()
+            stream.set_data(b"this.exportDataObject({cName: 'payload', nLaunch: 2});")
+            return {reference.idnum: stream}
+        
+        actions, counts = self._extract_update(tmp_path, rewrite_script)
+        script = actions["document_level_actions"]["DocumentAdditionalActions"]["actions"]["WS"]["JS"]
+        assert script == "this.exportDataObject({cName: 'payload', nLaunch: 2});"
+        assert counts["extracted_nodes"] == 1
+
+    def test_records_on_a_private_reader(self, tmp_path, monkeypatch):
+        """Test that dependencies are never recorded on the shared cached reader"""
+        from src.core.cache_manager import CacheManager
+        from src.utils.dependency_recorder import DependencyRecorder
+        
+        recorded = []
+        original_init = DependencyRecorder.__init__
+        monkeypatch.setattr(
+            DependencyRecorder, "__init__", lambda recorder, reader: recorded.append(reader) or original_init(recorder, reader)
+        )
+        
+        synthetic_pdf = write_synthetic_pdf(str(tmp_path / "private.pdf"), pages=2)
+        cache_manager = CacheManager()
+        PDFActionInspector(cache_manager).extract_pdf_actions(synthetic_pdf)
+        shared = cache_manager.get_reader(synthetic_pdf)
+        assert recorded and all(reader is not shared for reader in recorded)
+        assert "get_object" not in shared.__dict__
+
+    def test_revision_diff(self, tmp_path):
+        """Test that each incremental update is diffed against the previous revision"""
+        from PyPDF2 import PdfReader
+        from PyPDF2.generic import DictionaryObject, NameObject, TextStringObject
+        from src.core.cache_manager import CacheManager
+        from benchmarks.synthetic_pdfs import append_incremental_update
+
+        original = write_synthetic_pdf(
+            str(tmp_path / "v1.pdf"), pages=3, annotations_per_page=2, widgets_per_page=1
+        )
+        reader = PdfReader(original)
+        link = reader.pages[1].raw_get("/Annots")[0]
+        annotation = DictionaryObject(link.get_object())
+        annotation[NameObject("/A")] = DictionaryObject({
+            NameObject("/S"): NameObject("/Launch"),
+            NameObject("/F"): TextStringObject("cmd.exe")
+        })
+        updated = append_incremental_update(original, {link.idnum: annotation}, str(tmp_path / "v2.pdf"))
+
+        reader = PdfReader(updated)
+        widget = reader.pages[0].raw_get("/Annots")[-1]
+        field = DictionaryObject(widget.get_object())
+        field[NameObject("/V")] = TextStringObject("changed")
+        latest = append_incremental_update(updated, {widget.idnum: field}, str(tmp_path / "v3.pdf"))
+
+        inspector = PDFActionInspector(CacheManager())
+        diff = inspector.get_revision_diff(latest)
+        assert diff["revision_count"] == 3
+        assert diff["modified_revisions"] == [2, 3]
+
+        first, second, third = diff["revisions"]
+        assert first["actions"]["annotations_level_actions"] == 9
+
+        assert second["changed_object_numbers"] == [link.idnum]
+        modified = second["actions"]["annotations_level_actions"]["modified"]
+        (entry,) = modified.values()
+        assert entry["after"]["actions"]["Action"]["S"] == "/Launch"
+        assert second["annotations"][0]["change"] == "modified"
+        assert second["extraction"]["extracted_nodes"] == 1
+
+        assert third["changed_object_numbers"] == [widget.idnum]
+        assert third["fields"][0]["after"]["value"] == "changed"
+        assert third["fields"][0]["before"]["value"] != "changed"
+
+        assert inspector.get_revision_diff(latest) is diff
+        
+        # Beyond the limit, the oldest diffed revision is the baseline and older ones are skipped
+        from src.utils.revision_diff import RevisionDiffer
+        capped = RevisionDiffer(max_revisions=2).diff(PdfReader(latest))
+        assert (capped["revision_count"], capped["skipped_revisions"]) == (3, 1)
+        assert [revision["revision"] for revision in capped["revisions"]] == [2, 3]
+        assert capped["revisions"][0]["actions"]["annotations_level_actions"] == 9
+        assert capped["modified_revisions"] == [3]
+
+
+class TestObjectDump:
+    """Test cases for bounded recursive object content"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Build a synthetic PDF with JavaScript streams"""
+        from PyPDF2 import PdfReader
+        from src.core.cache_manager import CacheManager
+
+        self.synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "dump.pdf"), pages=3, annotations_per_page=2, js_stream_bytes=5000
+        )
+        self.reader = PdfReader(self.synthetic_pdf)
+        self.inspector = PDFActionInspector(CacheManager())
+
+    def test_renders_nested_content_and_cycles(self):
+        """Test that nested values and referenced objects are rendered, stopping at cycles and depth"""
+        page = self.reader.pages[0].indirect_reference.idnum
+        result = self.inspector.get_pdf_object_information(self.synthetic_pdf, page, depth=2)
+        content = result["object_info"]["content_sample"]
+
+        assert content["/MediaBox"] == [0, 0, 612, 792]
+        assert content["/AA"]["/O"]["/S"] == "/JavaScript"
+        parent = content["/Parent"]["value"]
+        assert parent["/Type"] == "/Pages"
+        assert {"ref": page, "omitted": "cycle"} in parent["/Kids"]
+        annotation = content["/Annots"][0]["value"]
+        assert annotation["/Rect"]["omitted"] == "depth"
+
+        top_level = self.inspector.get_pdf_object_information(self.synthetic_pdf, page, depth=0)
+        assert top_level["object_info"]["content_sample"]["/MediaBox"]["omitted"] == "depth"
+
+    def test_limits_nodes_and_stream_previews(self, monkeypatch, caplog):
+        """Test that the node budget and the preview size cap bound the output"""
+        from PyPDF2.generic import ArrayObject, DictionaryObject, NameObject, NumberObject
+        from src.config.settings import settings
+        from src.utils.object_dump import ObjectDumper
+
+        script = self.reader.trailer["/Root"]["/AA"]["/WS"].raw_get("/JS").idnum
+        with caplog.at_level("WARNING"):
+            result = self.inspector.get_pdf_object_information(self.synthetic_pdf, script, stream_preview_bytes=100)
+        preview = result["object_info"]["content_sample"]["stream_preview"]
+        assert len(preview["text"]) == 100
+        assert preview["truncated"] is True
+        assert "Extraction truncated" not in caplog.text
+
+        # Items past the node budget collapse into a single marker with their count
+        numbers = [NumberObject(number) for number in range(100)]
+        assert ObjectDumper(max_nodes=5).dump(ArrayObject(numbers)) == [0, 1, 2, 3, {"omitted": "max_nodes", "count": 96}]
+        entries = DictionaryObject({NameObject(f"/K{number}"): number for number in numbers})
+        dumper = ObjectDumper(max_nodes=5)
+        rendered = dumper.dump(entries)
+        assert len(rendered) == 5
+        assert rendered["omitted_entries"] == {"omitted": "max_nodes", "count": 96}
+        assert dumper.truncated is True
+        assert "stream_preview" not in self.inspector.get_pdf_object_information(
+            self.synthetic_pdf, script
+        )["object_info"]["content_sample"]
+
+        monkeypatch.setattr(settings, "object_dump_max_preview_bytes", 10)
+        result = self.inspector.get_pdf_object_information(self.synthetic_pdf, script, stream_preview_bytes=100)
+        assert len(result["object_info"]["content_sample"]["stream_preview"]["text"]) == 10
+
+        monkeypatch.setattr(settings, "object_dump_max_nodes", 5)
+        root = self.reader.trailer.raw_get("/Root").idnum
+        limits = self.inspector.get_pdf_object_information(self.synthetic_pdf, root, depth=10)["object_info"]["content_sample_limits"]
+        assert limits["nodes"] == 5
+        assert limits["truncated"] is True
+
+
+class TestObjectBatch:
+    """Test cases for batched object lookups"""
+
+    def test_follows_references_once(self, tmp_path, monkeypatch):
+        """Test that objects reachable from several requested objects are resolved and returned once"""
+        from PyPDF2 import PdfReader
+        from src.core.cache_manager import CacheManager
+        from src.config.settings import settings
+
+        synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "objects.pdf"), pages=3, annotations_per_page=2, widgets_per_page=0
+        )
+        reader = PdfReader(synthetic_pdf)
+        page_objnums = [page.indirect_reference.idnum for page in reader.pages]
+        pages_objnum = reader.trailer["/Root"].raw_get("/Pages").idnum
+
+        inspector = PDFActionInspector(CacheManager())
+        result = inspector.get_pdf_objects_information(synthetic_pdf, page_objnums[:2], depth=1)
+        assert result["requested"] == page_objnums[:2]
+        assert result["not_found"] == []
+        first_page = result["objects"][str(page_objnums[0])]
+        assert first_page["type"] == "DictionaryObject"
+        assert pages_objnum in first_page["references"]
+        # The shared /Pages parent is listed once, next to every annotation of both pages
+        assert str(pages_objnum) in result["objects"]
+        assert result["total_objects"] == 2 + 1 + 4
+
+        ranged = inspector.get_pdf_objects_information(synthetic_pdf, [99999], object_spans="1-3")
+        assert set(ranged["objects"]) == {"1", "2", "3"}
+        assert ranged["not_found"] == [99999]
+        assert "limit_reached" not in ranged
+
+        monkeypatch.setattr(settings, "object_batch_max_objects", 3)
+        limited = inspector.get_pdf_objects_information(synthetic_pdf, page_objnums, depth=5)
+        assert limited["total_objects"] == 3
+        assert limited["limit_reached"] is True
+        assert limited["unvisited"]
+
+        assert inspector.get_pdf_objects_information(synthetic_pdf, [])["success"] is False
+
+
+class TestPageSpans:
+    """Test cases for paginated page span extraction"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Build a synthetic PDF with text on every page"""
+        from src.core.cache_manager import CacheManager
+        
+        self.synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "text.pdf"), pages=32, annotations_per_page=0, widgets_per_page=0, text_lines_per_page=3
+        )
+        self.inspector = PDFActionInspector(CacheManager())
+    
+    def test_cursor_walks_all_pages_within_budgets(self):
+        """Test that following next_cursor returns every page once, within page and character budgets"""
+        seen = []
+        cursor = 0
+        while cursor is not None:
+            result = self.inspector.get_page_information_by_spans_paginated(
+                self.synthetic_pdf, "0-31", cursor=cursor, max_pages=5, max_chars=400
+            )
+            assert result["returned_pages"] <= 5
+            assert result["returned_chars"] <= 400
+            seen.extend(page["page_number"] for page in result["pages_info"])
+            cursor = result["next_cursor"]
+        assert seen == list(range(32))
+        
+        # A page larger than the character budget is cut rather than skipped
+        single = self.inspector.get_page_information_by_spans_paginated(self.synthetic_pdf, "3", max_chars=10)
+        assert single["pages_info"][0]["text_truncated"] is True
+        assert len(single["pages_info"][0]["text_content"]) == 10
+        
+        # Page text is extracted once and shared with the unpaginated tools
+        legacy = json.loads(self.inspector.get_page_information_by_spans(self.synthetic_pdf, "0-31"))
+        assert "Page 31 line 2" in legacy["pages_info"][31]["text_content"]
+        assert self.inspector.get_page_text_content(self.synthetic_pdf, 7) == legacy["pages_info"][7]
+        page_text_cache = self.inspector.get_cache_status()["page_text_cache"]
+        assert page_text_cache["pages"] == 32
+        assert page_text_cache["misses"] == 32
+    
+    def test_parallel_extraction_matches_in_process(self, monkeypatch):
+        """Test that worker processes produce the same page text as in-process extraction"""
+        from src.config.settings import settings
+        from src.core.cache_manager import CacheManager
+        
+        expected = self.inspector.get_page_information_by_spans_paginated(self.synthetic_pdf, "0-31", max_pages=32)
+        
+        monkeypatch.setattr(settings, "text_workers", 2)
+        parallel_inspector = PDFActionInspector(CacheManager())
+        try:
+            assert parallel_inspector._extract_page_texts_parallel(self.synthetic_pdf, list(range(32))) == expected["pages_info"]
+            pool = parallel_inspector._text_pool
+            
+            parallel = parallel_inspector.get_page_information_by_spans_paginated(self.synthetic_pdf, "0-31", max_pages=32)
+            assert parallel == expected
+            assert parallel_inspector._text_pool is pool
+        finally:
+            parallel_inspector.close()
+        assert parallel_inspector._text_pool is None
+
+
+class TestBenchmarks:
+    """Test cases for the benchmark suite"""
+    
+    def test_run_and_compare(self):
+        """Test that results are machine-readable and regressions are flagged"""
+        from benchmarks.compare import compare
+        from benchmarks.run_benchmarks import run_benchmarks
+        
+        params = {"pages": 2, "field_tree_depth": 4, "next_chain_length": 8, "js_stream_bytes": 4096}
+        baseline = run_benchmarks(params, repeat=1, only=["extract_pdf_actions"])
+        metrics = baseline["results"]["extract_pdf_actions"]
+        assert set(metrics) == {"cold_seconds", "warm_seconds", "peak_memory_bytes"}
+        assert json.loads(json.dumps(baseline)) == baseline
+        
+        candidate = json.loads(json.dumps(baseline))
+        candidate["results"]["extract_pdf_actions"]["peak_memory_bytes"] *= 2
+        regressed = [row[1] for row in compare(baseline, candidate, 0.2, 0.001) if row[5]]
+        assert regressed == ["peak_memory_bytes"]
+
+
+class TestCacheManager:
+    """Test cases for CacheManager loading and accounting"""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        """Setup test environment"""
+        from src.core.cache_manager import CacheManager
+        
+        self.cache_manager = CacheManager()
+        self.test_pdf_path = "examples/pdf_samples/test-signature_action.pdf"
+    
+    def test_memory_load_mode(self, monkeypatch):
+        """Test that memory mode reports resident bytes"""
+        from src.config.settings import settings
+        
+        monkeypatch.setattr(settings, "reader_load_mode", "memory")
+        self.cache_manager.get_reader(self.test_pdf_path)
+        
+        entry = self.cache_manager.get_cache_status()["cache_entries"][0]
+        assert entry["load_mode"] == "memory"
+        assert entry["resident_bytes"] == os.path.getsize(self.test_pdf_path)
+        assert entry["mapped_bytes"] == 0
+    
+    def test_page_text_cache_budget(self, tmp_path):
+        """Test that cached page text stays within its character budget and leaves with its reader"""
+        from src.core.page_text_cache import PageTextCache
+        
+        synthetic_pdf = write_synthetic_pdf(
+            str(tmp_path / "text.pdf"), pages=6, annotations_per_page=0, widgets_per_page=0, text_lines_per_page=2
+        )
+        reader = self.cache_manager.get_reader(synthetic_pdf)
+        page_chars = len(reader.pages[0].extract_text())
+        self.cache_manager.page_text_cache = PageTextCache(max_chars=page_chars * 3)
+        
+        extracted = []
+        def build(reader, missing):
+            extracted.extend(missing)
+            return [{"page_number": page_num, "text_content": reader.pages[page_num].extract_text()} for page_num in missing]
+        
+        self.cache_manager.get_page_texts(synthetic_pdf, [0, 1, 2, 3], build)
+        self.cache_manager.get_page_texts(synthetic_pdf, [2, 3, 0], build)
+        assert extracted == [0, 1, 2, 3, 0]
+        
+        status = self.cache_manager.get_cache_status()["page_text_cache"]
+        assert status["total_chars"] <= page_chars * 3
+        assert status["evictions"] == 2
+        assert status["hits"] == 2
+        
+        self.cache_manager.clear_cache(synthetic_pdf)
+        assert self.cache_manager.get_cache_status()["page_text_cache"]["pages"] == 0
+    
+    def test_mmap_load_mode(self, monkeypatch):
+        """Test that mmap mode maps the file and extracts the same actions"""
+        from src.config.settings import settings
+        
+        monkeypatch.setattr(settings, "reader_load_mode", "mmap")
+        reader = self.cache_manager.get_reader(self.test_pdf_path)
+        
+        status = self.cache_manager.get_cache_status()
+        entry = status["cache_entries"][0]
+        assert entry["load_mode"] == "mmap"
+        assert entry["resident_bytes"] == 0
+        assert entry["mapped_bytes"] == os.path.getsize(self.test_pdf_path)
+        assert status["total_mapped_bytes"] == entry["mapped_bytes"]
+        
+        actions = action_extractor.extract_all_actions(reader)
+        assert len(actions["annotations_level_actions"]) > 0
+
+        # Removed entries keep their mapping for the grace period, then the cleanup pass closes it
+        self.cache_manager.clear_cache(self.test_pdf_path)
+        assert self.cache_manager.get_cache_status()["eviction"]["mappings_pending_close"] == 1
+        self.cache_manager.close_retired_entries()
+        assert not reader.stream.closed
+        self.cache_manager.close_retired_entries(grace_seconds=0)
+        assert reader.stream.closed
+        assert self.cache_manager.get_cache_status()["eviction"]["mappings_pending_close"] == 0
+
+        # A reader in use outlives the grace period, and is closed on the first pass after its release
+        with self.cache_manager.use_reader(self.test_pdf_path) as held:
+            assert held is not reader and not held.stream.closed
+            self.cache_manager.clear_cache(self.test_pdf_path)
+            self.cache_manager.close_retired_entries(grace_seconds=0)
+            assert not held.stream.closed
+            assert len(action_extractor.extract_all_actions(held)["annotations_level_actions"]) > 0
+        self.cache_manager.close_retired_entries(grace_seconds=0)
+        assert held.stream.closed
+
+        # So is the reader behind a partially consumed record stream
+        inspector = PDFActionInspector(self.cache_manager)
+        records = inspector.iter_pdf_actions(self.test_pdf_path)
+        next(records)
+        streamed = self.cache_manager.get_reader(self.test_pdf_path)
+        self.cache_manager.clear_cache(self.test_pdf_path)
+        self.cache_manager.close_retired_entries(grace_seconds=0)
+        assert not streamed.stream.closed
+        assert all("error_type" not in record for record in records)
+        self.cache_manager.close_retired_entries(grace_seconds=0)
+        assert streamed.stream.closed
+
+    def test_max_entries_lru_eviction(self, monkeypatch):
+        """Test that the least recently used reader is evicted past the entry budget"""
+        from src.config.settings import settings
+        
+        monkeypatch.setattr(settings, "cache_max_entries", 2)
+        monkeypatch.setattr(settings, "cache_eviction_policy", "lru")
+        
+        first = "examples/pdf_samples/test-signature_action.pdf"
+        second = "examples/pdf_samples/without_actions.pdf"
+        third = "examples/pdf_samples/confuse_js_code.pdf"
+        
+        self.cache_manager.get_reader(first)
+        self.cache_manager.get_reader(second)
+        self.cache_manager.get_reader(first)  # first becomes most recently used
+        self.cache_manager.get_reader(third)
+        
+        status = self.cache_manager.get_cache_status()
+        cached = {entry["file_path"] for entry in status["cache_entries"]}
+        assert cached == {first, third}
+        assert status["eviction"]["evicted_max_entries"] == 1
+    
+    def test_max_bytes_lfu_eviction(self, monkeypatch, tmp_path):
+        """Test that the least frequently used reader is evicted past the byte budget"""
+        import shutil
+        from src.config.settings import settings
+        
+        first = "examples/pdf_samples/test-signature_action.pdf"
+        second = "examples/pdf_samples/confuse_js_code.pdf"
+        third = str(tmp_path / "confuse_js_code_copy.pdf")
+        shutil.copyfile(second, third)
+        budget = os.path.getsize(first) + os.path.getsize(second)
+        
+        monkeypatch.setattr(settings, "reader_load_mode", "memory")
+        monkeypatch.setattr(settings, "cache_max_bytes", budget)
+        monkeypatch.setattr(settings, "cache_eviction_policy", "lfu")
+        
+        self.cache_manager.get_reader(first)
+        self.cache_manager.get_reader(first)  # first becomes most frequently used
+        self.cache_manager.get_reader(second)
+        self.cache_manager.get_reader(third)
+        
+        status = self.cache_manager.get_cache_status()
+        cached = {entry["file_path"] for entry in status["cache_entries"]}
+        assert cached == {first, third}
+        assert status["eviction"]["evicted_max_bytes"] == 1
+        assert status["eviction"]["total_bytes"] <= budget
+    
+    def test_path_aliases_share_reader(self, tmp_path):
+        """Test that relative, absolute and symlinked paths hit the same cache entry"""
+        link_path = tmp_path / "linked.pdf"
+        try:
+            link_path.symlink_to(os.path.abspath(self.test_pdf_path))
+        except (OSError, NotImplementedError):
+            pytest.skip("Symlinks are not supported on this platform")
+        
+        reader = self.cache_manager.get_reader(self.test_pdf_path)
+        assert self.cache_manager.get_reader(os.path.abspath(self.test_pdf_path)) is reader
+        assert self.cache_manager.get_reader(str(link_path)) is reader
+        assert self.cache_manager.get_cache_status()["total_entries"] == 1
+    
+    def test_modified_file_invalidates_reader(self, tmp_path):
+        """Test that a file changed on disk is reloaded instead of served stale"""
+        import shutil
+        
+        pdf_copy = tmp_path / "changing.pdf"
+        shutil.copyfile(self.test_pdf_path, pdf_copy)
+        first_reader = self.cache_manager.get_reader(str(pdf_copy))
+        
+        shutil.copyfile("examples/pdf_samples/confuse_js_code.pdf", pdf_copy)
+        stat = os.stat(pdf_copy)
+        os.utime(pdf_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second_reader = self.cache_manager.get_reader(str(pdf_copy))
+        
+        assert second_reader is not first_reader
+        status = self.cache_manager.get_cache_status()
+        assert status["total_entries"] == 1
+        assert status["eviction"]["invalidated_stale"] == 1
+    
+    def test_digest_mode_shares_identical_content(self, monkeypatch, tmp_path):
+        """Test that identical files under different names share one reader in digest mode"""
+        import shutil
+        from src.config.settings import settings
+        
+        monkeypatch.setattr(settings, "cache_key_mode", "digest")
+        attachment = tmp_path / "attachment-renamed.pdf"
+        shutil.copyfile(self.test_pdf_path, attachment)
+        
+        reader = self.cache_manager.get_reader(self.test_pdf_path)
+        assert self.cache_manager.get_reader(str(attachment)) is reader
+        assert self.cache_manager.get_cache_status()["total_entries"] == 1
+        
+        # Clearing either name drops the shared entry
+        self.cache_manager.clear_cache(str(attachment))
+        assert self.cache_manager.get_cache_status()["total_entries"] == 0
+    
+    def test_results_cache_shared_across_tools(self):
+        """Test that the three analysis tools extract Actions only once per document"""
+        inspector = PDFActionInspector(self.cache_manager)
+        
+        inspector.analyze_pdf_actions_security(self.test_pdf_path)
+        actions = inspector.extract_pdf_actions(self.test_pdf_path)
+        overview = inspector.get_document_overview(self.test_pdf_path)
+        
+        results = inspector.get_cache_status()["results_cache"]
+        assert results["misses"] == 3  # basic info, actions, structure
+        assert results["hits"] == 3
+        assert overview["actions_summary"]["annotations_level_actions"] == actions["annotations_level_actions"]
+        
+        # Results are dropped together with the reader entry
+        inspector.clear_cache(self.test_pdf_path)
+        inspector.extract_pdf_actions(self.test_pdf_path)
+        assert inspector.get_cache_status()["results_cache"]["misses"] == 4
+    
+    def test_persistent_cache_survives_restart(self, tmp_path):
+        """Test that a new cache manager serves stored results without loading the reader"""
+        from src.core.cache_manager import CacheManager
+        from src.core.persistent_cache import PersistentResultCache
+        
+        db_path = str(tmp_path / "results.db")
+        self.cache_manager.persistent_cache = PersistentResultCache(db_path)
+        first = PDFActionInspector(self.cache_manager)
+        actions = first.extract_pdf_actions(self.test_pdf_path)
+        overview = first.get_document_overview(self.test_pdf_path)
+        
+        # Simulate a server restart sharing the same store
+        restarted = CacheManager()
+        restarted.persistent_cache = PersistentResultCache(db_path)
+        second = PDFActionInspector(restarted)
+        
+        assert second.extract_pdf_actions(self.test_pdf_path) == actions
+        assert second.get_document_overview(self.test_pdf_path)["actions_summary"] == overview["actions_summary"]
+        
+        status = second.get_cache_status()
+        assert status["total_entries"] == 0
+        assert status["persistent_cache"]["hits"] == 4  # actions, then basic info, structure, actions
+        assert status["persistent_cache"]["entries"] == 3  # actions, basic info, structure (no revision state by default)
+    
+    def test_persistent_cache_evicts_least_recently_read(self, tmp_path):
+        """Test that stored results beyond the byte budget are evicted oldest-read first"""
+        import time
+        from src.core.persistent_cache import PersistentResultCache
+        
+        store = PersistentResultCache(str(tmp_path / "results.db"), max_bytes=250, access_update_seconds=0)
+        store.put("a", {"payload": "a" * 100})
+        time.sleep(0.01)
+        store.put("b", {"payload": "b" * 100})
+        time.sleep(0.01)
+        assert store.get("a") is not None  # "b" is now the least recently read
+        store.put("c", {"payload": "c" * 100})
+        
+        assert store.get("b") is None
+        assert store.get("a") == {"payload": "a" * 100}
+        status = store.get_status()
+        assert status["evictions"] == 1
+        assert status["total_bytes"] <= 250
+    
+    def test_persistent_cache_throttles_read_time_updates(self, tmp_path):
+        """Test that hits only write read times that are older than the update interval"""
+        from src.core.persistent_cache import PersistentResultCache
+        
+        store = PersistentResultCache(str(tmp_path / "results.db"), max_bytes=1000, access_update_seconds=60)
+        store.put("a", {"payload": "a"})
+        for _ in range(5):
+            assert store.get("a") == {"payload": "a"}
+        assert store.get_status()["access_updates"] == 0
+        
+        store.access_update_seconds = 0
+        store.get("a")
+        assert store.get_status()["access_updates"] == 1
+        
+        unbounded = PersistentResultCache(str(tmp_path / "unbounded.db"), access_update_seconds=0)
+        unbounded.put("a", {"payload": "a"})
+        unbounded.get("a")
+        assert unbounded.get_status()["access_updates"] == 0
+
+
+class TestMetrics:
+    """Test cases for performance metrics"""
+    
+    def test_registry_histograms_and_prometheus(self, tmp_path):
+        """Test that timed calls land in cumulative buckets and render as Prometheus text"""
+        from src.core.metrics import MetricsRegistry, KIND_TOOL
+        
+        registry = MetricsRegistry(enabled=True)
+        registry.observe(KIND_TOOL, "extract_pdf_actions", 0.003, nbytes=100)
+        registry.observe(KIND_TOOL, "extract_pdf_actions", 2.0, nbytes=50)
+        with pytest.raises(ValueError):
+            with registry.time(KIND_TOOL, "extract_pdf_actions"):
+                raise ValueError("boom")
+        registry.record_cache("reader", True)
+        registry.record_cache("reader", False)
+        
+        tool = registry.snapshot()["tools"]["extract_pdf_actions"]
+        assert tool["count"] == 3
+        assert tool["errors"] == 1
+        assert tool["bytes"] == 150
+        assert tool["latency_buckets"]["0.005"] == 2
+        assert tool["latency_buckets"]["+Inf"] == 3
+        assert registry.snapshot()["caches"]["reader"]["hit_ratio"] == 0.5
+        
+        path = tmp_path / "metrics.prom"
+        registry.dump_prometheus(str(path))
+        text = path.read_text(encoding="utf-8")
+        assert 'pdf_inspector_tool_duration_seconds_bucket{tool="extract_pdf_actions",le="+Inf"} 3' in text
+        assert 'pdf_inspector_cache_hits_total{cache="reader"} 1' in text
+        
+        disabled = MetricsRegistry(enabled=False)
+        with disabled.time(KIND_TOOL, "extract_pdf_actions") as timer:
+            timer.bytes = 10
+        assert disabled.snapshot()["tools"] == {}
+    
+    def test_inspector_phases_are_recorded(self):
+        """Test that loading and extraction are timed and cache ratios are reported"""
+        from src.core.cache_manager import CacheManager
+        from src.core.metrics import metrics
+        
+        metrics.reset()
+        inspector = PDFActionInspector(CacheManager())
+        inspector.extract_pdf_actions("examples/pdf_samples/test-signature_action.pdf")
+        inspector.extract_pdf_actions("examples/pdf_samples/test-signature_action.pdf")
+        
+        result = inspector.get_performance_metrics()
+        if not result["enabled"]:
+            pytest.skip("Metrics disabled through PDF_METRICS_ENABLED")
+        assert result["phases"]["load"]["count"] == 1
+        assert result["phases"]["load"]["bytes"] == os.path.getsize("examples/pdf_samples/test-signature_action.pdf")
+        assert result["phases"]["extract"]["count"] == 1
+        assert result["caches"]["reader"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+        assert result["caches"]["results"]["hits"] == 1
+        assert "prometheus_path" not in result
+    
+    def test_prometheus_dump_goes_to_configured_path(self, tmp_path, monkeypatch):
+        """Test that the metrics tool writes Prometheus text only to the configured file"""
+        from src.config.settings import settings
+        from src.core.cache_manager import CacheManager
+        
+        path = tmp_path / "metrics.prom"
+        monkeypatch.setattr(settings, "metrics_prometheus_path", str(path))
+        result = PDFActionInspector(CacheManager()).get_performance_metrics()
+        assert result["prometheus_path"] == str(path)
+        assert result["prometheus_bytes"] == path.stat().st_size
+
+
+class TestProfiler:
+    """Test cases for per-call cProfile and tracemalloc captures"""
+    
+    def test_profiled_call_writes_reports(self, tmp_path, monkeypatch):
+        """Test that a profiled call writes pstats and allocation reports tagged with the file hash"""
+        import hashlib
+        import pstats
+        from src.config.settings import settings
+        from src.core.cache_manager import CacheManager
+        
+        monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+        pdf_path = "examples/pdf_samples/test-signature_action.pdf"
+        with open(pdf_path, "rb") as file:
+            file_hash = hashlib.sha256(file.read()).hexdigest()
+        inspector = PDFActionInspector(CacheManager())
+        
+        # Off by default, on with the per-call flag; the nested overview call is not profiled separately
+        inspector.extract_pdf_actions(pdf_path)
+        assert list(tmp_path.iterdir()) == []
+        result = inspector.analyze_pdf_actions_security(pdf_path, profile=True)
+        assert "Actions" in result
+        
+        files = sorted(path.name for path in tmp_path.iterdir())
+        assert len(files) == 2
+        assert all(f"_analyze_pdf_actions_security_{file_hash[:16]}." in name for name in files)
+        
+        stats = pstats.Stats(str(next(tmp_path.glob("*.pstats"))))
+        assert any(function == "analyze_pdf_actions_security" for _, _, function in stats.stats)
+        report = next(tmp_path.glob("*.allocations.txt")).read_text(encoding="utf-8")
+        assert f"sha256: {file_hash}" in report
+        assert "traced_peak_bytes:" in report
+        
+        # Fast calls are dropped below the configured minimum duration
+        monkeypatch.setattr(settings, "profile_mode", "cprofile")
+        monkeypatch.setattr(settings, "profile_min_seconds", 3600)
+        inspector.get_trailer_object(pdf_path)
+        assert len(list(tmp_path.iterdir())) == 2
+
+
+class TestResponseSerializer:
+    """Test cases for the central tool response serialization layer"""
+    
+    def test_modes_and_backends_agree(self, monkeypatch):
+        """Test that pretty and compact output decode to the same data with and without the fast backend"""
+        from src.config.settings import settings
+        from src.core.serializer import ResponseSerializer
+        
+        serializer = ResponseSerializer()
+        value = {
+            "name": "Prix unitaire €", "objnum": 12, "rect": [0.5, 1e16],
+            "actions": [{"S": "/JavaScript", "JS": "app.alert(1);"}], 3: None
+        }
+        
+        outputs = {}
+        for backend in ("json", "auto"):
+            monkeypatch.setattr(settings, "json_backend", backend)
+            outputs[backend] = (serializer.dumps(value), serializer.dumps(value, mode="compact"))
+        
+        # The backends agree on the data, not necessarily on the text (e.g. float formatting)
+        pretty, compact = outputs["json"]
+        assert [json.loads(text) for text in outputs["auto"]] == [json.loads(text) for text in outputs["json"]]
+        assert pretty == json.dumps(value, ensure_ascii=False, indent=2)
+        assert compact == (
+            '{"name":"Prix unitaire €","objnum":12,"rect":[0.5,1e+16],'
+            '"actions":[{"S":"/JavaScript","JS":"app.alert(1);"}],"3":null}'
+        )
+        
+        # Strings orjson rejects still serialize
+        assert json.loads(serializer.dumps({"text": "\ud800"})) == {"text": "\ud800"}
+    
+    def test_cached_response(self, tmp_path):
+        """Test that final results are served from the document's cache entry and errors are not cached"""
+        from src.core.cache_manager import CacheManager
+        from src.core.serializer import ResponseSerializer
+        
+        cache_manager = CacheManager()
+        inspector = PDFActionInspector(cache_manager)
+        serializer = ResponseSerializer()
+        pdf_path = "examples/pdf_samples/test-signature_action.pdf"
+        calls = []
+        
+        def produce(path):
+            calls.append(path)
+            return inspector.get_trailer_object(path)
+        
+        respond = lambda path: serializer.cached_response(cache_manager, "get_trailer_object", path, (), lambda: produce(path))
+        first = respond(pdf_path)
+        assert respond(pdf_path) == first
+        assert len(calls) == 1
+        assert json.loads(first) == inspector.get_trailer_object(pdf_path)
+        
+        # Text produced by one backend is never served under another
+        from src.config.settings import settings
+        key = f"response:{settings.get_json_mode()}:{serializer.get_backend()}:get_trailer_object:{pdf_path}:()"
+        assert cache_manager.peek_document_result(pdf_path, key) == first
+        
+        missing = str(tmp_path / "missing.pdf")
+        assert json.loads(respond(missing))["success"] is False
+        respond(missing)
+        assert len(calls) == 3
+        
+        # Dropped together with the reader
+        cache_manager.clear_cache(pdf_path)
+        respond(pdf_path)
+        assert len(calls) == 4
+        
+        status = serializer.get_status()
+        assert (status["hits"], status["misses"], status["stored"]) == (1, 4, 2)
+
+
+class TestAsyncToolRunner:
+    """Test cases for offloading blocking calls from async MCP tools"""
+    
+    def test_concurrent_calls_are_coalesced(self):
+        """Test that identical concurrent calls share one execution"""
+        import asyncio
+        import threading
+        import time
+        from src.core.async_runner import AsyncToolRunner
+        
+        runner = AsyncToolRunner(max_workers=2, timeout_seconds=10)
+        calls = []
+        lock = threading.Lock()
+        
+        def slow_call(value):
+            with lock:
+                calls.append(value)
+            time.sleep(0.1)
+            return value * 2
+        
+        async def scenario():
+            return await asyncio.gather(*[
+                runner.run(slow_call, 21, coalesce_key=("slow_call", 21))
+                for _ in range(5)
+            ])
+        
+        assert asyncio.run(scenario()) == [42] * 5
+        assert calls == [21]
+        runner.shutdown()
+    
+    def test_timeout_does_not_block_other_calls(self):
+        """Test that a timed out call returns promptly and the pool keeps serving"""
+        import asyncio
+        import time
+        from src.core.async_runner import AsyncToolRunner
+        
+        runner = AsyncToolRunner(max_workers=2, timeout_seconds=0.05)
+        
+        async def scenario():
+            with pytest.raises(asyncio.TimeoutError):
+                await runner.run(time.sleep, 0.5)
+            return await runner.run(sum, [1, 2, 3], timeout=5)
+        
+        assert asyncio.run(scenario()) == 6
+        runner.shutdown()
+
+class TestBatchAnalyzer:
+    """Test cases for process-pool batch analysis"""
+    
+    def test_batch_run_streams_results_and_summary(self, tmp_path):
+        """Test that every file yields one JSON line and failures keep the error shape"""
+        import io
+        import shutil
+        from src.core.batch_analyzer import BatchAnalyzer
+        
+        project_root = Path(__file__).parent.parent
+        shutil.copy(project_root / "examples" / "pdf_samples" / "confuse_js_code.pdf", tmp_path / "a.pdf")
+        shutil.copy(project_root / "examples" / "pdf_samples" / "test-signature_action.pdf", tmp_path / "b.pdf")
+        (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+        (tmp_path / "notes.txt").write_text("ignored")
+        
+        output = io.StringIO()
+        summary = BatchAnalyzer(max_workers=2).run(str(tmp_path), output)
+        records = {
+            os.path.basename(record["file_path"]): record
+            for record in map(json.loads, output.getvalue().splitlines())
+        }
+        
+        assert set(records) == {"a.pdf", "b.pdf", "broken.pdf"}
+        assert records["a.pdf"]["success"] is True
+        assert "document_level_actions" in records["a.pdf"]["actions"]
+        assert records["a.pdf"]["overview"]["basic_info"]["pages"] == 1
+        assert records["broken.pdf"]["success"] is False
+        assert "error_type" in records["broken.pdf"]
+        
+        assert summary["files"] == 3
+        assert summary["succeeded"] == 2
+        assert summary["failed"] == 1
+        assert "files_per_second" in summary
+        assert "mb_per_second" in summary
+
 # Custom test runner that can be called directly
 def run_tests_with_summary():
     """Run tests with a summary report"""